@@ -0,0 +1,179 @@
+"""
+K-Map Solver Shared-Memory Batch Solving
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Maps go to the workers packed in a shared memory block, one byte per cell
+# row by row, so map k is bytes [k * cells, (k + 1) * cells). Results come
+# back in a second block where map k owns a fixed slot: a 2 byte length and
+# the ASCII expression. Only block names and index ranges are pickled. A
+# result too long for its slot (the scanning solvers are not always
+# minimal) is marked OVERFLOW and solved again by the parent.
+
+import multiprocessing
+import os
+import sys
+from itertools import chain
+from multiprocessing import resource_tracker, shared_memory
+
+from minimizer import map_layout
+from solvers import MapSolver
+
+MAX_VARS = 6
+CHUNK_MAPS = 2048
+OVERFLOW = 0xFFFF
+
+# SharedMemory(track=False) lets workers attach without a resource tracker
+# (Python 3.13+). Before that, attaching registers the block. Workers then
+# unregister it again, whichever tracker they talk to, and the parent
+# registers it once more just before unlinking. The trackers know a POSIX
+# block by its shm_open() path, the public name with a leading slash.
+TRACK_ARGUMENT = sys.version_info >= (3, 13)
+
+# Per worker process: the blocks of the batch being solved, and one solver per size
+_attached = {}
+_solvers = {}
+
+
+def map_cells(num_vars):
+    layout = map_layout(num_vars)
+    return len(layout), len(layout[0])
+
+
+def result_slot(num_vars):
+    """Bytes per result: the length, then room for one term per minterm."""
+    return 2 + (1 << num_vars) * (2 * num_vars + 3)
+
+
+def _tracked_name(block):
+    return '/' + block.name if os.name == 'posix' else block.name
+
+
+def _attach(name):
+    block = _attached.get(name)
+    if block is None:
+        if TRACK_ARGUMENT:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            # Otherwise a tracker of this worker's own would warn about, and unlink, the parent's block
+            resource_tracker.unregister(_tracked_name(block), 'shared_memory')
+        _attached[name] = block
+    return block
+
+
+def _release_attached(keep):
+    for name in [name for name in _attached if name not in keep]:
+        _attached.pop(name).close()
+
+
+def _solver(num_vars):
+    solver = _solvers.get(num_vars)
+    if solver is None:
+        solver = _solvers[num_vars] = MapSolver(num_vars)
+    return solver
+
+
+def solve_slice(task):
+    """Solve maps [start, stop) of the input block into their result slots, in place."""
+    input_name, output_name, num_vars, start, stop = task
+    _release_attached((input_name, output_name))
+    inputs = _attach(input_name).buf
+    outputs = _attach(output_name).buf
+    rows, cols = map_cells(num_vars)
+    size, slot = rows * cols, result_slot(num_vars)
+    solver = _solver(num_vars)
+    for k in range(start, stop):
+        cells = inputs[k * size:(k + 1) * size]
+        map_data = [cells[r * cols:(r + 1) * cols].tolist() for r in range(rows)]
+        text = solver.solve(map_data).expression.encode('ascii')
+        base = k * slot
+        if len(text) > slot - 2:
+            outputs[base:base + 2] = OVERFLOW.to_bytes(2, 'little')
+            continue
+        outputs[base:base + 2] = len(text).to_bytes(2, 'little')
+        outputs[base + 2:base + 2 + len(text)] = text
+    return stop - start
+
+
+def _solve_map_task(task):
+    map_data, num_vars = task
+    return _solver(num_vars).solve(map_data).expression
+
+
+def _chunks(count, chunk):
+    return [(start, min(start + chunk, count)) for start in range(0, count, chunk)]
+
+
+def solve_shared(maps, num_vars, pool=None, workers=None, chunk=CHUNK_MAPS):
+    """Expressions of many maps, handed to the pool through shared memory."""
+    if not 2 <= num_vars <= MAX_VARS:
+        raise ValueError(f"Shared batches hold 2 to {MAX_VARS} variable maps")
+    count = len(maps)
+    if not count:
+        return []
+    rows, cols = map_cells(num_vars)
+    slot = result_slot(num_vars)
+    inputs = shared_memory.SharedMemory(create=True, size=rows * cols * count)
+    outputs = shared_memory.SharedMemory(create=True, size=slot * count)
+    owned = pool is None
+    try:
+        inputs.buf[:rows * cols * count] = bytes(chain.from_iterable(chain.from_iterable(maps)))
+        if owned:
+            pool = multiprocessing.Pool(workers or os.cpu_count())
+        tasks = [(inputs.name, outputs.name, num_vars, start, stop) for start, stop in _chunks(count, chunk)]
+        for _ in pool.imap_unordered(solve_slice, tasks):
+            pass
+
+        results = []
+        buf = outputs.buf
+        for k in range(count):
+            base = k * slot
+            length = int.from_bytes(buf[base:base + 2], 'little')
+            if length == OVERFLOW:
+                results.append(_solve_map_task((maps[k], num_vars)))
+            else:
+                results.append(bytes(buf[base + 2:base + 2 + length]).decode('ascii'))
+        return results
+    finally:
+        if owned and pool is not None:
+            pool.close()
+            pool.join()
+        for block in (inputs, outputs):
+            block.close()
+            if not TRACK_ARGUMENT:
+                # A worker sharing this process's tracker may have unregistered it
+                resource_tracker.register(_tracked_name(block), 'shared_memory')
+            block.unlink()
+
+
+def solve_pickled(maps, num_vars, pool=None, workers=None, chunk=CHUNK_MAPS):
+    """Expressions of many maps, sending every map and result through the pool's pipes."""
+    owned = pool is None
+    if owned:
+        pool = multiprocessing.Pool(workers or os.cpu_count())
+    try:
+        return pool.map(_solve_map_task, [(map_data, num_vars) for map_data in maps], chunk)
+    finally:
+        if owned:
+            pool.close()
+            pool.join()
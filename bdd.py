@@ -0,0 +1,513 @@
+"""
+K-Map Solver Decision Diagrams
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Functions too large for the explicit Quine-McCluskey cube lists are held
+# as a reduced ordered BDD, and their primes as a ZDD over the literals
+# (Coudert and Madre):
+#
+#     primes(f) = P01 + x'(P0 - P01) + x(P1 - P01)
+#
+# with P0, P1 and P01 the primes of f(x=0), f(x=1) and f(x=0) f(x=1). The
+# ZDD can hold far more primes than could ever be listed; a cover is then
+# picked greedily from it. It is proven minimal only when every pick was
+# forced, the minterm it started from lying in a single prime: the cover is
+# then made of essential primes alone. Past a deadline the primes are given
+# up and the rest of the ON-set is covered by growing cubes inside the care
+# set instead.
+#
+# Nodes are integers: 0 and 1 are the terminals, and a node keeps its id
+# (and meaning) through variable swaps, so callers can hold on to it.
+
+from collections import Counter, namedtuple
+from bisect import bisect_left
+from time import perf_counter
+
+from minimizer import SearchTimeout, term_order
+
+FALSE, TRUE = 0, 1
+
+# Bytes one cube costs in the explicit engine's sets, for the memory estimate
+CUBE_BYTES = 120
+EXPLICIT_MEMORY_LIMIT = 256 << 20
+
+# Sifting only pays off once the diagram is reasonably large
+SIFT_MIN_NODES = 2000
+SIFT_MAX_GROWTH = 1.2
+
+# primes and zdd_nodes are None when the prime ZDD was not finished in time
+ImplicitCover = namedtuple('ImplicitCover', 'cubes primes bdd_nodes sifted_nodes zdd_nodes proven_minimal')
+
+
+def explicit_memory(num_vars, num_minterms):
+    """Rough peak memory of prime_implicants() on that many ON and don't care minterms."""
+    return num_minterms * (num_vars + 1) * CUBE_BYTES
+
+
+class BDD(object):
+    """Reduced ordered BDD manager with a unique table per variable and an ITE cache."""
+
+    def __init__(self, num_vars):
+        self.num_vars = num_vars
+        # Terminals carry the pseudo variable num_vars, which always sits at the bottom
+        self.var = [num_vars, num_vars]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.level_of = list(range(num_vars + 1))
+        self.var_at = list(range(num_vars + 1))
+        self.unique = [{} for _ in range(num_vars)]
+        self.cache = {}
+        self.free = []
+        self.roots = Counter()
+
+    def __len__(self):
+        """Allocated nodes, terminals included."""
+        return len(self.var) - len(self.free)
+
+    def level(self, u):
+        return self.level_of[self.var[u]]
+
+    def mk(self, v, low, high):
+        if low == high:
+            return low
+        table = self.unique[v]
+        u = table.get((low, high))
+        if u is None:
+            if self.free:
+                u = self.free.pop()
+                self.var[u], self.low[u], self.high[u] = v, low, high
+            else:
+                u = len(self.var)
+                self.var.append(v)
+                self.low.append(low)
+                self.high.append(high)
+            table[(low, high)] = u
+        return u
+
+    def variable(self, v):
+        return self.mk(v, FALSE, TRUE)
+
+    def cofactors(self, u, v):
+        if self.var[u] == v:
+            return self.low[u], self.high[u]
+        return u, u
+
+    def ite(self, f, g, h):
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        key = (f, g, h)
+        r = self.cache.get(key)
+        if r is None:
+            v = self.var_at[min(self.level(f), self.level(g), self.level(h))]
+            f0, f1 = self.cofactors(f, v)
+            g0, g1 = self.cofactors(g, v)
+            h0, h1 = self.cofactors(h, v)
+            r = self.cache[key] = self.mk(v, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        return r
+
+    def and_(self, f, g):
+        return self.ite(f, g, FALSE)
+
+    def or_(self, f, g):
+        return self.ite(f, TRUE, g)
+
+    def not_(self, f):
+        return self.ite(f, FALSE, TRUE)
+
+    def diff(self, f, g):
+        return self.ite(g, FALSE, f)
+
+    def cube(self, cube):
+        """BDD of a (value, care) cube, variable A the most significant bit."""
+        value, care = cube
+        u = TRUE
+        for v in sorted(range(self.num_vars), key=self.level_of.__getitem__, reverse=True):
+            bit = 1 << (self.num_vars - 1 - v)
+            if care & bit:
+                u = self.mk(v, FALSE, u) if value & bit else self.mk(v, u, FALSE)
+        return u
+
+    def from_cubes(self, cubes):
+        """BDD of the union of (value, care) cubes."""
+        u = FALSE
+        for cube in cubes:
+            u = self.or_(u, self.cube(cube))
+        return u
+
+    def from_minterms(self, minterms):
+        """BDD of a set of minterms, splitting the sorted list on one variable at a time."""
+        minterms = minterms if all(a < b for a, b in zip(minterms, minterms[1:])) else sorted(set(minterms))
+        n = self.num_vars
+
+        def build(v, base, start, end):
+            if start == end:
+                return FALSE
+            if end - start == 1 << (n - v):
+                return TRUE
+            middle = base + (1 << (n - 1 - v))
+            split = bisect_left(minterms, middle, start, end)
+            return self.ite(self.variable(v), build(v + 1, middle, split, end), build(v + 1, base, start, split))
+
+        return build(0, 0, 0, len(minterms))
+
+    def evaluate(self, u, minterm):
+        while u > TRUE:
+            v = self.var[u]
+            u = self.high[u] if minterm >> (self.num_vars - 1 - v) & 1 else self.low[u]
+        return u == TRUE
+
+    def contains(self, u, cube):
+        """Whether the (value, care) cube lies inside the function u."""
+        n = self.num_vars
+        value, care = cube
+        memo = {}
+
+        def inside(u):
+            if u <= TRUE:
+                return u == TRUE
+            r = memo.get(u)
+            if r is None:
+                bit = 1 << (n - 1 - self.var[u])
+                if care & bit:
+                    r = inside(self.high[u] if value & bit else self.low[u])
+                else:
+                    r = inside(self.low[u]) and inside(self.high[u])
+                memo[u] = r
+            return r
+
+        return inside(u)
+
+    def pick_minterm(self, u):
+        """Some minterm of a non-empty function, unconstrained variables set to 0."""
+        minterm = 0
+        while u > TRUE:
+            if self.low[u] != FALSE:
+                u = self.low[u]
+            else:
+                minterm |= 1 << (self.num_vars - 1 - self.var[u])
+                u = self.high[u]
+        return minterm
+
+    def size(self, roots):
+        """Nodes reachable from the roots, terminals included."""
+        seen = set()
+        stack = list(roots)
+        while stack:
+            u = stack.pop()
+            if u not in seen:
+                seen.add(u)
+                if u > TRUE:
+                    stack.append(self.low[u])
+                    stack.append(self.high[u])
+        return len(seen)
+
+    def ref(self, u):
+        self.roots[u] += 1
+        return u
+
+    def deref(self, u):
+        self.roots[u] -= 1
+        if self.roots[u] <= 0:
+            del self.roots[u]
+
+    def collect(self, roots=()):
+        """Mark and sweep: free every node not reachable from ref()'d nodes or `roots`."""
+        marked = set()
+        stack = list(self.roots) + list(roots)
+        while stack:
+            u = stack.pop()
+            if u > TRUE and u not in marked:
+                marked.add(u)
+                stack.append(self.low[u])
+                stack.append(self.high[u])
+        freed = 0
+        for table in self.unique:
+            dead = [key for key, u in table.items() if u not in marked]
+            for key in dead:
+                self.free.append(table.pop(key))
+            freed += len(dead)
+        self.cache.clear()
+        return freed
+
+    def swap(self, level):
+        """Exchange the variables at `level` and `level + 1` in place."""
+        x, y = self.var_at[level], self.var_at[level + 1]
+        table = self.unique[x]
+        moved = [u for u in table.values() if self.var[self.low[u]] == y or self.var[self.high[u]] == y]
+        for u in moved:
+            del table[(self.low[u], self.high[u])]
+        for u in moved:
+            f00, f01 = self.cofactors(self.low[u], y)
+            f10, f11 = self.cofactors(self.high[u], y)
+            low, high = self.mk(x, f00, f10), self.mk(x, f01, f11)
+            # The new children depend on x, so no existing y node can be equal to u
+            self.var[u], self.low[u], self.high[u] = y, low, high
+            self.unique[y][(low, high)] = u
+        self.var_at[level], self.var_at[level + 1] = y, x
+        self.level_of[x], self.level_of[y] = level + 1, level
+        self.cache.clear()
+
+    def sift(self, roots=(), max_growth=SIFT_MAX_GROWTH):
+        """Rudell's sifting: move each variable to the level where the diagram is smallest."""
+        roots = list(self.roots) + list(roots)
+        self.collect(roots)
+        for v in sorted(range(self.num_vars), key=lambda v: -len(self.unique[v])):
+            best = self.size(roots)
+            best_level = self.level_of[v]
+            for step in (1, -1):
+                while 0 <= self.level_of[v] + step < self.num_vars:
+                    self.swap(min(self.level_of[v], self.level_of[v] + step))
+                    current = self.size(roots)
+                    if current < best:
+                        best, best_level = current, self.level_of[v]
+                    elif current > max_growth * best:
+                        break
+            while self.level_of[v] != best_level:
+                step = 1 if self.level_of[v] < best_level else -1
+                self.swap(min(self.level_of[v], self.level_of[v] + step))
+            self.collect(roots)
+        return self.size(roots)
+
+
+class ZDD(object):
+    """Zero-suppressed decision diagram of cube sets; variable 2k is the literal of the
+    BDD variable at level k, 2k + 1 its complement."""
+
+    def __init__(self, bdd):
+        self.bdd = bdd
+        self.bottom = 2 * bdd.num_vars
+        self.var = [self.bottom, self.bottom]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.unique = {}
+        self.cache = {}
+
+    def node(self, v, low, high):
+        if high == FALSE:
+            return low
+        key = (v, low, high)
+        u = self.unique.get(key)
+        if u is None:
+            u = self.unique[key] = len(self.var)
+            self.var.append(v)
+            self.low.append(low)
+            self.high.append(high)
+        return u
+
+    def diff(self, p, q):
+        if p == FALSE or p == q:
+            return FALSE
+        if q == FALSE:
+            return p
+        key = (p, q)
+        r = self.cache.get(key)
+        if r is None:
+            vp, vq = self.var[p], self.var[q]
+            if vp < vq:
+                r = self.node(vp, self.diff(self.low[p], q), self.high[p])
+            elif vq < vp:
+                r = self.diff(p, self.low[q])
+            else:
+                r = self.node(vp, self.diff(self.low[p], self.low[q]), self.diff(self.high[p], self.high[q]))
+            self.cache[key] = r
+        return r
+
+    def count(self, p, memo=None):
+        """Number of cubes in the set."""
+        memo = {} if memo is None else memo
+        if p <= TRUE:
+            return p
+        if p not in memo:
+            memo[p] = self.count(self.low[p], memo) + self.count(self.high[p], memo)
+        return memo[p]
+
+    def size(self, p):
+        seen = set()
+        stack = [p]
+        while stack:
+            u = stack.pop()
+            if u not in seen:
+                seen.add(u)
+                if u > TRUE:
+                    stack.append(self.low[u])
+                    stack.append(self.high[u])
+        return len(seen)
+
+    def literal(self, z):
+        """(variable, positive) of a ZDD variable."""
+        return self.bdd.var_at[z >> 1], not z & 1
+
+    def covering(self, p, minterm, memo=None):
+        """The cubes of p that contain the minterm."""
+        memo = {} if memo is None else memo
+        if p <= TRUE:
+            return p
+        if p not in memo:
+            v, positive = self.literal(self.var[p])
+            low = self.covering(self.low[p], minterm, memo)
+            if (minterm >> (self.bdd.num_vars - 1 - v) & 1) == positive:
+                memo[p] = self.node(self.var[p], low, self.covering(self.high[p], minterm, memo))
+            else:
+                memo[p] = low
+        return memo[p]
+
+    def largest(self, p):
+        """(value, care) of a cube of p with the fewest literals; p must not be empty."""
+        fewest = {FALSE: float('inf'), TRUE: 0}
+
+        def literals(u):
+            if u not in fewest:
+                fewest[u] = min(literals(self.low[u]), 1 + literals(self.high[u]))
+            return fewest[u]
+
+        literals(p)
+        n = self.bdd.num_vars
+        value = care = 0
+        while p > TRUE:
+            if literals(self.low[p]) <= 1 + literals(self.high[p]):
+                p = self.low[p]
+            else:
+                v, positive = self.literal(self.var[p])
+                care |= 1 << (n - 1 - v)
+                if positive:
+                    value |= 1 << (n - 1 - v)
+                p = self.high[p]
+        return value, care
+
+    def cubes(self, p):
+        """Yield every cube of p as (value, care)."""
+        n = self.bdd.num_vars
+        stack = [(p, 0, 0)]
+        while stack:
+            u, value, care = stack.pop()
+            if u == TRUE:
+                yield value, care
+            elif u != FALSE:
+                stack.append((self.low[u], value, care))
+                v, positive = self.literal(self.var[u])
+                bit = 1 << (n - 1 - v)
+                stack.append((self.high[u], value | bit if positive else value, care | bit))
+
+
+def implicit_primes(bdd, f, deadline=None):
+    """(ZDD, root) holding every prime implicant of the BDD f.
+
+    Raises SearchTimeout when a perf_counter() deadline passes first."""
+    zdd = ZDD(bdd)
+    memo = {FALSE: FALSE, TRUE: TRUE}
+
+    def primes(u):
+        if u not in memo:
+            if deadline is not None and perf_counter() > deadline:
+                raise SearchTimeout()
+            f0, f1 = bdd.low[u], bdd.high[u]
+            p01 = primes(bdd.and_(f0, f1))
+            z = 2 * bdd.level(u)
+            negative = zdd.node(z + 1, p01, zdd.diff(primes(f0), p01))
+            memo[u] = zdd.node(z, negative, zdd.diff(primes(f1), p01))
+        return memo[u]
+
+    return zdd, primes(f)
+
+
+def expanded_cube(bdd, care, minterm):
+    """Cube grown from the minterm one variable at a time, A first, while inside the care BDD."""
+    n = bdd.num_vars
+    value, care_bits = minterm, (1 << n) - 1
+    for v in range(n):
+        bit = 1 << (n - 1 - v)
+        grown = (value & ~bit, care_bits & ~bit)
+        if bdd.contains(care, grown):
+            value, care_bits = grown
+    return value, care_bits
+
+
+def greedy_cover(bdd, zdd, primes, on, care=None, deadline=None):
+    """(cubes, forced): cubes of the prime set covering the ON-set BDD, largest prime
+    first, made irredundant; forced tells whether every pick was an essential prime.
+
+    Once a perf_counter() deadline passes, or with no primes (zdd None), the
+    remaining cubes are grown inside the care BDD and redundancy is not removed."""
+    chosen = []
+    remaining = on
+    forced = zdd is not None
+    while remaining != FALSE:
+        minterm = bdd.pick_minterm(remaining)
+        if zdd is None or deadline is not None and perf_counter() > deadline:
+            cube = expanded_cube(bdd, care, minterm)
+            zdd, forced = None, False
+        else:
+            options = zdd.covering(primes, minterm)
+            forced = forced and zdd.count(options) == 1
+            cube = zdd.largest(options)
+        chosen.append((cube, bdd.cube(cube)))
+        remaining = bdd.diff(remaining, chosen[-1][1])
+    if deadline is not None and perf_counter() > deadline:
+        return [cube for cube, _ in chosen], forced
+
+    # Drop cubes whose ON minterms are covered by the others, keeping later picks
+    after = [FALSE] * len(chosen)
+    for i in range(len(chosen) - 2, -1, -1):
+        after[i] = bdd.or_(after[i + 1], chosen[i + 1][1])
+    kept = []
+    before = FALSE
+    for (cube, u), rest in zip(chosen, after):
+        if bdd.diff(bdd.and_(on, u), bdd.or_(before, rest)) != FALSE:
+            kept.append(cube)
+            before = bdd.or_(before, u)
+    return kept, forced
+
+
+def cover_implicit(bdd, on, care, sift=None, deadline=None):
+    """Cover of the ON-set BDD from the primes of the care (ON or don't care) BDD.
+
+    Both must be ref()'d, as must any other node of the manager still in use.
+    A perf_counter() deadline bounds the prime generation and the cover search."""
+    nodes = bdd.size([on, care])
+    if sift is None:
+        sift = nodes >= SIFT_MIN_NODES and (deadline is None or perf_counter() < deadline)
+    sifted = bdd.sift() if sift else nodes
+    try:
+        zdd, primes = implicit_primes(bdd, care, deadline)
+    except SearchTimeout:
+        zdd, primes = None, FALSE
+    cubes, proven = greedy_cover(bdd, zdd, primes, on, care, deadline)
+    cubes.sort(key=lambda c: term_order(c, bdd.num_vars))
+    if zdd is None:
+        return ImplicitCover(cubes, None, nodes, sifted, None, False)
+    return ImplicitCover(cubes, zdd.count(primes), nodes, sifted, zdd.size(primes), proven)
+
+
+def minimize_implicit(num_vars, on, dc=(), sift=None, time_budget_ms=None):
+    """Cover of the ON-set from implicitly generated primes, with diagram sizes."""
+    deadline = None if time_budget_ms is None else perf_counter() + time_budget_ms / 1000.0
+    bdd = BDD(num_vars)
+    on_node = bdd.ref(bdd.from_minterms(list(on)))
+    care = bdd.ref(bdd.or_(on_node, bdd.from_minterms(list(dc))))
+    return cover_implicit(bdd, on_node, care, sift, deadline)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for the K-Map MCP server.
+
+Spawns one stdio server per client (or targets an HTTP endpoint with --url),
+drives concurrent tools/call traffic with a weighted mix of random maps and
+reports throughput plus p50/p95/p99 latency. Every answer is checked against
+the local solver, so a wrong result counts as an error, not just a slow one.
+
+    python bench_mcp.py --clients 8 --requests 500 --output bench_mcp.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from solvers import KMapSolver2, KMapSolver3, KMapSolver4
+
+SOLVERS = {2: KMapSolver2, 3: KMapSolver3, 4: KMapSolver4}
+SHAPES = {2: (2, 2), 3: (2, 4), 4: (4, 4)}
+
+# Cell values drawn as 0, 1 and don't care, roughly what users send
+CELL_WEIGHTS = (0.45, 0.45, 0.10)
+
+
+def parse_mix(text: str) -> Dict[int, float]:
+    mix = {}
+    for part in text.split(","):
+        num_vars, weight = part.split(":")
+        if int(num_vars) not in SOLVERS:
+            raise argparse.ArgumentTypeError(f"no solve tool for {num_vars} variables")
+        mix[int(num_vars)] = float(weight)
+    return mix
+
+
+def make_workload(mix: Dict[int, float], count: int, seed: int) -> List[Dict[str, Any]]:
+    """Fixed-seed list of tool calls with the expected expression of each."""
+    rng = random.Random(seed)
+    sizes = list(mix)
+    weights = [mix[n] for n in sizes]
+    workload = []
+    for _ in range(count):
+        num_vars = rng.choices(sizes, weights)[0]
+        rows, cols = SHAPES[num_vars]
+        map_data = [rng.choices((0, 1, 2), CELL_WEIGHTS, k=cols) for _ in range(rows)]
+        solver = SOLVERS[num_vars]([row[:] for row in map_data])
+        solver.solve()
+        workload.append({
+            "tool": f"solve_kmap_{num_vars}",
+            "arguments": {"map_data": map_data},
+            "expected": solver.get_result(),
+        })
+    return workload
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+    }
+
+
+class StdioTransport:
+    """JSON-RPC over the stdin/stdout of a spawned server, with requests matched by id."""
+
+    def __init__(self, server: str):
+        self.server = server
+        self.process = None
+        self.pending = {}
+        self.reader = None
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, self.server,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self.reader = asyncio.create_task(self.read_responses())
+
+    async def read_responses(self):
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            future = self.pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("MCP server closed its stdout"))
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message["id"]] = future
+        await self.notify(message)
+        return await future
+
+    async def notify(self, message: Dict[str, Any]):
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+        await self.process.stdin.drain()
+
+    async def close(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+        if self.reader:
+            self.reader.cancel()
+
+
+class HttpTransport:
+    """JSON-RPC over the streamable HTTP transport of an already running server."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.client = None
+        self.session_id = None
+
+    async def start(self):
+        import httpx
+        self.client = httpx.AsyncClient(timeout=60.0)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"Accept": "application/json, text/event-stream"}
+        if self.session_id:
+            headers["mcp-session-id"] = self.session_id
+        return headers
+
+    async def post(self, message: Dict[str, Any]):
+        response = await self.client.post(self.url, json=message, headers=self.headers())
+        response.raise_for_status()
+        self.session_id = response.headers.get("mcp-session-id", self.session_id)
+        return response
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self.post(message)
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            for line in response.text.splitlines():
+                if line.startswith("data:"):
+                    data = json.loads(line[5:])
+                    if data.get("id") == message["id"]:
+                        return data
+            raise ConnectionError("no response event in the SSE stream")
+        return response.json()
+
+    async def notify(self, message: Dict[str, Any]):
+        await self.post(message)
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+
+
+class LoadClient:
+    def __init__(self, transport, pipeline: int):
+        self.transport = transport
+        self.pipeline = pipeline
+        self.next_id = 1
+
+    def message(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        message = {"jsonrpc": "2.0", "id": self.next_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        self.next_id += 1
+        return message
+
+    async def initialize(self):
+        await self.transport.start()
+        response = await self.transport.request(self.message("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "bench-mcp", "version": "1.0.0"},
+        }))
+        if "result" not in response:
+            raise RuntimeError(f"initialize failed: {response}")
+        await self.transport.notify({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async def call(self, item: Dict[str, Any], results: List[Dict[str, Any]]):
+        message = self.message("tools/call", {"name": item["tool"], "arguments": item["arguments"]})
+        start = time.perf_counter()
+        error = None
+        try:
+            response = await self.transport.request(message)
+            if "result" not in response:
+                error = f"JSON-RPC error: {response.get('error')}"
+            else:
+                text = response["result"]["content"][0]["text"]
+                if not text.rstrip().endswith("= " + item["expected"]):
+                    error = f"unexpected result for {item['arguments']}: {text.splitlines()[-1]}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.append({
+            "tool": item["tool"],
+            "latency_ms": (time.perf_counter() - start) * 1000.0,
+            "error": error,
+        })
+
+    async def run(self, queue: asyncio.Queue, results: List[Dict[str, Any]]):
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self.call(item, results)
+
+        await asyncio.gather(*(worker() for _ in range(self.pipeline)))
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    workload = make_workload(args.mix, args.requests, args.seed)
+    warmup = make_workload(args.mix, args.warmup * args.clients, args.seed + 1)
+
+    clients = []
+    for _ in range(args.clients):
+        transport = HttpTransport(args.url) if args.url else StdioTransport(args.server)
+        clients.append(LoadClient(transport, args.pipeline))
+
+    try:
+        await asyncio.gather(*(c.initialize() for c in clients))
+
+        queue = asyncio.Queue()
+        for item in warmup:
+            queue.put_nowait(item)
+        await asyncio.gather(*(c.run(queue, []) for c in clients))
+
+        queue = asyncio.Queue()
+        for item in workload:
+            queue.put_nowait(item)
+        results = []
+        start = time.perf_counter()
+        await asyncio.gather(*(c.run(queue, results) for c in clients))
+        elapsed = time.perf_counter() - start
+    finally:
+        await asyncio.gather(*(c.transport.close() for c in clients), return_exceptions=True)
+
+    ok = [r["latency_ms"] for r in results if r["error"] is None]
+    errors = [r["error"] for r in results if r["error"] is not None]
+    per_tool = {}
+    for tool in sorted({r["tool"] for r in results}):
+        per_tool[tool] = summarize([r["latency_ms"] for r in results if r["tool"] == tool and r["error"] is None])
+
+    return {
+        "config": {
+            "transport": "http" if args.url else "stdio",
+            "target": args.url or args.server,
+            "clients": args.clients,
+            "pipeline": args.pipeline,
+            "requests": args.requests,
+            "mix": {str(k): v for k, v in args.mix.items()},
+            "seed": args.seed,
+            "python": sys.version.split()[0],
+        },
+        "elapsed_s": elapsed,
+        "throughput_rps": len(results) / elapsed if elapsed else 0.0,
+        "errors": len(errors),
+        "error_samples": errors[:10],
+        "latency": summarize(ok),
+        "per_tool": per_tool,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    config = report["config"]
+    print(f"Target: {config['target']} ({config['transport']}), "
+          f"{config['clients']} clients x {config['pipeline']} in flight")
+    print(f"Requests: {config['requests']} in {report['elapsed_s']:.2f}s "
+          f"-> {report['throughput_rps']:.1f} req/s, {report['errors']} errors")
+    rows = [("all", report["latency"])] + list(report["per_tool"].items())
+    print(f"{'tool':<14}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for name, s in rows:
+        print(f"{name:<14}{s['count']:>8}{s['mean_ms']:>10.2f}{s['p50_ms']:>10.2f}"
+              f"{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}")
+    for error in report["error_samples"]:
+        print(f"  error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the K-Map MCP server")
+    parser.add_argument("--server", default="mcp_server.py", help="stdio server script to spawn per client")
+    parser.add_argument("--url", help="streamable HTTP endpoint to target instead of spawning stdio servers")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent client sessions")
+    parser.add_argument("--pipeline", type=int, default=1, help="requests in flight per session")
+    parser.add_argument("--requests", type=int, default=1000, help="measured tool calls in total")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured tool calls per client")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("2:1,3:2,4:7"),
+                        help="weighted map sizes, e.g. 2:1,3:2,4:7")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="write the machine-readable report to this JSON file")
+    parser.add_argument("--max-errors", type=int, default=0, help="exit non-zero above this many errors")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if report["errors"] > args.max_errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Solver micro-benchmarks with stored baselines.
+
+    python bench_solvers.py run --output baseline.json
+    python bench_solvers.py run --output current.json
+    python bench_solvers.py compare baseline.json current.json
+    python bench_solvers.py evaluate --vectors 1000000
+    python bench_solvers.py batch --maps 200000 --workers 8
+
+`run` times every engine on fixed-seed random maps, the exhaustive 2 and 3
+variable spaces and adversarial 4 variable maps, keeping every sample.
+`compare` exits non-zero when a case got slower by more than --threshold
+and a one-sided Mann-Whitney U test says the slowdown is significant.
+`evaluate` times evaluating solve results over random input vectors by
+re-parsing the string per vector, with the compiled function and with the
+bit-sliced NumPy evaluator. `batch` solves one batch on a process pool
+through pickled task arguments and through shared memory.
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import itertools
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+from batch import solve_pickled, solve_shared
+from evaluators import pack_columns
+from minimizer import map_to_minterms, minimize, cubes_to_expression, covers
+from solvers import (KMapSolver2, KMapSolver3, KMapSolver4, KMapSolver5, KMapSolver6,
+                     SolveProfile, profile_solves, solve_map)
+from verifier import parse_sop
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SOLVERS = {2: KMapSolver2, 3: KMapSolver3, 4: KMapSolver4, 5: KMapSolver5, 6: KMapSolver6}
+SHAPES = {2: (2, 2), 3: (2, 4), 4: (4, 4), 5: (4, 8), 6: (8, 8)}
+
+
+def solve_kmap(map_data, num_vars):
+    solver = SOLVERS[num_vars](map_data)
+    solver.solve()
+    return solver.get_result()
+
+
+def solve_cubes(map_data, num_vars):
+    on, dc = map_to_minterms(map_data, num_vars)
+    return cubes_to_expression(minimize(num_vars, on, dc), num_vars)
+
+
+# name -> callable(map_data, num_vars) returning the expression
+ENGINES = {
+    'kmap': solve_kmap,
+    'cube': solve_cubes,
+}
+
+
+def random_maps(num_vars, count, seed):
+    rng = random.Random(seed)
+    rows, cols = SHAPES[num_vars]
+    return [[rng.choices((0, 1, 2), (0.45, 0.45, 0.10), k=cols) for _ in range(rows)]
+            for _ in range(count)]
+
+
+def exhaustive_maps(num_vars):
+    rows, cols = SHAPES[num_vars]
+    for cells in itertools.product((0, 1, 2), repeat=rows * cols):
+        yield [list(cells[r * cols:(r + 1) * cols]) for r in range(rows)]
+
+
+def adversarial_maps_4():
+    maps = [
+        [[(i + j) % 2 for j in range(4)] for i in range(4)],      # checkerboard
+        [[(i + j + 1) % 2 for j in range(4)] for i in range(4)],  # inverted checkerboard
+        [[2] * 4 for _ in range(4)],                              # all don't care
+        [[1] * 4 for _ in range(4)],
+        [[0] * 4 for _ in range(4)],
+    ]
+    for k in range(16):
+        single = [[0] * 4 for _ in range(4)]
+        single[k // 4][k % 4] = 1
+        maps.append(single)
+        hole = [[1] * 4 for _ in range(4)]
+        hole[k // 4][k % 4] = 0
+        maps.append(hole)
+    return maps
+
+
+def build_cases(seed):
+    """name -> (num_vars, maps)"""
+    return {
+        'random-2': (2, random_maps(2, 500, seed)),
+        'random-3': (3, random_maps(3, 500, seed)),
+        'random-4': (4, random_maps(4, 500, seed)),
+        'random-5': (5, random_maps(5, 50, seed)),
+        'random-6': (6, random_maps(6, 20, seed)),
+        'exhaustive-2': (2, list(exhaustive_maps(2))),
+        'exhaustive-3': (3, list(exhaustive_maps(3))),
+        'adversarial-4': (4, adversarial_maps_4()),
+    }
+
+
+def engine_supports(engine, num_vars):
+    return engine != 'kmap' or num_vars in SOLVERS
+
+
+def time_pass(solve, num_vars, maps, rounds):
+    # Solvers may keep references to the rows, so every pass gets fresh copies
+    copies = [[[row[:] for row in m] for m in maps] for _ in range(rounds)]
+    gc.collect()
+    start = time.perf_counter_ns()
+    for batch in copies:
+        for m in batch:
+            solve(m, num_vars)
+    return time.perf_counter_ns() - start
+
+
+def time_case(engine, num_vars, maps, repeats, min_sample_ms):
+    """Samples of the mean solve time per map, in microseconds."""
+    solve = ENGINES[engine]
+    # Small cases are repeated within a sample so timer and scheduler noise stay small
+    first = time_pass(solve, num_vars, maps, 1)
+    rounds = max(1, math.ceil(min_sample_ms * 1e6 / max(first, 1)))
+    samples = []
+    for _ in range(repeats):
+        elapsed = time_pass(solve, num_vars, maps, rounds)
+        samples.append(elapsed / 1000.0 / (len(maps) * rounds))
+    return samples
+
+
+def run(args):
+    cases = build_cases(args.seed)
+    engines = args.engines.split(',') if args.engines else list(ENGINES)
+    selected = args.cases.split(',') if args.cases else list(cases)
+
+    results = {}
+    for engine in engines:
+        for name in selected:
+            num_vars, maps = cases[name]
+            if not engine_supports(engine, num_vars):
+                continue
+            repeats = args.repeats if len(maps) < 1000 else max(3, args.repeats // 3)
+            samples = time_case(engine, num_vars, maps, repeats, args.min_sample_ms)
+            key = f"{engine}/{name}"
+            results[key] = {
+                'maps': len(maps),
+                'samples_us_per_map': samples,
+                'median_us_per_map': statistics.median(samples),
+            }
+            print(f"{key:<28}{len(maps):>7} maps {statistics.median(samples):>12.2f} us/map "
+                  f"(min {min(samples):.2f}, {len(samples)} samples)")
+
+    report = {
+        'meta': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+def phases(args):
+    """Per-phase breakdown of KMapSolver.solve() for each case."""
+    cases = build_cases(args.seed)
+    selected = args.cases.split(',') if args.cases else list(cases)
+    report = {}
+    for name in selected:
+        num_vars, maps = cases[name]
+        with profile_solves(SolveProfile()) as profile:
+            for m in maps:
+                solve_kmap([row[:] for row in m], num_vars)
+        report[name] = profile.as_dict()
+        print(f"{name}: {profile.summary()}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+def evaluate_naive(expression, num_vars, minterm):
+    return any(covers(cube, minterm) for cube in parse_sop(expression, num_vars))
+
+
+def evaluate(args):
+    """ns per input vector of each way to evaluate a solve result."""
+    rng = random.Random(args.seed)
+    num_vars = args.num_vars
+    results = [solve_map(m, num_vars) for m in random_maps(num_vars, args.functions, args.seed)]
+    vectors = [rng.randrange(1 << num_vars) for _ in range(args.vectors)]
+    # Re-parsing per vector is slow, so it runs on a slice and is scaled
+    naive_vectors = vectors[:max(1, args.vectors // 20)]
+
+    timings = {}
+    began = time.perf_counter()
+    for r in results:
+        for m in naive_vectors:
+            evaluate_naive(r.expression, num_vars, m)
+    timings['re-parse per vector'] = (time.perf_counter() - began) / (len(results) * len(naive_vectors))
+
+    began = time.perf_counter()
+    for r in results:
+        f = r.evaluator()
+        for m in vectors:
+            f(m)
+    timings['compiled function'] = (time.perf_counter() - began) / (len(results) * len(vectors))
+
+    if np is not None:
+        began = time.perf_counter()
+        columns = pack_columns(vectors, num_vars)
+        packing = time.perf_counter() - began
+        began = time.perf_counter()
+        for r in results:
+            r.word_evaluator()(columns)
+        timings['bit-sliced words'] = (time.perf_counter() - began) / (len(results) * len(vectors))
+        timings['bit-sliced + packing'] = timings['bit-sliced words'] + packing / (len(results) * len(vectors))
+
+    base = timings['re-parse per vector']
+    print(f"{num_vars} variables, {len(results)} results, {len(vectors)} vectors")
+    print(f"{'method':<24}{'ns/vector':>12}{'speedup':>10}")
+    for name, seconds in timings.items():
+        print(f"{name:<24}{seconds * 1e9:>12.2f}{base / seconds:>10.1f}x")
+    return 0
+
+
+def batch(args):
+    """Wall time of one pool batch, pickling the maps versus sharing them."""
+    maps = random_maps(args.num_vars, args.maps, args.seed)
+    timings = {}
+    with multiprocessing.Pool(args.workers) as pool:
+        # Warm the workers up so neither path pays for their start
+        solve_pickled(maps[:args.workers], args.num_vars, pool, chunk=1)
+        solve_shared(maps[:args.workers], args.num_vars, pool, chunk=1)
+        for name, solve in (('pickled', solve_pickled), ('shared memory', solve_shared)):
+            samples = []
+            for _ in range(args.repeats):
+                began = time.perf_counter()
+                results = solve(maps, args.num_vars, pool, chunk=args.chunk)
+                samples.append(time.perf_counter() - began)
+            timings[name] = (min(samples), results)
+    if timings['pickled'][1] != timings['shared memory'][1]:
+        print("Shared memory results differ from the pickled ones")
+        return 1
+
+    base = timings['pickled'][0]
+    print(f"{args.maps} {args.num_vars}-variable maps, {args.workers} workers, chunks of {args.chunk}")
+    print(f"{'path':<16}{'seconds':>10}{'maps/s':>12}{'speedup':>10}")
+    for name, (seconds, _) in timings.items():
+        print(f"{name:<16}{seconds:>10.3f}{args.maps / seconds:>12,.0f}{base / seconds:>9.2f}x")
+    return 0
+
+
+def mann_whitney_greater(a, b):
+    """One-sided p-value that samples b tend to be larger than samples a."""
+    pooled = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    ranks = [0.0] * len(pooled)
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2.0 + 1
+        i = j + 1
+    n1, n2 = len(a), len(b)
+    rank_sum_b = sum(r for r, (_, group) in zip(ranks, pooled) if group == 1)
+    u = rank_sum_b - n2 * (n2 + 1) / 2.0
+    mean = n1 * n2 / 2.0
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12.0)
+    if sd == 0:
+        return 1.0
+    z = (u - mean - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    with open(args.current) as f:
+        current = json.load(f)['results']
+
+    regressions = 0
+    print(f"{'case':<28}{'baseline':>12}{'current':>12}{'change':>9}{'p':>9}")
+    for key in sorted(set(baseline) & set(current)):
+        old = baseline[key]['samples_us_per_map']
+        new = current[key]['samples_us_per_map']
+        old_median, new_median = statistics.median(old), statistics.median(new)
+        change = new_median / old_median - 1.0 if old_median else 0.0
+        p = mann_whitney_greater(old, new)
+        regressed = change > args.threshold and p < args.alpha
+        regressions += regressed
+        print(f"{key:<28}{old_median:>12.2f}{new_median:>12.2f}{change:>+8.1%}{p:>9.4f}"
+              f"{'  REGRESSION' if regressed else ''}")
+    for key in sorted(set(baseline) - set(current)):
+        print(f"{key:<28}  missing from {args.current}")
+
+    if regressions:
+        print(f"{regressions} significant slowdown(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K-Map solver micro-benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='time the engines and optionally store a baseline')
+    run_parser.add_argument('--output', help='JSON file for the samples')
+    run_parser.add_argument('--engines', help=f"comma separated, from {','.join(ENGINES)}")
+    run_parser.add_argument('--cases', help='comma separated case names')
+    run_parser.add_argument('--repeats', type=int, default=15)
+    run_parser.add_argument('--min-sample-ms', type=float, default=50.0,
+                            help='repeat small cases until each sample takes this long')
+    run_parser.add_argument('--seed', type=int, default=2024)
+    run_parser.set_defaults(func=run)
+
+    phases_parser = commands.add_parser('phases', help='per-phase breakdown of KMapSolver.solve()')
+    phases_parser.add_argument('--output', help='JSON file for the phase totals')
+    phases_parser.add_argument('--cases', help='comma separated case names')
+    phases_parser.add_argument('--seed', type=int, default=2024)
+    phases_parser.set_defaults(func=phases)
+
+    compare_parser = commands.add_parser('compare', help='fail on significant slowdowns')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.05,
+                                help='relative slowdown of the median to flag (default 5%%)')
+    compare_parser.add_argument('--alpha', type=float, default=0.01,
+                                help='significance level of the Mann-Whitney test')
+    compare_parser.set_defaults(func=compare)
+
+    evaluate_parser = commands.add_parser('evaluate', help='time compiled evaluators of solve results')
+    evaluate_parser.add_argument('--num-vars', type=int, default=6, choices=sorted(SOLVERS))
+    evaluate_parser.add_argument('--functions', type=int, default=20)
+    evaluate_parser.add_argument('--vectors', type=int, default=200000)
+    evaluate_parser.add_argument('--seed', type=int, default=2024)
+    evaluate_parser.set_defaults(func=evaluate)
+
+    batch_parser = commands.add_parser('batch', help='pickled versus shared memory pool batches')
+    batch_parser.add_argument('--num-vars', type=int, default=4, choices=sorted(SOLVERS))
+    batch_parser.add_argument('--maps', type=int, default=100000)
+    batch_parser.add_argument('--workers', type=int, default=os.cpu_count())
+    batch_parser.add_argument('--chunk', type=int, default=2048)
+    batch_parser.add_argument('--repeats', type=int, default=3)
+    batch_parser.add_argument('--seed', type=int, default=2024)
+    batch_parser.set_defaults(func=batch)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
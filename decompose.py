@@ -0,0 +1,229 @@
+"""
+K-Map Solver Support Reduction and Decomposition
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Both steps keep the minimum cover minimum:
+#  - a variable whose two cofactors are equal (ON and don't care alike) never
+#    appears in a minimum cover, so it is dropped;
+#  - a fully specified F = G(X1) + H(X2) + ... over disjoint variable blocks
+#    has exactly the primes of its parts, so each part is minimized alone.
+#    F splits that way when its OFF-set is the Cartesian product of the
+#    OFF-sets of the parts.
+# Two variables whose pair projection of the OFF-set is not a product always
+# share a block, so the block search runs over the groups those pairs link.
+
+from collections import namedtuple
+from itertools import combinations
+
+from minimizer import minimize, term_order
+from verifier import variable_masks, full_mask, mask_minterms, minterms_mask
+
+# Block search tries subsets of these many variable groups at most; with more
+# groups they are only checked as a whole
+DECOMPOSE_MAX_VARS = 10
+
+# Wider functions are not split, their truth tables would be too large
+DECOMPOSE_TABLE_MAX_VARS = 20
+
+# variables: original variable indexes, A = 0; on / dc: minterms over those variables only
+Subproblem = namedtuple('Subproblem', 'variables on dc')
+
+
+def cofactors(mask, num_vars, v):
+    """(F with v = 0, F with v = 1) as truth tables aligned on the v = 0 half."""
+    var_mask = variable_masks(num_vars)[v]
+    return mask & ~var_mask, (mask & var_mask) >> (1 << (num_vars - 1 - v))
+
+
+def vacuous_variables(num_vars, on, dc):
+    """Variables the function does not depend on, on and dc given as truth tables."""
+    vacuous = []
+    for v in range(num_vars):
+        on0, on1 = cofactors(on, num_vars, v)
+        dc0, dc1 = cofactors(dc, num_vars, v)
+        if on0 == on1 and dc0 == dc1:
+            vacuous.append(v)
+    return vacuous
+
+
+def compress(minterm, variables, num_vars):
+    """Bits of the given variables, first variable most significant."""
+    index = 0
+    for v in variables:
+        index = (index << 1) | (minterm >> (num_vars - 1 - v) & 1)
+    return index
+
+
+def restrict(mask, num_vars, variables):
+    """Minterms over `variables` of a function that does not depend on the others."""
+    if len(variables) == num_vars:
+        return mask_minterms(mask)
+    dropped = 0
+    for v in range(num_vars):
+        if v not in variables:
+            dropped |= variable_masks(num_vars)[v]
+    return [compress(m, variables, num_vars) for m in mask_minterms(mask & ~dropped)]
+
+
+def exists(mask, num_vars, v):
+    """Existential quantification of v, still as a truth table over all num_vars variables."""
+    either = mask & ~variable_masks(num_vars)[v] | cofactors(mask, num_vars, v)[1]
+    return either | either << (1 << (num_vars - 1 - v))
+
+
+def linked_groups(num_vars, off):
+    """Variables joined through pairs whose projection of the OFF-set is not a product, as bitmasks."""
+    masks = variable_masks(num_vars)
+    everything = (1 << (1 << num_vars)) - 1
+    literals = [(everything & ~m, m) for m in masks]
+    parent = list(range(num_vars))
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    present = [[bool(off & lit) for lit in pair] for pair in literals]
+    for x, y in combinations(range(num_vars), 2):
+        if find(x) == find(y):
+            continue
+        for a in (0, 1):
+            restricted = off & literals[x][a]
+            if any(bool(restricted & literals[y][b]) != (present[x][a] and present[y][b]) for b in (0, 1)):
+                parent[find(y)] = find(x)
+                break
+
+    groups = {}
+    for v in range(num_vars):
+        groups[find(v)] = groups.get(find(v), 0) | 1 << v
+    return sorted(groups.values(), key=lambda g: g & -g)
+
+
+def factor_blocks(num_vars, off):
+    """Finest partition of the variables with the OFF-set (a truth table) the product of its projections.
+
+    Past DECOMPOSE_MAX_VARS linked groups the groups are returned when they
+    factor the OFF-set, a single block otherwise."""
+    # Variable sets are bitmasks here, bit v standing for variable v
+    quantified = {0: off}
+
+    def without(dropped):
+        table = quantified.get(dropped)
+        if table is None:
+            low = dropped & -dropped
+            table = quantified[dropped] = exists(without(dropped ^ low), num_vars, low.bit_length() - 1)
+        return table
+
+    everything = (1 << num_vars) - 1
+
+    def size(keep):
+        # Number of points in the projection onto the kept variables
+        dropped = everything & ~keep
+        return bin(without(dropped)).count('1') >> bin(dropped).count('1')
+
+    groups = linked_groups(num_vars, off)
+    if len(groups) > DECOMPOSE_MAX_VARS:
+        product = 1
+        for group in groups:
+            product *= size(group)
+        if product != size(everything):
+            groups = [everything]
+        return [[v for v in range(num_vars) if group >> v & 1] for group in groups]
+
+    blocks = []
+    remaining = everything
+    while remaining:
+        first = next(g for g in groups if g & remaining)
+        others = [g for g in groups if g & remaining and g != first]
+        total = size(remaining)
+        block = remaining
+        # Separable blocks are closed under intersection, so the smallest one is the factor
+        for extra in range(len(others)):
+            for chosen in combinations(others, extra):
+                candidate = first | sum(chosen)
+                if total == size(candidate) * size(remaining & ~candidate):
+                    block = candidate
+                    break
+            if block != remaining:
+                break
+        blocks.append([v for v in range(num_vars) if block >> v & 1])
+        remaining &= ~block
+    return blocks
+
+
+def decompose(num_vars, on, dc=()):
+    """Independent subproblems whose covers together form a minimum cover of (on, dc)."""
+    on_mask = minterms_mask(on)
+    dc_mask = minterms_mask(dc) & ~on_mask
+    if not on_mask:
+        return []
+
+    vacuous = vacuous_variables(num_vars, on_mask, dc_mask)
+    support = [v for v in range(num_vars) if v not in vacuous]
+    on = restrict(on_mask, num_vars, support)
+    dc = restrict(dc_mask, num_vars, support)
+    n = len(support)
+
+    if dc or n > DECOMPOSE_TABLE_MAX_VARS or len(on) == 1 << n:
+        return [Subproblem(tuple(support), on, dc)]
+
+    off = full_mask(n) & ~minterms_mask(on)
+    blocks = factor_blocks(n, off)
+    if len(blocks) == 1:
+        return [Subproblem(tuple(support), on, dc)]
+
+    parts = []
+    for block in blocks:
+        projection = off
+        for v in range(n):
+            if v not in block:
+                projection = exists(projection, n, v)
+        block_off = set(restrict(projection, n, block))
+        block_on = [m for m in range(1 << len(block)) if m not in block_off]
+        parts.append(Subproblem(tuple(support[v] for v in block), block_on, []))
+    return parts
+
+
+def embed_cube(cube, variables, num_vars):
+    """Cube over a subproblem's variables as a cube over all num_vars variables."""
+    value, care = cube
+    width = len(variables)
+    full_value = full_care = 0
+    for k, v in enumerate(variables):
+        bit = 1 << (width - 1 - k)
+        if care & bit:
+            target = 1 << (num_vars - 1 - v)
+            full_care |= target
+            if value & bit:
+                full_value |= target
+    return full_value, full_care
+
+
+def minimize_decomposed(num_vars, on, dc=()):
+    """minimize() after support reduction and disjoint decomposition."""
+    cubes = []
+    for part in decompose(num_vars, on, dc):
+        for cube in minimize(len(part.variables), part.on, part.dc):
+            cubes.append(embed_cube(cube, part.variables, num_vars))
+    return sorted(cubes, key=lambda c: term_order(c, num_vars))
@@ -0,0 +1,116 @@
+"""
+K-Map Solver Compiled Evaluators
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# A minimized sum of products is turned into Python source once and cached:
+#
+#     "AB' + C'D"  ->  def F(m): return m & 12 == 8 or m & 3 == 1
+#
+# for one input vector given as a minterm index, and
+#
+#     def F(c): return (c[0] & ~c[1]) | (~c[2] & c[3])
+#
+# for bit-sliced input: c[v] packs variable v of 64 vectors into each
+# uint64 word, so one pass evaluates 64 vectors per word operation.
+
+from functools import lru_cache
+
+from verifier import parse_sop
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _function(name, argument, body, source):
+    namespace = {}
+    text = f"def {name}({argument}):\n    return {body}\n"
+    exec(compile(text, f"<{source}>", 'exec'), namespace)
+    function = namespace[name]
+    function.source = text
+    return function
+
+
+def _cube_literals(cube, num_vars):
+    value, care = cube
+    for v in range(num_vars):
+        bit = 1 << (num_vars - 1 - v)
+        if care & bit:
+            yield v, bool(value & bit)
+
+
+@lru_cache(maxsize=1024)
+def compile_evaluator(sop, num_vars):
+    """Function of a minterm index returning the value of the sum of products."""
+    cubes = parse_sop(sop, num_vars)
+    terms = [f"m & {care} == {value}" if care else 'True' for value, care in cubes]
+    return _function('F', 'm', ' or '.join(terms) or 'False', sop)
+
+
+@lru_cache(maxsize=1024)
+def compile_word_evaluator(sop, num_vars):
+    """Function of packed input columns (one uint64 array per variable, A first)
+    returning the packed output words."""
+    if np is None:
+        raise RuntimeError("NumPy is required for word evaluation")
+    cubes = parse_sop(sop, num_vars)
+    if not cubes or any(care == 0 for _, care in cubes):
+        # Constant result, which still needs the shape of the batch
+        word = np.uint64(0) if not cubes else ~np.uint64(0)
+        return lambda c: np.full(len(c[0]) if len(c) else 1, word, dtype=np.uint64)
+    terms = []
+    for cube in cubes:
+        terms.append(' & '.join(f"c[{v}]" if positive else f"~c[{v}]"
+                                for v, positive in _cube_literals(cube, num_vars)))
+    return _function('F', 'c', ' | '.join(f"({term})" for term in terms), sop)
+
+
+def pack_columns(minterms, num_vars):
+    """(num_vars, ceil(N / 64)) uint64 columns of N input vectors given as minterm indexes."""
+    if np is None:
+        raise RuntimeError("NumPy is required for word evaluation")
+    minterms = np.asarray(minterms, dtype=np.uint32)
+    words = (len(minterms) + 63) // 64
+    columns = np.zeros((num_vars, words), dtype=np.uint64)
+    for v in range(num_vars):
+        bits = ((minterms >> np.uint32(num_vars - 1 - v)) & np.uint32(1)).astype(np.uint8)
+        packed = np.packbits(bits, bitorder='little')
+        packed = np.pad(packed, (0, 8 * words - len(packed)))
+        columns[v] = packed.view('<u8')
+    return columns
+
+
+def unpack_words(words, count):
+    """Boolean array of the first count outputs of packed output words."""
+    bits = np.unpackbits(np.ascontiguousarray(words, dtype='<u8').view(np.uint8), bitorder='little')
+    return bits[:count].astype(bool)
+
+
+def evaluate_minterms(sop, num_vars, minterms):
+    """Value of the sum of products on each input vector, bit-sliced when NumPy is available."""
+    if np is None:
+        evaluate = compile_evaluator(sop, num_vars)
+        return [evaluate(m) for m in minterms]
+    words = compile_word_evaluator(sop, num_vars)(pack_columns(minterms, num_vars))
+    return unpack_words(words, len(minterms))
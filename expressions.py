@@ -0,0 +1,294 @@
+"""
+K-Map Solver Boolean Expressions
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Expressions such as "A'B + AC + BCD'" or "~(A & B) | C ^ D" are parsed
+# into a small tuple AST and evaluated bit-sliced: every variable is its
+# whole truth table as an int, so one AND, OR or XOR evaluates an operator
+# over all 2**n rows at once.
+#
+# Precedence, tightest first: NOT (prefix ~ or !, postfix '), AND (* & or
+# juxtaposition), XOR (^), OR (+ |). Variables are the letters A..Z, case
+# insensitive, A being the most significant bit of a minterm index.
+
+from collections import namedtuple
+from functools import lru_cache
+from time import perf_counter
+
+from minimizer import VARIABLE_NAMES, cube_to_term, cubes_to_expression
+from helpers import pos_from_terms
+from solvers import SolveResult
+from sparse import SparseFunction
+from verifier import variable_masks, full_mask, mask_minterms
+
+NOT_PREFIX = '~!¬'
+NOT_POSTFIX = '\'’'
+AND_OPS = '*&·'
+XOR_OPS = '^⊕'
+OR_OPS = '+|'
+
+
+class _Parser(object):
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def error(self, message):
+        raise ValueError(f"{message} at position {self.pos} in '{self.text}'")
+
+    def peek(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def parse(self):
+        if not self.peek():
+            self.error("Empty expression")
+        node = self.or_expr()
+        if self.peek():
+            self.error(f"Unexpected '{self.peek()}'")
+        return node
+
+    def nary(self, op, operand, symbols):
+        args = [operand()]
+        while self.peek() and self.peek() in symbols:
+            self.pos += 1
+            args.append(operand())
+        return args[0] if len(args) == 1 else (op, tuple(args))
+
+    def or_expr(self):
+        return self.nary('or', self.xor_expr, OR_OPS)
+
+    def xor_expr(self):
+        return self.nary('xor', self.and_expr, XOR_OPS)
+
+    def and_expr(self):
+        args = [self.unary()]
+        while True:
+            ch = self.peek()
+            if ch and ch in AND_OPS:
+                self.pos += 1
+            elif not ch or not (ch.isalpha() or ch in '01(' or ch in NOT_PREFIX):
+                break
+            args.append(self.unary())
+        return args[0] if len(args) == 1 else ('and', tuple(args))
+
+    def unary(self):
+        ch = self.peek()
+        if ch and ch in NOT_PREFIX:
+            self.pos += 1
+            return ('not', self.unary())
+        node = self.primary()
+        while self.peek() and self.peek() in NOT_POSTFIX:
+            self.pos += 1
+            node = ('not', node)
+        return node
+
+    def primary(self):
+        ch = self.peek()
+        if ch == '(':
+            self.pos += 1
+            node = self.or_expr()
+            if self.peek() != ')':
+                self.error("Expected ')'")
+            self.pos += 1
+            return node
+        if ch in ('0', '1'):
+            self.pos += 1
+            return ('const', int(ch))
+        if ch and ch.upper() in VARIABLE_NAMES:
+            self.pos += 1
+            return ('var', VARIABLE_NAMES.index(ch.upper()))
+        self.error(f"Unexpected '{ch}'" if ch else "Unexpected end")
+
+
+@lru_cache(maxsize=4096)
+def parse_expression(text):
+    """AST of an expression: ('var', v), ('const', 0 or 1), ('not', x) or (op, (x, y, ...))."""
+    return _Parser(text).parse()
+
+
+def expression_vars(node):
+    """Number of variables an AST needs, one past the last letter it uses."""
+    if node[0] == 'var':
+        return node[1] + 1
+    if node[0] == 'const':
+        return 0
+    if node[0] == 'not':
+        return expression_vars(node[1])
+    return max(expression_vars(arg) for arg in node[1])
+
+
+def _evaluate(node, inputs, ones, zeros):
+    op = node[0]
+    if op == 'var':
+        return inputs[node[1]]
+    if op == 'const':
+        return ones if node[1] else zeros
+    if op == 'not':
+        return ones ^ _evaluate(node[1], inputs, ones, zeros)
+    values = [_evaluate(arg, inputs, ones, zeros) for arg in node[1]]
+    result = values[0]
+    for value in values[1:]:
+        if op == 'and':
+            result = result & value
+        elif op == 'or':
+            result = result | value
+        else:
+            result = result ^ value
+    return result
+
+
+def _resolve(expression, num_vars):
+    node = parse_expression(expression) if isinstance(expression, str) else expression
+    needed = expression_vars(node)
+    if num_vars is None:
+        num_vars = max(needed, 1)
+    elif needed > num_vars:
+        raise ValueError(f"Expression uses {VARIABLE_NAMES[needed - 1]}, beyond the {num_vars} variables")
+    return node, num_vars
+
+
+def truth_table(expression, num_vars=None):
+    """Packed truth table (bit m = minterm m) of an expression string or AST."""
+    node, num_vars = _resolve(expression, num_vars)
+    return _evaluate(node, variable_masks(num_vars), full_mask(num_vars), 0)
+
+
+def isolated_minterms(on, dc, num_vars):
+    """ON minterms with no ON or don't care neighbour; each one is a term of any cover."""
+    care = on | dc
+    linked = 0
+    for v, var_mask in enumerate(variable_masks(num_vars)):
+        stride = 1 << (num_vars - 1 - v)
+        linked |= (care >> stride) & ~var_mask | (care << stride) & var_mask
+    return on & ~linked
+
+
+def simplify_expression(expression, num_vars=None, dont_cares=0, output_forms=('sop',), time_budget_ms=None,
+                        max_terms=None):
+    """(num_vars, SolveResult) of the minimum SOP of an expression.
+
+    dont_cares is a packed truth table or an expression. Every size goes
+    through the cube engine, never the scanning map solvers, which can keep
+    redundant terms. With a time budget the cover search stops at the deadline and the result
+    says whether it is proven minimal; the budget is shared with the POS. Functions
+    that need more than max_terms product terms raise ValueError without a solve."""
+    started = perf_counter()
+    node, num_vars = _resolve(expression, num_vars)
+    on = truth_table(node, num_vars)
+    dc = truth_table(dont_cares, num_vars) if isinstance(dont_cares, str) else dont_cares
+    on &= ~dc
+    if max_terms is not None:
+        off = full_mask(num_vars) & ~(on | dc)
+        needed = max(bin(isolated_minterms(on, dc, num_vars)).count('1'),
+                     bin(isolated_minterms(off, dc, num_vars)).count('1') if 'pos' in output_forms else 0)
+        if needed > max_terms:
+            raise ValueError(f"The result needs at least {needed} terms, more than the {max_terms} allowed")
+    function = SparseFunction(num_vars, mask_minterms(on), mask_minterms(dc))
+    cubes, proven = function.minimize(time_budget_ms)
+    pos = None
+    if 'pos' in output_forms:
+        off = full_mask(num_vars) & ~(on | dc)
+        remaining = None
+        if time_budget_ms is not None:
+            remaining = max(1, time_budget_ms - (perf_counter() - started) * 1000.0)
+        complement, _ = SparseFunction(num_vars, mask_minterms(off), function.dc).minimize(remaining)
+        pos = pos_from_terms([cube_to_term(c, num_vars) for c in complement])
+    return num_vars, SolveResult(cubes_to_expression(cubes, num_vars),
+                                 tuple(cube_to_term(c, num_vars) for c in cubes), (), pos, proven, num_vars)
+
+
+# Outcome of comparing one submission: minterms where the reference is 1 and
+# the submission 0 (missing) or the other way round (extra), don't cares ignored
+Equivalence = namedtuple('Equivalence', 'equivalent missing extra error')
+
+MAX_COUNTEREXAMPLES = 16
+
+
+def _first_minterms(mask, limit):
+    minterms = []
+    while mask and len(minterms) < limit:
+        low = mask & -mask
+        minterms.append(low.bit_length() - 1)
+        mask ^= low
+    return minterms
+
+
+def check_equivalence(reference, submission, num_vars=None, dont_cares=0,
+                      max_counterexamples=MAX_COUNTEREXAMPLES):
+    """Equivalence of one submission with the reference; see check_equivalence_batch."""
+    return check_equivalence_batch(reference, [submission], num_vars, dont_cares, max_counterexamples)[0]
+
+
+def check_equivalence_batch(reference, submissions, num_vars=None, dont_cares=0,
+                            max_counterexamples=MAX_COUNTEREXAMPLES):
+    """Equivalence of each submission with the reference outside the don't cares.
+
+    reference and dont_cares are expressions or packed truth tables (then
+    num_vars is required); submissions are expressions. Each distinct
+    submission is evaluated once, bit-sliced, and compared with the reference
+    by a single XOR of the packed tables."""
+    wrong = [str(k) for k, text in enumerate(submissions, 1) if not isinstance(text, str)]
+    if wrong:
+        raise ValueError(f"Submissions must be strings, not at position {', '.join(wrong)}")
+    parsed = {}
+    for text in submissions:
+        if text not in parsed:
+            try:
+                parsed[text] = parse_expression(text)
+            except ValueError as e:
+                parsed[text] = e
+    if num_vars is None:
+        nodes = [parse_expression(f) for f in (reference, dont_cares) if isinstance(f, str)]
+        nodes += [node for node in parsed.values() if not isinstance(node, ValueError)]
+        if not isinstance(reference, str):
+            raise ValueError("num_vars is required with a packed reference")
+        num_vars = max([1] + [expression_vars(node) for node in nodes])
+
+    on = truth_table(reference, num_vars) if isinstance(reference, str) else reference
+    dc = truth_table(dont_cares, num_vars) if isinstance(dont_cares, str) else dont_cares
+    on &= ~dc
+
+    tables = {}
+    for text, node in parsed.items():
+        if not isinstance(node, ValueError):
+            try:
+                tables[text] = truth_table(node, num_vars)
+            except ValueError as e:
+                parsed[text] = e
+    care = full_mask(num_vars) & ~dc
+    differs = {text: bool((table ^ on) & care) for text, table in tables.items()}
+
+    results = {}
+    for text, node in parsed.items():
+        if isinstance(node, ValueError):
+            results[text] = Equivalence(False, [], [], str(node))
+        elif not differs[text]:
+            results[text] = Equivalence(True, [], [], None)
+        else:
+            table = tables[text]
+            results[text] = Equivalence(False, _first_minterms(on & ~table, max_counterexamples),
+                                        _first_minterms(table & ~(on | dc), max_counterexamples), None)
+    return [results[text] for text in submissions]
@@ -0,0 +1,114 @@
+"""
+K-Map Solver Input Formats
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Besides the map_data matrix, a function can be given as minterm index
+# lists ("minterms" and "dont_cares") or as packed truth tables
+# ("truth_table" and "dont_care_table"), where bit m of the integer, or of
+# the hex string, is minterm m. Minterm m has variable A as its most
+# significant bit, so F = A'B + AB' is minterms [1, 2] or truth table 0x6.
+
+from minimizer import map_layout, cell_of_minterm
+
+INPUT_KEYS = ('map_data', 'minterms', 'dont_cares', 'truth_table', 'dont_care_table')
+
+
+def parse_table(value, num_vars, key):
+    """Packed truth table from an int or a hex string ("0x" prefix optional)."""
+    if isinstance(value, bool):
+        raise ValueError(f"{key} must be an integer or a hex string")
+    if isinstance(value, str):
+        text = value.strip().lower().replace('_', '')
+        if text.startswith('0x'):
+            text = text[2:]
+        try:
+            value = int(text, 16)
+        except ValueError:
+            raise ValueError(f"{key} is not a hex string: {value!r}")
+    elif not isinstance(value, int):
+        raise ValueError(f"{key} must be an integer or a hex string")
+    if value < 0 or value >> (1 << num_vars):
+        raise ValueError(f"{key} has bits beyond minterm {(1 << num_vars) - 1}")
+    return value
+
+
+def parse_minterms(values, num_vars, key):
+    """Truth table of a list of minterm indexes."""
+    if not isinstance(values, list):
+        raise ValueError(f"{key} must be a list of minterm indexes")
+    size = 1 << num_vars
+    mask = 0
+    for m in values:
+        if isinstance(m, bool) or not isinstance(m, int) or not 0 <= m < size:
+            raise ValueError(f"{key} entry {m!r} is not a minterm index in 0..{size - 1}")
+        mask |= 1 << m
+    return mask
+
+
+def function_masks(arguments, num_vars):
+    """(ON, don't care) truth tables from the minterm or packed arguments."""
+    if 'minterms' in arguments:
+        if 'truth_table' in arguments:
+            raise ValueError("Give either minterms or truth_table, not both")
+        on = parse_minterms(arguments['minterms'], num_vars, 'minterms')
+    elif 'truth_table' in arguments:
+        on = parse_table(arguments['truth_table'], num_vars, 'truth_table')
+    else:
+        raise ValueError("Expected map_data, minterms or truth_table")
+
+    dc = 0
+    if 'dont_cares' in arguments:
+        dc |= parse_minterms(arguments['dont_cares'], num_vars, 'dont_cares')
+    if 'dont_care_table' in arguments:
+        dc |= parse_table(arguments['dont_care_table'], num_vars, 'dont_care_table')
+    if on & dc:
+        raise ValueError("A minterm cannot be both true and don't care")
+    return on, dc
+
+
+def masks_to_map(on, dc, num_vars):
+    """K-Map matrix with each set bit written straight into its cell."""
+    layout = map_layout(num_vars)
+    cells = cell_of_minterm(num_vars)
+    map_data = [[0] * len(layout[0]) for _ in layout]
+    for mask, value in ((on, 1), (dc, 2)):
+        while mask:
+            low = mask & -mask
+            i, j = cells[low.bit_length() - 1]
+            map_data[i][j] = value
+            mask ^= low
+    return map_data
+
+
+def read_map_data(arguments, num_vars):
+    """K-Map matrix from whichever input format the arguments use."""
+    layout = map_layout(num_vars)
+    if 'map_data' in arguments:
+        if any(key in arguments for key in INPUT_KEYS[1:]):
+            raise ValueError("Give either map_data or minterms / truth tables, not both")
+        map_data = arguments['map_data']
+        if (not isinstance(map_data, list) or len(map_data) != len(layout)
+                or any(not isinstance(row, list) or len(row) != len(layout[0]) for row in map_data)):
+            raise ValueError(f"Expected {len(layout)}x{len(layout[0])} matrix.")
+        return map_data
+    return masks_to_map(*function_masks(arguments, num_vars), num_vars)
@@ -0,0 +1,99 @@
+"""
+K-Map Solver GPT Client Common Code
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Shared by openai_kmap_client.py and working_gpt_client.py
+
+import httpx
+from openai import DefaultAsyncHttpxClient
+
+MODEL = "gpt-4o"
+
+# Number of past user turns (with their tool calls and answers) sent back as context
+MAX_HISTORY_TURNS = 8
+
+SYSTEM_PROMPT = """You are a Karnaugh Map (K-Map) solving assistant. You can help users:
+
+1. Explain what K-Map is and how to use it
+2. Solve 2, 3, 4 variable K-Maps
+3. Provide K-Map examples and exercises
+
+When users provide K-Map data, you should call the appropriate tools to solve it.
+When users ask about K-Map knowledge, you should call the get_kmap_info tool to get detailed information.
+
+Please always use the provided tools to help users, don't calculate K-Maps yourself."""
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client shared by every request to the OpenAI API"""
+    return DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=120.0),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
+
+
+def build_messages(system_message, history, turn):
+    """System prompt, the retained history and the current turn"""
+    messages = [system_message]
+    for past_turn in history:
+        messages.extend(past_turn)
+    messages.extend(turn)
+    return messages
+
+
+async def stream_completion(client, messages, on_token=None, tools=None):
+    """Stream one completion, returning its text and any assembled tool calls"""
+    options = {"tools": tools, "tool_choice": "auto"} if tools else {}
+    stream = await client.chat.completions.create(
+        model=MODEL,
+        messages=messages,
+        stream=True,
+        **options
+    )
+
+    content = []
+    tool_calls = {}
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content.append(delta.content)
+            if on_token:
+                on_token(delta.content)
+        # Tool call names and arguments arrive in fragments keyed by index
+        for fragment in delta.tool_calls or []:
+            call = tool_calls.setdefault(fragment.index, {
+                "id": None,
+                "type": "function",
+                "function": {"name": "", "arguments": ""}
+            })
+            if fragment.id:
+                call["id"] = fragment.id
+            if fragment.function:
+                if fragment.function.name:
+                    call["function"]["name"] += fragment.function.name
+                if fragment.function.arguments:
+                    call["function"]["arguments"] += fragment.function.arguments
+
+    return "".join(content), [tool_calls[i] for i in sorted(tool_calls)]
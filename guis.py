@@ -22,24 +22,33 @@ with this program; if not, write to the Free Software Foundation, Inc.,
 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
+import threading
 import wx
-from solvers import KMapSolver2, KMapSolver3, KMapSolver4
+from minimizer import gray_code
+from solvers import KMapSolver2, KMapSolver3, KMapSolver4, KMapSolver5, KMapSolver6
 
 
 class KMapGui(object):
-    map_data = [[]]
+    map_data = ((),)  # immutable template, every window edits its own copy
     all_vars = ''
     KMapSolver = None
     WindowSize = (0, 0)
+    LiveSyncCells = 16  # larger maps are solved on a worker thread in live mode
+    LiveDebounceMs = 150
 
     def __init__(self):
+        self.map_data = [list(row) for row in self.map_data]
         self.frame = wx.Frame(None, -1, "K-Map Solver",
                               style=wx.SYSTEM_MENU|wx.CAPTION|wx.MINIMIZE_BOX|wx.CLOSE_BOX)
         self.panel = wx.Panel(self.frame)
         self.buttons = []
+        self.live_solver = None
+        self.live_timer = None
+        self.live_generation = 0
         self.setup_lines()
         self.setup_labels()
         self.setup_buttons()
+        self.setup_live_mode()
         self.frame.SetSize(self.WindowSize)
         self.frame.Show()
 
@@ -57,13 +66,20 @@ class KMapGui(object):
     def setup_labels(self):
         pass
 
+    def controls_x(self):
+        return (len(self.map_data[0]) + 2) * 50 - 30
+
+    def grid_bottom(self):
+        return (len(self.map_data) + 1) * 50
+
     def setup_buttons(self):
-        vln = len(self.map_data[0]) + 2
-        calc_btn = wx.Button(self.panel, label='Calculate', pos=((vln * 50 - 30), 5), size=(80, 30))
-        reset_btn = wx.Button(self.panel, label='Reset', pos=((vln * 50 - 30), 40), size=(80, 30))
+        calc_btn = wx.Button(self.panel, label='Calculate', pos=(self.controls_x(), 5), size=(80, 30))
+        reset_btn = wx.Button(self.panel, label='Reset', pos=(self.controls_x(), 40), size=(80, 30))
         calc_btn.Bind(wx.EVT_BUTTON, self.show_result)
         reset_btn.Bind(wx.EVT_BUTTON, self.reset)
+        self.setup_cells()
 
+    def setup_cells(self):
         for i, row in enumerate(self.map_data):
             q = []
             for j, ele in enumerate(row):
@@ -76,18 +92,88 @@ class KMapGui(object):
                 q.append(b)
             self.buttons.append(q)
 
+    def setup_live_mode(self):
+        self.live_check = wx.CheckBox(self.panel, label='Live', pos=(self.controls_x(), 80))
+        self.live_check.Bind(wx.EVT_CHECKBOX, self.live_toggled)
+        self.result_label = wx.StaticText(self.panel, label='', pos=(10, self.grid_bottom() + 15))
+
     def ele_button_clicked(self, e):
         ele_id = e.GetId() - 100
-        x = ele_id // 10
-        y = ele_id % 10
+        self.toggle_cell(ele_id // 10, ele_id % 10)
+
+    def toggle_cell(self, x, y):
         self.map_data[x][y] = ([1, 2, 0])[int(self.map_data[x][y])]
+        self.show_cell(x, y)
+        if self.live_check.GetValue():
+            self.live_update(x, y)
+
+    def show_cell(self, x, y):
         self.buttons[x][y].SetLabel(str(self.map_data[x][y]) if self.map_data[x][y] != 2 else 'X')
 
+    def live_toggled(self, _):
+        if self.live_check.GetValue():
+            self.live_refresh()
+        else:
+            self.live_solver = None
+            self.live_generation += 1
+            self.result_label.SetLabel('')
+
+    def live_refresh(self):
+        if self.cell_count() <= self.LiveSyncCells:
+            self.live_solver = self.KMapSolver([row[:] for row in self.map_data])
+            self.live_solver.solve()
+            self.show_live_result(self.live_solver)
+        else:
+            self.schedule_background_solve()
+
+    def live_update(self, x, y):
+        if self.live_solver is not None:
+            # Only the groups that can see cell (x, y) are re-derived
+            self.live_solver.update_cell(x, y, self.map_data[x][y])
+            self.show_live_result(self.live_solver)
+        else:
+            self.schedule_background_solve()
+
+    def schedule_background_solve(self):
+        # Restart the debounce timer so a burst of clicks costs one solve
+        if self.live_timer is not None:
+            self.live_timer.Stop()
+        self.live_timer = wx.CallLater(self.LiveDebounceMs, self.start_background_solve)
+
+    def start_background_solve(self):
+        self.live_timer = None
+        self.live_generation += 1
+        generation = self.live_generation
+        map_data = [row[:] for row in self.map_data]
+        self.result_label.SetLabel("F({}) = ...".format(self.all_vars))
+        threading.Thread(target=self.background_solve, args=(generation, map_data), daemon=True).start()
+
+    def background_solve(self, generation, map_data):
+        k = self.KMapSolver(map_data)
+        k.solve()
+        wx.CallAfter(self.finish_background_solve, generation, k)
+
+    def finish_background_solve(self, generation, solver):
+        # Drop results for maps that were edited again while solving
+        if generation != self.live_generation or not self.live_check.GetValue():
+            return
+        self.show_live_result(solver)
+
+    def show_live_result(self, solver):
+        self.result_label.SetLabel("F({}) = {}".format(self.all_vars, solver.get_result()))
+
+    def cell_count(self):
+        return sum(len(row) for row in self.map_data)
+
     def calc_result(self):
         k = self.KMapSolver(self.map_data)
         k.solve()
+        self.show_groups(k.result_group_set)
         return k.get_result()
 
+    def show_groups(self, groups):
+        pass
+
     def show_result(self, _):
         result = "F({}) = {}".format(self.all_vars, self.calc_result())
         wx.MessageBox(result, 'Result', wx.OK | wx.ICON_INFORMATION)
@@ -101,13 +187,16 @@ class KMapGui(object):
             for b in bl:
                 b.SetLabel('0')
 
+        if self.live_check.GetValue():
+            self.live_refresh()
+
 
 class KMapGui2(KMapGui):
-    map_data = [[ 0, 0],
-                [ 0, 0]]
+    map_data = (( 0, 0),
+                ( 0, 0))
     all_vars = 'A, B'
     KMapSolver = KMapSolver2
-    WindowSize = (280, 200)
+    WindowSize = (280, 230)
 
     def setup_labels(self):
         wx.StaticText(self.panel, label='A\\B', pos=(10, 10), size=(40, 40), style=wx.ALIGN_CENTER_VERTICAL)
@@ -118,11 +207,11 @@ class KMapGui2(KMapGui):
 
 
 class KMapGui3(KMapGui):
-    map_data = [[ 0, 0, 0, 0],
-                [ 0, 0, 0, 0]]
+    map_data = (( 0, 0, 0, 0),
+                ( 0, 0, 0, 0))
     all_vars = 'A, B, C'
     KMapSolver = KMapSolver3
-    WindowSize = (380, 200)
+    WindowSize = (380, 230)
 
     def setup_labels(self):
         wx.StaticText(self.panel, label='A\\BC', pos=(10, 10), size=(40, 40), style=wx.ALIGN_CENTER_VERTICAL)
@@ -135,13 +224,13 @@ class KMapGui3(KMapGui):
 
 
 class KMapGui4(KMapGui):
-    map_data = [[ 0, 0, 0, 0],
-                [ 0, 0, 0, 0],
-                [ 0, 0, 0, 0],
-                [ 0, 0, 0, 0]]
+    map_data = (( 0, 0, 0, 0),
+                ( 0, 0, 0, 0),
+                ( 0, 0, 0, 0),
+                ( 0, 0, 0, 0))
     all_vars = 'A, B, C, D'
     KMapSolver = KMapSolver4
-    WindowSize = (380, 300)
+    WindowSize = (380, 330)
 
     def setup_labels(self):
         wx.StaticText(self.panel, label='AB\\CD', pos=(10, 10), size=(40, 40), style=wx.ALIGN_CENTER_VERTICAL)
@@ -153,3 +242,160 @@ class KMapGui4(KMapGui):
         wx.StaticText(self.panel, label='01', pos=(110, 10), size=(40, 40), style=wx.ALIGN_CENTER_VERTICAL)
         wx.StaticText(self.panel, label='11', pos=(160, 10), size=(40, 40), style=wx.ALIGN_CENTER_VERTICAL)
         wx.StaticText(self.panel, label='10', pos=(210, 10), size=(40, 40), style=wx.ALIGN_CENTER_VERTICAL)
+
+class KMapCanvas(wx.Panel):
+    """Double-buffered K-Map grid with click hit-testing and group loops."""
+    CellSize = 40
+    Header = 50
+    GroupColours = ['#e6194b', '#3cb44b', '#4363d8', '#f58231', '#911eb4',
+                    '#42d4f4', '#f032e6', '#9a6324', '#808000', '#000075']
+
+    def __init__(self, gui, pos):
+        rows, cols = len(gui.map_data), len(gui.map_data[0])
+        size = (self.Header + cols * self.CellSize + 1, self.Header + rows * self.CellSize + 1)
+        super().__init__(gui.panel, pos=pos, size=size)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.gui = gui
+        self.groups = []
+        self.row_labels = [format(g, '0{}b'.format(gui.row_bits)) for g in gray_code(gui.row_bits)]
+        self.col_labels = [format(g, '0{}b'.format(gui.col_bits)) for g in gray_code(gui.col_bits)]
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_LEFT_DOWN, self.on_click)
+
+    def cell_rect(self, i, j):
+        return wx.Rect(self.Header + j * self.CellSize, self.Header + i * self.CellSize,
+                       self.CellSize, self.CellSize)
+
+    def cell_at(self, x, y):
+        i = (y - self.Header) // self.CellSize
+        j = (x - self.Header) // self.CellSize
+        if x < self.Header or y < self.Header or i >= len(self.gui.map_data) or j >= len(self.gui.map_data[0]):
+            return None
+        return i, j
+
+    def on_click(self, e):
+        cell = self.cell_at(e.GetX(), e.GetY())
+        if cell is not None:
+            self.gui.toggle_cell(*cell)
+
+    def refresh_cell(self, i, j):
+        if self.groups:
+            # Loops drawn for the old map no longer apply
+            self.groups = []
+            self.Refresh()
+        else:
+            self.RefreshRect(self.cell_rect(i, j))
+
+    def set_groups(self, groups):
+        self.groups = groups
+        self.Refresh()
+
+    def on_paint(self, _):
+        dc = wx.AutoBufferedPaintDC(self)
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
+        self.draw_grid(dc)
+        gc = wx.GraphicsContext.Create(dc)
+        if gc:
+            self.draw_groups(gc)
+
+    def draw_grid(self, dc):
+        rows, cols = len(self.gui.map_data), len(self.gui.map_data[0])
+        size = self.CellSize
+        dc.SetPen(wx.Pen(wx.Colour(160, 160, 160)))
+        for i in range(rows + 1):
+            y = self.Header + i * size
+            dc.DrawLine(self.Header, y, self.Header + cols * size, y)
+        for j in range(cols + 1):
+            x = self.Header + j * size
+            dc.DrawLine(x, self.Header, x, self.Header + rows * size)
+
+        dc.SetTextForeground(wx.Colour(0, 0, 0))
+        dc.DrawLabel(self.gui.axis_label, wx.Rect(0, 0, self.Header, self.Header), wx.ALIGN_CENTER)
+        for i, label in enumerate(self.row_labels):
+            dc.DrawLabel(label, wx.Rect(0, self.Header + i * size, self.Header, size), wx.ALIGN_CENTER)
+        for j, label in enumerate(self.col_labels):
+            dc.DrawLabel(label, wx.Rect(self.Header + j * size, 0, size, self.Header), wx.ALIGN_CENTER)
+
+        for i, row in enumerate(self.gui.map_data):
+            for j, value in enumerate(row):
+                dc.SetTextForeground(wx.Colour(170, 170, 170) if value == 0 else wx.Colour(0, 0, 0))
+                dc.DrawLabel('X' if value == 2 else str(value), self.cell_rect(i, j), wx.ALIGN_CENTER)
+
+    def draw_groups(self, gc):
+        for n, group in enumerate(self.groups):
+            gc.SetPen(wx.Pen(wx.Colour(self.GroupColours[n % len(self.GroupColours)]), 2))
+            gc.SetBrush(wx.TRANSPARENT_BRUSH)
+            inset = 3 + (n % 4) * 2
+            # A group is a block of rows times a block of columns, either of which
+            # may wrap around the edge of the map and so splits into runs
+            for i0, i1 in self.runs(sorted({i for i, j in group})):
+                for j0, j1 in self.runs(sorted({j for i, j in group})):
+                    x = self.Header + j0 * self.CellSize + inset
+                    y = self.Header + i0 * self.CellSize + inset
+                    w = (j1 - j0 + 1) * self.CellSize - 2 * inset
+                    h = (i1 - i0 + 1) * self.CellSize - 2 * inset
+                    gc.DrawRoundedRectangle(x, y, w, h, 8)
+
+    @staticmethod
+    def runs(indexes):
+        runs = []
+        for k in indexes:
+            if runs and runs[-1][1] == k - 1:
+                runs[-1][1] = k
+            else:
+                runs.append([k, k])
+        return runs
+
+
+class KMapCanvasGui(KMapGui):
+    """Maps too large for one wx.Button per cell, drawn on a single KMapCanvas."""
+    axis_label = ''
+    row_bits = 0
+    col_bits = 0
+
+    def controls_x(self):
+        return self.canvas.GetSize()[0] + 20
+
+    def grid_bottom(self):
+        return self.canvas.GetSize()[1] + 5
+
+    def setup_lines(self):
+        self.canvas = KMapCanvas(self, pos=(5, 5))
+
+    def setup_cells(self):
+        pass
+
+    def show_cell(self, x, y):
+        self.canvas.refresh_cell(x, y)
+
+    def show_groups(self, groups):
+        self.canvas.set_groups(groups)
+
+    def show_live_result(self, solver):
+        super().show_live_result(solver)
+        self.canvas.set_groups(solver.result_group_set)
+
+    def reset(self, _):
+        super().reset(_)
+        self.canvas.set_groups([])
+
+
+class KMapGui5(KMapCanvasGui):
+    map_data = ((0,) * 8,) * 4
+    all_vars = 'A, B, C, D, E'
+    axis_label = 'AB\\CDE'
+    row_bits = 2
+    col_bits = 3
+    KMapSolver = KMapSolver5
+    WindowSize = (500, 310)
+
+
+class KMapGui6(KMapCanvasGui):
+    map_data = ((0,) * 8,) * 8
+    all_vars = 'A, B, C, D, E, F'
+    axis_label = 'ABC\\DEF'
+    row_bits = 3
+    col_bits = 3
+    KMapSolver = KMapSolver6
+    WindowSize = (500, 470)
@@ -45,3 +45,24 @@ def is_subset(lsa, lsb):  # Is lsb subset of lsa? Alternate: not set.isdisjoint(
         if b in lsa: continue
         else: return False
     return True
+
+
+COMPLEMENT = {0: 1, 1: 0, 2: 2}
+
+
+def complement_map(lst):  # OFF-set becomes the ON-set, don't cares stay
+    return [[COMPLEMENT[v] for v in row] for row in lst]
+
+
+def sum_term(term):  # (AB')' = A' + B
+    literals = []
+    for ch in term:
+        if ch == '\'': literals[-1] = literals[-1][0]
+        else: literals.append(ch + '\'')
+    return literals[0] if len(literals) == 1 else '(' + ' + '.join(literals) + ')'
+
+
+def pos_from_terms(terms):  # F = (F')' with F' given as product terms
+    if not terms: return '1'
+    if '1' in terms: return '0'
+    return ''.join(sum_term(t) for t in terms)
@@ -25,18 +25,19 @@ with this program; if not, write to the Free Software Foundation, Inc.,
 
 import sys
 import wx
-from guis import KMapGui2, KMapGui3, KMapGui4
+from guis import KMapGui2, KMapGui3, KMapGui4, KMapGui5, KMapGui6
 
 
 if __name__ == '__main__':
-    gui_classes = [KMapGui2, KMapGui3, KMapGui4]
+    gui_classes = [KMapGui2, KMapGui3, KMapGui4, KMapGui5, KMapGui6]
 
     app = wx.App()
 
     choice_dialog = wx.SingleChoiceDialog(None,
                                           'How many variables?',
                                           'Variables',
-                                          ['2 variables', '3 variables', '4 variables'])
+                                          ['2 variables', '3 variables', '4 variables',
+                                           '5 variables', '6 variables'])
     if choice_dialog.ShowModal() == wx.ID_CANCEL:
         sys.exit()
 
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
 import asyncio
+import itertools
 import json
 import logging
+import os
+import time
 from typing import Any, Dict, List, Optional
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
@@ -18,81 +21,206 @@ from mcp.types import (
     EmbeddedResource,
     LoggingLevel,
 )
-from solvers import KMapSolver2, KMapSolver3, KMapSolver4
+from solvers import (KMapSolver2, KMapSolver3, KMapSolver4, SolveProfile, profile_solves,
+                     cube_solver_class, iter_minimal_solutions)
+from verifier import verify_map
+from formats import read_map_data, masks_to_map, function_masks
+from server_logging import configure_logging, request_logger
+from request_profiling import RequestProfiler, profiler_from_env
+from expressions import (simplify_expression, parse_expression, expression_vars, truth_table,
+                         check_equivalence_batch)
+from verifier import map_masks
+from minimizer import VARIABLE_NAMES
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging: JSON lines written to stderr by a background thread. KMAP_LOG_QUEUE bounds
+# the records waiting for it (more are dropped), KMAP_LOG_SAMPLE is the fraction of
+# per-request records kept (warnings and errors are always kept)
+LOG_HANDLER = configure_logging(getattr(logging, os.environ.get("KMAP_LOG_LEVEL", "INFO").upper(), logging.INFO),
+                                int(os.environ.get("KMAP_LOG_QUEUE", "10000")))
 logger = logging.getLogger(__name__)
+request_log = request_logger("kmap.requests", float(os.environ.get("KMAP_LOG_SAMPLE", "0.1")))
+
+# KMAP_PHASE_PROFILE=N aggregates per-phase solver timings and logs them every N solves
+PHASE_PROFILE_EVERY = int(os.environ.get("KMAP_PHASE_PROFILE", "0"))
+PHASE_PROFILE = SolveProfile() if PHASE_PROFILE_EVERY > 0 else None
+
+# KMAP_PROFILE_DIR turns on per-request cProfile/tracemalloc captures into that directory:
+# every KMAP_PROFILE_EVERY-th call and/or calls slower than KMAP_PROFILE_THRESHOLD_MS, of the
+# tools in KMAP_PROFILE_TOOLS (comma separated, default all). None means off. Tools with
+# side effects are never profiled, since a slow call is profiled by running it again.
+PROFILE_EXCLUDED_TOOLS = ("configure_profiling",)
+PROFILER = profiler_from_env(exclude=PROFILE_EXCLUDED_TOOLS)
+
+# KMAP_ADMIN_TOOLS=1 lists the configure_profiling tool, which changes the above at runtime
+ADMIN_TOOLS = os.environ.get("KMAP_ADMIN_TOOLS", "0") == "1"
+
+# Every result is checked against its map unless KMAP_VERIFY=0
+VERIFY_RESULTS = os.environ.get("KMAP_VERIFY", "1") != "0"
 
 # Create MCP server
 server = Server("kmap-solver")
 
+OUTPUT_FORMS = ("sop", "pos")
+
+# Expressions are minimized for up to this many variables, A..T
+EXPRESSION_MAX_VARS = 20
+
+# Cover search time of simplify_expression when the call gives no time_budget_ms
+EXPRESSION_BUDGET_MS = 2000
+
+# Expressions whose SOP or POS needs more terms are refused: listing them would outlast any budget
+EXPRESSION_MAX_TERMS = 4096
+
+def solve_input_schema(rows: int, cols: int) -> Dict[str, Any]:
+    """Input schema of a solve tool: a matrix, minterm lists or packed truth tables."""
+    return {
+        "type": "object",
+        "properties": {
+            "map_data": {
+                "type": "array",
+                "items": {
+                    "type": "array",
+                    "items": {"type": "integer", "enum": [0, 1, 2]},
+                    "minItems": cols,
+                    "maxItems": cols
+                },
+                "minItems": rows,
+                "maxItems": rows,
+                "description": f"{rows}x{cols} matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
+            },
+            "minterms": {
+                "type": "array",
+                "items": {"type": "integer", "minimum": 0},
+                "description": "Indexes of the true minterms (A is the most significant bit), instead of map_data"
+            },
+            "dont_cares": {
+                "type": "array",
+                "items": {"type": "integer", "minimum": 0},
+                "description": "Indexes of the don't care minterms"
+            },
+            "truth_table": {
+                "type": ["integer", "string"],
+                "description": "Packed truth table, bit m set when minterm m is true. Integer or hex string such as \"0x6\""
+            },
+            "dont_care_table": {
+                "type": ["integer", "string"],
+                "description": "Packed don't care minterms, same encoding as truth_table"
+            },
+            "time_budget_ms": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Anytime mode: return the best cover found within this many milliseconds and say whether it is proven minimal"
+            },
+            "max_solutions": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Also list up to this many equally minimal SOP solutions, e.g. to accept any correct answer"
+            },
+            "output_forms": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(OUTPUT_FORMS)},
+                "description": "Forms to return: sop (sum of products, default) and/or pos (product of sums)"
+            }
+        }
+    }
+
 # Tool definitions
 TOOLS = [
     Tool(
         name="solve_kmap_2",
-        description="Solve a 2-variable Karnaugh Map. Input should be a 2x2 matrix with values 0, 1, or 2 (don't care).",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "map_data": {
-                    "type": "array",
-                    "items": {
-                        "type": "array",
-                        "items": {"type": "integer", "enum": [0, 1, 2]},
-                        "minItems": 2,
-                        "maxItems": 2
-                    },
-                    "minItems": 2,
-                    "maxItems": 2,
-                    "description": "2x2 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
-                }
-            },
-            "required": ["map_data"]
-        }
+        description="Solve a 2-variable Karnaugh Map. Input should be a 2x2 matrix with values 0, 1, or 2 (don't care), or minterm index lists, or a packed truth table.",
+        inputSchema=solve_input_schema(2, 2)
     ),
     Tool(
         name="solve_kmap_3",
-        description="Solve a 3-variable Karnaugh Map. Input should be a 2x4 matrix with values 0, 1, or 2 (don't care).",
+        description="Solve a 3-variable Karnaugh Map. Input should be a 2x4 matrix with values 0, 1, or 2 (don't care), or minterm index lists, or a packed truth table.",
+        inputSchema=solve_input_schema(2, 4)
+    ),
+    Tool(
+        name="solve_kmap_4",
+        description="Solve a 4-variable Karnaugh Map. Input should be a 4x4 matrix with values 0, 1, or 2 (don't care), or minterm index lists, or a packed truth table.",
+        inputSchema=solve_input_schema(4, 4)
+    ),
+    Tool(
+        name="simplify_expression",
+        description="Simplify a Boolean expression such as \"A'B + AC + BCD'\" to a minimum sum of products. Accepts ' ~ ! for NOT, juxtaposition * & for AND, ^ for XOR and + | for OR.",
         inputSchema={
             "type": "object",
             "properties": {
-                "map_data": {
+                "expression": {
+                    "type": "string",
+                    "description": "Boolean expression over the variables A, B, C, ... (A is the most significant bit)"
+                },
+                "num_vars": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": EXPRESSION_MAX_VARS,
+                    "description": "Number of variables, by default up to the last letter used"
+                },
+                "dont_cares": {
+                    "type": "string",
+                    "description": "Expression that is true on the don't care input combinations"
+                },
+                "time_budget_ms": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": f"Cover search time before the best cover found is returned (default {EXPRESSION_BUDGET_MS})"
+                },
+                "output_forms": {
                     "type": "array",
-                    "items": {
-                        "type": "array",
-                        "items": {"type": "integer", "enum": [0, 1, 2]},
-                        "minItems": 4,
-                        "maxItems": 4
-                    },
-                    "minItems": 2,
-                    "maxItems": 2,
-                    "description": "2x4 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
+                    "items": {"type": "string", "enum": list(OUTPUT_FORMS)},
+                    "description": "Forms to return: sop (sum of products, default) and/or pos (product of sums)"
                 }
             },
-            "required": ["map_data"]
+            "required": ["expression"]
         }
     ),
     Tool(
-        name="solve_kmap_4",
-        description="Solve a 4-variable Karnaugh Map. Input should be a 4x4 matrix with values 0, 1, or 2 (don't care).",
+        name="check_equivalence",
+        description="Check whether submitted Boolean expressions equal a reference expression or K-Map, e.g. to grade answers regardless of term order. Returns counterexample minterms for every wrong submission.",
         inputSchema={
             "type": "object",
             "properties": {
+                "reference": {
+                    "type": "string",
+                    "description": "Reference expression; alternatively give map_data, minterms or truth_table with num_vars"
+                },
+                "submissions": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Expressions to check against the reference"
+                },
+                "num_vars": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": EXPRESSION_MAX_VARS,
+                    "description": "Number of variables; required when the reference is not an expression"
+                },
                 "map_data": {
                     "type": "array",
-                    "items": {
-                        "type": "array",
-                        "items": {"type": "integer", "enum": [0, 1, 2]},
-                        "minItems": 4,
-                        "maxItems": 4
-                    },
-                    "minItems": 4,
-                    "maxItems": 4,
-                    "description": "4x4 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
+                    "items": {"type": "array", "items": {"type": "integer", "enum": [0, 1, 2]}},
+                    "description": "Reference K-Map (2 to 4 variables), 2 marking don't cares"
+                },
+                "minterms": {
+                    "type": "array",
+                    "items": {"type": "integer", "minimum": 0},
+                    "description": "Reference true minterms"
+                },
+                "truth_table": {
+                    "type": ["integer", "string"],
+                    "description": "Reference packed truth table, bit m set when minterm m is true"
+                },
+                "dont_cares": {
+                    "type": "string",
+                    "description": "Expression that is true on input combinations where any answer is accepted; added to the 2 cells of a map_data reference"
+                },
+                "max_counterexamples": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Counterexample minterms listed per submission (default 16)"
                 }
             },
-            "required": ["map_data"]
+            "required": ["submissions"]
         }
     ),
     Tool(
@@ -106,6 +234,26 @@ TOOLS = [
     )
 ]
 
+if ADMIN_TOOLS:
+    TOOLS.append(Tool(
+        name="configure_profiling",
+        description="Admin: start or stop capturing cProfile and tracemalloc profiles of tool calls into a directory.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean", "description": "false stops profiling"},
+                "directory": {"type": "string", "description": "Directory for the .pstats, .snapshot and .json files"},
+                "every": {"type": "integer", "minimum": 0, "description": "Profile every Nth call (0 for none; default 1 without threshold_ms)"},
+                "threshold_ms": {"type": "number", "minimum": 0,
+                                 "description": "Profile again the calls that took longer than this"},
+                "tools": {"type": "array", "items": {"type": "string"},
+                          "description": "Tools to profile (default all)"}
+            },
+            "required": ["enabled"],
+            "additionalProperties": False
+        }
+    ))
+
 @server.list_tools()
 async def handle_list_tools() -> ListToolsResult:
     """List available tools."""
@@ -114,6 +262,19 @@ async def handle_list_tools() -> ListToolsResult:
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     """Handle tool calls."""
+    started = time.perf_counter()
+    if PROFILER is None:
+        result = await dispatch_tool(name, arguments)
+    else:
+        result = await PROFILER.run(name, arguments, dispatch_tool)
+    request_log.info("tool call", extra={
+        "tool": name,
+        "duration_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        "error": result.content[0].text.startswith("Error") if result.content else False,
+    })
+    return result
+
+async def dispatch_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     try:
         if name == "solve_kmap_2":
             return await solve_kmap_2(arguments)
@@ -121,37 +282,124 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResu
             return await solve_kmap_3(arguments)
         elif name == "solve_kmap_4":
             return await solve_kmap_4(arguments)
+        elif name == "simplify_expression":
+            return await simplify_expression_tool(arguments)
+        elif name == "check_equivalence":
+            return await check_equivalence_tool(arguments)
         elif name == "get_kmap_info":
             return await get_kmap_info()
+        elif name == "configure_profiling" and ADMIN_TOOLS:
+            return await configure_profiling(arguments)
         else:
             return CallToolResult(
                 content=[TextContent(type="text", text=f"Unknown tool: {name}")]
             )
     except Exception as e:
-        logger.error(f"Error in tool {name}: {str(e)}")
+        logger.error(f"Error in tool {name}: {str(e)}", extra={"tool": name})
         return CallToolResult(
             content=[TextContent(type="text", text=f"Error: {str(e)}")]
         )
 
+def read_output_forms(arguments: Dict[str, Any]) -> tuple:
+    forms = arguments.get("output_forms") or ["sop"]
+    if not isinstance(forms, list) or any(form not in OUTPUT_FORMS for form in forms):
+        raise ValueError(f"output_forms must be a list of {', '.join(OUTPUT_FORMS)}")
+    return tuple(forms)
+
+def read_time_budget(arguments: Dict[str, Any]) -> Optional[int]:
+    budget = arguments.get("time_budget_ms")
+    if budget is None:
+        return None
+    if isinstance(budget, bool) or not isinstance(budget, int) or budget < 1:
+        raise ValueError("time_budget_ms must be a positive integer")
+    return budget
+
+def read_max_solutions(arguments: Dict[str, Any]) -> Optional[int]:
+    count = arguments.get("max_solutions")
+    if count is None:
+        return None
+    if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+        raise ValueError("max_solutions must be a positive integer")
+    return count
+
+def minimal_solutions(map_data, num_vars: int, max_solutions: Optional[int]) -> Optional[list]:
+    """Up to max_solutions + 1 minimal SOPs; the extra one only tells whether the list is complete."""
+    if max_solutions is None:
+        return None
+    return list(itertools.islice(iter_minimal_solutions(map_data, num_vars), max_solutions + 1))
+
+def format_solutions(solutions: Optional[list], variables: str, max_solutions: Optional[int]) -> str:
+    if solutions is None:
+        return ""
+    complete = len(solutions) <= max_solutions
+    header = "All Minimal Solutions" if complete else f"Minimal Solutions (first {max_solutions})"
+    lines = [f"  {k}. F({variables}) = {expression}" for k, expression in enumerate(solutions[:max_solutions], 1)]
+    return f"\n\n{header}:\n" + "\n".join(lines)
+
+def build_solver(solver_class, map_data, output_forms, time_budget_ms):
+    """The scanning solver, or the anytime cube engine when a time budget is given."""
+    if time_budget_ms is None:
+        return solver_class(map_data, output_forms)
+    return cube_solver_class(solver_class.NUMBER_OF_VARS)(map_data, output_forms, time_budget_ms)
+
+def format_result(solver, variables: str, solutions: Optional[list] = None) -> str:
+    """One line per requested output form, plus the search outcome in anytime mode.
+
+    When minimal solutions were enumerated the SOP is the first of them, so the
+    headline always matches the list below it."""
+    lines = []
+    if "sop" in solver.output_forms:
+        expression = solutions[0] if solutions else solver.get_result()
+        lines.append(f"Simplified Boolean Expression: F({variables}) = {expression}")
+    if "pos" in solver.output_forms:
+        lines.append(f"Product of Sums: F({variables}) = {solver.get_pos_result()}")
+    if solutions is None and getattr(solver, "time_budget_ms", None) is not None:
+        outcome = "proven minimal" if solver.proven_minimal else "best found, not proven minimal"
+        lines.append(f"Search: {outcome}; used {solver.budget_used_ms:.1f} ms of the {solver.time_budget_ms} ms budget")
+    return "\n".join(lines)
+
+def run_solver(solver) -> None:
+    """Solve, recording phase timings when KMAP_PHASE_PROFILE is set."""
+    if PHASE_PROFILE is None:
+        solver.solve()
+    else:
+        with profile_solves(PHASE_PROFILE):
+            solver.solve()
+        if PHASE_PROFILE.solves % PHASE_PROFILE_EVERY == 0:
+            logger.info(f"Solver phase profile:\n{PHASE_PROFILE.summary()}")
+
+    if VERIFY_RESULTS:
+        if not verify_map(solver.map_data, solver.get_result(), solver.NUMBER_OF_VARS):
+            logger.error(f"Solver result {solver.get_result()!r} does not match map {solver.map_data}")
+        # The POS is right exactly when the SOP of the complemented map is
+        complement = solver.complement
+        if complement is not None and not verify_map(complement.map_data, complement.get_result(), solver.NUMBER_OF_VARS):
+            logger.error(f"Solver POS {solver.get_pos_result()!r} does not match map {solver.map_data}")
+
 async def solve_kmap_2(arguments: Dict[str, Any]) -> CallToolResult:
     """Solve 2-variable K-Map."""
-    map_data = arguments.get("map_data")
-    if not map_data or len(map_data) != 2 or any(len(row) != 2 for row in map_data):
+    try:
+        map_data = read_map_data(arguments, 2)
+        output_forms = read_output_forms(arguments)
+        time_budget_ms = read_time_budget(arguments)
+        max_solutions = read_max_solutions(arguments)
+    except ValueError as e:
         return CallToolResult(
-            content=[TextContent(type="text", text="Error: Invalid input. Expected 2x2 matrix.")]
+            content=[TextContent(type="text", text=f"Error: Invalid input. {e}")]
         )
     
     try:
-        solver = KMapSolver2(map_data)
-        solver.solve()
-        result = solver.get_result()
+        solver = build_solver(KMapSolver2, map_data, output_forms, time_budget_ms)
+        run_solver(solver)
+        
+        solutions = minimal_solutions(map_data, 2, max_solutions)
         
         # Create visual representation
         visual_map = create_visual_map(map_data, 2)
         
         return CallToolResult(
             content=[
-                TextContent(type="text", text=f"K-Map Input:\n{visual_map}\n\nSimplified Boolean Expression: F(A,B) = {result}")
+                TextContent(type="text", text=f"K-Map Input:\n{visual_map}\n\n{format_result(solver, 'A,B', solutions)}{format_solutions(solutions, 'A,B', max_solutions)}")
             ]
         )
     except Exception as e:
@@ -161,23 +409,28 @@ async def solve_kmap_2(arguments: Dict[str, Any]) -> CallToolResult:
 
 async def solve_kmap_3(arguments: Dict[str, Any]) -> CallToolResult:
     """Solve 3-variable K-Map."""
-    map_data = arguments.get("map_data")
-    if not map_data or len(map_data) != 2 or any(len(row) != 4 for row in map_data):
+    try:
+        map_data = read_map_data(arguments, 3)
+        output_forms = read_output_forms(arguments)
+        time_budget_ms = read_time_budget(arguments)
+        max_solutions = read_max_solutions(arguments)
+    except ValueError as e:
         return CallToolResult(
-            content=[TextContent(type="text", text="Error: Invalid input. Expected 2x4 matrix.")]
+            content=[TextContent(type="text", text=f"Error: Invalid input. {e}")]
         )
     
     try:
-        solver = KMapSolver3(map_data)
-        solver.solve()
-        result = solver.get_result()
+        solver = build_solver(KMapSolver3, map_data, output_forms, time_budget_ms)
+        run_solver(solver)
+        
+        solutions = minimal_solutions(map_data, 3, max_solutions)
         
         # Create visual representation
         visual_map = create_visual_map(map_data, 3)
         
         return CallToolResult(
             content=[
-                TextContent(type="text", text=f"K-Map Input:\n{visual_map}\n\nSimplified Boolean Expression: F(A,B,C) = {result}")
+                TextContent(type="text", text=f"K-Map Input:\n{visual_map}\n\n{format_result(solver, 'A,B,C', solutions)}{format_solutions(solutions, 'A,B,C', max_solutions)}")
             ]
         )
     except Exception as e:
@@ -187,23 +440,28 @@ async def solve_kmap_3(arguments: Dict[str, Any]) -> CallToolResult:
 
 async def solve_kmap_4(arguments: Dict[str, Any]) -> CallToolResult:
     """Solve 4-variable K-Map."""
-    map_data = arguments.get("map_data")
-    if not map_data or len(map_data) != 4 or any(len(row) != 4 for row in map_data):
+    try:
+        map_data = read_map_data(arguments, 4)
+        output_forms = read_output_forms(arguments)
+        time_budget_ms = read_time_budget(arguments)
+        max_solutions = read_max_solutions(arguments)
+    except ValueError as e:
         return CallToolResult(
-            content=[TextContent(type="text", text="Error: Invalid input. Expected 4x4 matrix.")]
+            content=[TextContent(type="text", text=f"Error: Invalid input. {e}")]
         )
     
     try:
-        solver = KMapSolver4(map_data)
-        solver.solve()
-        result = solver.get_result()
+        solver = build_solver(KMapSolver4, map_data, output_forms, time_budget_ms)
+        run_solver(solver)
+        
+        solutions = minimal_solutions(map_data, 4, max_solutions)
         
         # Create visual representation
         visual_map = create_visual_map(map_data, 4)
         
         return CallToolResult(
             content=[
-                TextContent(type="text", text=f"K-Map Input:\n{visual_map}\n\nSimplified Boolean Expression: F(A,B,C,D) = {result}")
+                TextContent(type="text", text=f"K-Map Input:\n{visual_map}\n\n{format_result(solver, 'A,B,C,D', solutions)}{format_solutions(solutions, 'A,B,C,D', max_solutions)}")
             ]
         )
     except Exception as e:
@@ -211,6 +469,160 @@ async def solve_kmap_4(arguments: Dict[str, Any]) -> CallToolResult:
             content=[TextContent(type="text", text=f"Error solving K-Map: {str(e)}")]
         )
 
+async def simplify_expression_tool(arguments: Dict[str, Any]) -> CallToolResult:
+    """Simplify a Boolean expression through its truth table."""
+    try:
+        expression = arguments.get("expression")
+        if not isinstance(expression, str):
+            raise ValueError("expression must be a string")
+        num_vars = read_num_vars(arguments)
+        dont_cares = arguments.get("dont_cares") or 0
+        if dont_cares and not isinstance(dont_cares, str):
+            raise ValueError("dont_cares must be an expression string")
+        output_forms = read_output_forms(arguments)
+        if expression_vars(parse_expression(expression)) > EXPRESSION_MAX_VARS:
+            raise ValueError(f"Expressions may use at most {EXPRESSION_MAX_VARS} variables")
+        time_budget_ms = read_time_budget(arguments) or EXPRESSION_BUDGET_MS
+        # Off the event loop, so other requests are served while it runs
+        num_vars, result = await asyncio.to_thread(
+            simplify_expression, expression, num_vars, dont_cares, output_forms, time_budget_ms,
+            EXPRESSION_MAX_TERMS)
+    except ValueError as e:
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"Error: Invalid input. {e}")]
+        )
+
+    variables = ",".join(VARIABLE_NAMES[:num_vars])
+    lines = [f"Input: F({variables}) = {expression}"]
+    if num_vars <= 4:
+        dc = truth_table(dont_cares, num_vars) if dont_cares else 0
+        on = truth_table(expression, num_vars) & ~dc
+        lines.append(f"K-Map:\n{create_visual_map(masks_to_map(on, dc, num_vars), num_vars)}")
+    if "sop" in output_forms:
+        lines.append(f"Simplified Boolean Expression: F({variables}) = {result.expression}")
+    if "pos" in output_forms:
+        lines.append(f"Product of Sums: F({variables}) = {result.pos}")
+    if not result.proven_minimal:
+        lines.append(f"Search: best found within {time_budget_ms} ms, not proven minimal")
+    return CallToolResult(
+        content=[TextContent(type="text", text="\n".join(lines))]
+    )
+
+def read_num_vars(arguments: Dict[str, Any]) -> Optional[int]:
+    num_vars = arguments.get("num_vars")
+    if num_vars is not None and (isinstance(num_vars, bool) or not isinstance(num_vars, int)
+                                 or not 1 <= num_vars <= EXPRESSION_MAX_VARS):
+        raise ValueError(f"num_vars must be an integer from 1 to {EXPRESSION_MAX_VARS}")
+    return num_vars
+
+def read_expression(value, key: str):
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be an expression string")
+    if expression_vars(parse_expression(value)) > EXPRESSION_MAX_VARS:
+        raise ValueError(f"Expressions may use at most {EXPRESSION_MAX_VARS} variables")
+    return value
+
+def read_reference(arguments: Dict[str, Any], num_vars: Optional[int]):
+    """(reference, don't care) as an expression and 0, or as packed truth tables."""
+    if "reference" in arguments:
+        return read_expression(arguments["reference"], "reference"), 0
+    if num_vars is None:
+        raise ValueError("num_vars is required with map_data, minterms or truth_table")
+    # dont_cares is an expression here, merged by the caller, not a minterm list for formats.py
+    inputs = {k: v for k, v in arguments.items() if k != "dont_cares"}
+    if "map_data" in arguments:
+        if not 2 <= num_vars <= 4:
+            raise ValueError("map_data references need 2 to 4 variables")
+        return map_masks(read_map_data(inputs, num_vars), num_vars)
+    return function_masks(inputs, num_vars)
+
+async def check_equivalence_tool(arguments: Dict[str, Any]) -> CallToolResult:
+    """Compare submissions with a reference on their truth tables."""
+    try:
+        num_vars = read_num_vars(arguments)
+        submissions = arguments.get("submissions")
+        if not isinstance(submissions, list) or not submissions:
+            raise ValueError("submissions must be a non-empty list of expressions")
+        wrong = [str(k) for k, submission in enumerate(submissions, 1) if not isinstance(submission, str)]
+        if wrong:
+            raise ValueError(f"submissions must be strings, not at position {', '.join(wrong)}")
+        reference, dc = read_reference(arguments, num_vars)
+        dont_cares = read_expression(arguments["dont_cares"], "dont_cares") if arguments.get("dont_cares") else None
+        if num_vars is None:
+            # Submissions past the cap are reported one by one instead of failing the batch
+            used = [expression_vars(parse_expression(f)) for f in (reference, dont_cares) if f]
+            for submission in submissions:
+                try:
+                    used.append(expression_vars(parse_expression(submission)))
+                except ValueError:
+                    pass
+            num_vars = max([1] + [n for n in used if n <= EXPRESSION_MAX_VARS])
+        if dont_cares:
+            # The reference's own don't cares, if any, are a mask already
+            dc |= truth_table(dont_cares, num_vars)
+        limit = arguments.get("max_counterexamples", 16)
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            raise ValueError("max_counterexamples must be a positive integer")
+        results = check_equivalence_batch(reference, submissions, num_vars, dc, limit)
+    except ValueError as e:
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"Error: Invalid input. {e}")]
+        )
+
+    lines = []
+    for k, (submission, result) in enumerate(zip(submissions, results), 1):
+        if result.error:
+            lines.append(f"{k}. {submission}: invalid expression ({result.error})")
+        elif result.equivalent:
+            lines.append(f"{k}. {submission}: equivalent")
+        else:
+            details = []
+            if result.missing:
+                details.append(f"false but should be true at minterms {result.missing}")
+            if result.extra:
+                details.append(f"true but should be false at minterms {result.extra}")
+            lines.append(f"{k}. {submission}: NOT equivalent, {'; '.join(details)}")
+    correct = sum(result.equivalent for result in results)
+    lines.append(f"\n{correct} of {len(results)} submissions are equivalent to the reference")
+    return CallToolResult(
+        content=[TextContent(type="text", text="\n".join(lines))]
+    )
+
+async def configure_profiling(arguments: Dict[str, Any]) -> CallToolResult:
+    """Replace or remove the request profiler."""
+    global PROFILER
+    try:
+        if not arguments.get("enabled"):
+            if PROFILER is not None:
+                PROFILER.close(wait=False)
+            PROFILER = None
+            return CallToolResult(content=[TextContent(type="text", text="Request profiling is off")])
+        directory = arguments.get("directory") or (PROFILER.directory if PROFILER else None)
+        if not isinstance(directory, str) or not directory:
+            raise ValueError("directory is required to turn profiling on")
+        every = arguments.get("every", 0)
+        if isinstance(every, bool) or not isinstance(every, int) or every < 0:
+            raise ValueError("every must be a non-negative integer")
+        threshold_ms = arguments.get("threshold_ms")
+        if threshold_ms is not None and (isinstance(threshold_ms, bool)
+                                         or not isinstance(threshold_ms, (int, float)) or threshold_ms < 0):
+            raise ValueError("threshold_ms must be a non-negative number")
+        tools = arguments.get("tools")
+        if tools is not None and (not isinstance(tools, list) or not all(isinstance(t, str) for t in tools)):
+            raise ValueError("tools must be a list of tool names")
+        if not every and threshold_ms is None:
+            every = 1
+        profiler = RequestProfiler(directory, every, threshold_ms, tools, PROFILE_EXCLUDED_TOOLS)
+    except (ValueError, OSError) as e:
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"Error: Invalid input. {e}")]
+        )
+    if PROFILER is not None:
+        PROFILER.close(wait=False)
+    PROFILER = profiler
+    logger.info(f"Request profiling: {profiler.describe()}")
+    return CallToolResult(content=[TextContent(type="text", text=f"Request profiling on: {profiler.describe()}")])
+
 async def get_kmap_info() -> CallToolResult:
     """Get information about K-Maps."""
     info = """
@@ -255,10 +667,33 @@ A Karnaugh Map (K-Map) is a graphical method used to simplify Boolean algebra ex
 - 1: True (1)
 - 2: Don't care (X)
 
+## Other Input Formats:
+Instead of map_data, a function can be given by minterm index, with A as the most significant bit:
+- minterms / dont_cares: index lists, e.g. minterms: [1, 2]
+- truth_table / dont_care_table: packed tables where bit m is minterm m, as an integer or a hex string, e.g. truth_table: "0x6"
+
+## Output Forms:
+- output_forms: ["sop"] (default) returns the sum of products
+- output_forms: ["sop", "pos"] also returns the product of sums, e.g. (A + B)(A' + B')
+
+## Anytime Mode:
+- time_budget_ms: 200 returns the best cover found within 200 ms (greedy first, then branch and bound)
+  and reports whether it is proven minimal and how much of the budget was used
+
+## All Minimal Solutions:
+- max_solutions: 5 also lists up to 5 equally minimal SOP expressions, useful for grading
+
+## Expressions:
+- simplify_expression takes an expression such as "A'B + AC + BCD'" directly (up to 20 variables)
+- NOT: A' ~A !A, AND: AB A*B A&B, XOR: A^B, OR: A+B A|B, parentheses and the constants 0 and 1
+- check_equivalence compares submitted expressions with a reference expression or map and lists counterexample minterms
+
 ## Example Usage:
 For a 2-variable K-Map with F(A,B) = A'B + AB':
 ```
-map_data: [[1, 0], [0, 1]]
+map_data: [[0, 1], [1, 0]]
+minterms: [1, 2]
+truth_table: "0x6"
 ```
 
 The solver will return the simplified Boolean expression.
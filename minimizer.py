@@ -0,0 +1,521 @@
+"""
+K-Map Solver Cube Minimizer
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# A cube is a (value, care) pair of bitmasks over num_vars variables.
+# Variable A is the most significant bit of a minterm index. A set care
+# bit means the variable appears in the product term, and the matching
+# value bit gives its polarity. Value bits outside care are always 0.
+
+from functools import lru_cache
+from time import perf_counter
+
+VARIABLE_NAMES = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def gray_code(bits):
+    return [i ^ (i >> 1) for i in range(1 << bits)]
+
+
+@lru_cache(maxsize=None)
+def map_layout(num_vars):
+    """Minterm index of every K-Map cell, rows carry the first num_vars // 2 variables."""
+    row_bits = num_vars // 2
+    col_bits = num_vars - row_bits
+    cols = gray_code(col_bits)
+    return tuple(tuple((r << col_bits) | c for c in cols) for r in gray_code(row_bits))
+
+
+@lru_cache(maxsize=None)
+def cell_of_minterm(num_vars):
+    """(row, column) of every minterm index, the inverse of map_layout()."""
+    cells = [None] * (1 << num_vars)
+    for i, row in enumerate(map_layout(num_vars)):
+        for j, index in enumerate(row):
+            cells[index] = (i, j)
+    return tuple(cells)
+
+
+def map_to_minterms(map_data, num_vars):
+    on, dc = [], []
+    for row, indexes in zip(map_data, map_layout(num_vars)):
+        for value, index in zip(row, indexes):
+            if value == 1:
+                on.append(index)
+            elif value == 2:
+                dc.append(index)
+    return on, dc
+
+
+def covers(cube, minterm):
+    return minterm & cube[1] == cube[0]
+
+
+def mask_minterms(mask):
+    """Positions of the set bits of a truth table, lowest first."""
+    # Scanned a byte at a time: clearing bits of a wide int copies it every time
+    minterms = []
+    for k, byte in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, 'little')):
+        while byte:
+            low = byte & -byte
+            minterms.append(8 * k + low.bit_length() - 1)
+            byte ^= low
+    return minterms
+
+
+def minterms_mask(minterms):
+    """Truth table with the given minterms set, the inverse of mask_minterms."""
+    minterms = list(minterms)
+    if not minterms:
+        return 0
+    data = bytearray(max(minterms) // 8 + 1)
+    for m in minterms:
+        data[m >> 3] |= 1 << (m & 7)
+    return int.from_bytes(data, 'little')
+
+
+def literal_count(cube):
+    return bin(cube[1]).count('1')
+
+
+def cube_minterms(cube, num_vars):
+    free = ((1 << num_vars) - 1) & ~cube[1]
+    sub = free
+    while True:
+        yield cube[0] | sub
+        if sub == 0:
+            return
+        sub = (sub - 1) & free
+
+
+def cube_cells(cube, num_vars):
+    cells = cell_of_minterm(num_vars)
+    return sorted(cells[m] for m in cube_minterms(cube, num_vars))
+
+
+def cube_to_term(cube, num_vars, names=VARIABLE_NAMES):
+    value, care = cube
+    term = ''
+    for v in range(num_vars):
+        bit = 1 << (num_vars - 1 - v)
+        if care & bit:
+            term += names[v] if value & bit else names[v] + '\''
+    return term or '1'
+
+
+def term_order(cube, num_vars):
+    # A before A' before terms without A, then the same for B, C, ...
+    key = []
+    for v in range(num_vars):
+        bit = 1 << (num_vars - 1 - v)
+        key.append((0 if cube[0] & bit else 1) if cube[1] & bit else 2)
+    return key
+
+
+def cubes_to_expression(cubes, num_vars, names=VARIABLE_NAMES):
+    cubes = sorted(cubes, key=lambda c: term_order(c, num_vars))
+    return ' + '.join(cube_to_term(c, num_vars, names) for c in cubes) or '0'
+
+
+def prime_implicants(num_vars, on, dc=(), deadline=None):
+    """Quine-McCluskey merging with hashed lookups instead of pairwise scans.
+
+    Raises SearchTimeout when a perf_counter() deadline passes first."""
+    full = (1 << num_vars) - 1
+    current = {}
+    for m in set(on) | set(dc):
+        current.setdefault(full, set()).add(m)
+
+    primes = []
+    while current:
+        merged = {}
+        for care, values in current.items():
+            if deadline is not None and perf_counter() > deadline:
+                raise SearchTimeout()
+            used = set()
+            bits = [1 << b for b in range(num_vars) if care >> b & 1]
+            for value in values:
+                for bit in bits:
+                    if value & bit:
+                        continue
+                    if value | bit in values:
+                        merged.setdefault(care & ~bit, set()).add(value)
+                        used.add(value)
+                        used.add(value | bit)
+            primes.extend((value, care) for value in values if value not in used)
+        current = merged
+    return primes
+
+
+def expanded_cover(num_vars, on, dc=()):
+    """Cover without prime generation, as in Espresso's EXPAND: each ON minterm
+    not yet covered grows one variable at a time, A first, while the cube stays
+    inside the ON and don't care sets. Redundant cubes are then dropped."""
+    on = set(on)
+    allowed = on | set(dc)
+    covered = set()
+    cubes = []
+    for m in sorted(on):
+        if m in covered:
+            continue
+        value, care = m, (1 << num_vars) - 1
+        for v in range(num_vars):
+            bit = 1 << (num_vars - 1 - v)
+            if all(x in allowed for x in cube_minterms((value ^ bit, care), num_vars)):
+                value, care = value & ~bit, care & ~bit
+        cubes.append((value, care))
+        covered.update(cube_minterms((value, care), num_vars))
+
+    rows = {cube: [x for x in cube_minterms(cube, num_vars) if x in on] for cube in cubes}
+    times = {}
+    for cube in cubes:
+        for x in rows[cube]:
+            times[x] = times.get(x, 0) + 1
+    kept = []
+    for cube in sorted(cubes, key=lambda c: -literal_count(c)):
+        if all(times[x] > 1 for x in rows[cube]):
+            for x in rows[cube]:
+                times[x] -= 1
+        else:
+            kept.append(cube)
+    return kept
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class CoverProblem(object):
+    """Unate covering of the ON-set by prime implicants, cheapest by (terms, literals)."""
+
+    def __init__(self, num_vars, primes, on):
+        self.num_vars = num_vars
+        self.minterms = sorted(set(on))
+        position = {m: k for k, m in enumerate(self.minterms)}
+        masks = []
+        for cube in primes:
+            if (1 << (num_vars - literal_count(cube))) < len(self.minterms):
+                rows = [position[m] for m in cube_minterms(cube, num_vars) if m in position]
+            else:
+                rows = [k for k, m in enumerate(self.minterms) if covers(cube, m)]
+            masks.append(minterms_mask(rows))
+        self.set_columns(primes, masks)
+
+    def set_columns(self, primes, masks):
+        """Keep the primes that cover something, with the rows each one covers."""
+        self.primes = []
+        self.masks = []
+        for cube, mask in zip(primes, masks):
+            if mask:
+                self.primes.append(cube)
+                self.masks.append(mask)
+        self.costs = [literal_count(c) for c in self.primes]
+        self.rows = [mask_minterms(mask) for mask in self.masks]
+        self.covering = [[] for _ in self.minterms]
+        for p, rows in enumerate(self.rows):
+            for k in rows:
+                self.covering[k].append(p)
+        self.full = (1 << len(self.minterms)) - 1
+
+    def essentials(self):
+        chosen = set()
+        for options in self.covering:
+            if len(options) == 1:
+                chosen.add(options[0])
+        return sorted(chosen)
+
+    def cost(self, chosen):
+        return len(chosen), sum(self.costs[p] for p in chosen)
+
+    def greedy(self, chosen=(), uncovered=None):
+        """Largest-coverage selection, followed by redundancy removal."""
+        chosen = list(chosen)
+        if uncovered is None:
+            uncovered = self.full
+            for p in chosen:
+                uncovered &= ~self.masks[p]
+        while uncovered:
+            k = (uncovered & -uncovered).bit_length() - 1
+            best = max(self.covering[k],
+                       key=lambda p: (bin(self.masks[p] & uncovered).count('1'), -self.costs[p]))
+            chosen.append(best)
+            uncovered &= ~self.masks[best]
+        return self.irredundant(chosen)
+
+    def irredundant(self, chosen):
+        chosen = sorted(chosen, key=lambda p: -self.costs[p])
+        # How many chosen primes cover each row; a prime whose rows all have another goes
+        times = [0] * len(self.minterms)
+        for p in chosen:
+            for k in self.rows[p]:
+                times[k] += 1
+        kept = []
+        for p in chosen:
+            if all(times[k] > 1 for k in self.rows[p]):
+                for k in self.rows[p]:
+                    times[k] -= 1
+            else:
+                kept.append(p)
+        return kept
+
+    def lower_bound(self, uncovered, deadline=None):
+        # Minterms that share no prime each need a term of their own
+        bound = 0
+        picked = 0
+        steps = 0
+        while uncovered:
+            steps += 1
+            if deadline is not None and steps % 64 == 0 and perf_counter() > deadline:
+                raise SearchTimeout()
+            low = uncovered & -uncovered
+            uncovered ^= low
+            reach = 0
+            for p in self.covering[low.bit_length() - 1]:
+                reach |= self.masks[p]
+            if not reach & picked:
+                bound += 1
+                picked |= low
+        return bound
+
+    def branch_minterm(self, uncovered):
+        best_k, best_n = None, None
+        rest = uncovered
+        while rest:
+            k = (rest & -rest).bit_length() - 1
+            rest &= rest - 1
+            n = len(self.covering[k])
+            if best_n is None or n < best_n:
+                best_k, best_n = k, n
+                if n <= 1:
+                    break
+        return best_k
+
+    def exact(self, deadline=None):
+        """Minimum cover by branch and bound, seeded with the greedy cover.
+
+        With a perf_counter() deadline the search stops when it passes and the
+        best cover found so far is returned; proven_minimal tells which happened."""
+        start = self.essentials()
+        best = [self.greedy(start)]
+        best_cost = [self.cost(best[0])]
+
+        uncovered = self.full
+        for p in start:
+            uncovered &= ~self.masks[p]
+
+        def search(chosen, uncovered, literals):
+            if deadline is not None and perf_counter() > deadline:
+                raise SearchTimeout()
+            if not uncovered:
+                cost = (len(chosen), literals)
+                if cost < best_cost[0]:
+                    best[0], best_cost[0] = list(chosen), cost
+                return
+            terms = len(chosen) + self.lower_bound(uncovered, deadline)
+            if (terms, literals) >= best_cost[0]:
+                return
+            k = self.branch_minterm(uncovered)
+            options = sorted(self.covering[k],
+                             key=lambda p: (-bin(self.masks[p] & uncovered).count('1'), self.costs[p]))
+            for p in options:
+                chosen.append(p)
+                search(chosen, uncovered & ~self.masks[p], literals + self.costs[p])
+                chosen.pop()
+
+        self.proven_minimal = True
+        try:
+            search(list(start), uncovered, sum(self.costs[p] for p in start))
+        except SearchTimeout:
+            self.proven_minimal = False
+        return [self.primes[p] for p in best[0]]
+
+    def iter_minimum(self):
+        """Yield every minimum cover once, as lists of prime indexes, searching lazily.
+
+        Branching on a minterm, the option taken in one branch is excluded from
+        the later branches, so no cover is reached twice."""
+        optimum = self.cost([self.primes.index(c) for c in self.exact()])
+        start = self.essentials()
+        uncovered = self.full
+        for p in start:
+            uncovered &= ~self.masks[p]
+
+        def search(chosen, uncovered, literals, excluded):
+            if not uncovered:
+                if (len(chosen), literals) == optimum:
+                    yield list(chosen)
+                return
+            if (len(chosen) + self.lower_bound(uncovered), literals) > optimum:
+                return
+            k = self.branch_minterm(uncovered)
+            options = [p for p in self.covering[k] if not excluded >> p & 1]
+            for p in options:
+                chosen.append(p)
+                yield from search(chosen, uncovered & ~self.masks[p], literals + self.costs[p], excluded)
+                chosen.pop()
+                excluded |= 1 << p
+
+        yield from search(list(start), uncovered, sum(self.costs[p] for p in start), 0)
+
+
+def iter_minimum_covers(num_vars, on, dc=()):
+    """Yield each minimum sum-of-products cover of the ON-set, as sorted cube lists.
+
+    The primes are generated once; take the first few with itertools.islice."""
+    on = set(on)
+    if not on:
+        yield []
+        return
+    problem = CoverProblem(num_vars, prime_implicants(num_vars, on, dc), on)
+    for chosen in problem.iter_minimum():
+        yield sorted((problem.primes[p] for p in chosen), key=lambda c: term_order(c, num_vars))
+
+
+def minimize(num_vars, on, dc=()):
+    """Minimum sum-of-products cover of the ON-set, as a list of cubes."""
+    return minimize_within(num_vars, on, dc)[0]
+
+
+def minimize_within(num_vars, on, dc=(), time_budget_ms=None):
+    """(cubes, proven_minimal): the best cover found before the budget ran out."""
+    deadline = None if time_budget_ms is None else perf_counter() + time_budget_ms / 1000.0
+    on = set(on)
+    if not on:
+        return [], True
+    try:
+        primes = prime_implicants(num_vars, on, dc, deadline)
+    except SearchTimeout:
+        return sorted(expanded_cover(num_vars, on, dc), key=lambda c: term_order(c, num_vars)), False
+    problem = CoverProblem(num_vars, primes, on)
+    cover = problem.exact(deadline)
+    return sorted(cover, key=lambda c: term_order(c, num_vars)), problem.proven_minimal
+
+
+def multi_output_primes(num_vars, functions, deadline=None):
+    """Tagged Quine-McCluskey over several (on, dc) functions of the same inputs.
+
+    Returns (value, care, tag) triples, bit k of tag being set when the cube
+    lies inside the ON or don't care set of output k. Raises SearchTimeout
+    when a perf_counter() deadline passes first."""
+    tags = {}
+    for k, (on, dc) in enumerate(functions):
+        for m in set(on) | set(dc):
+            tags[m] = tags.get(m, 0) | (1 << k)
+    full = (1 << num_vars) - 1
+    current = {full: tags} if tags else {}
+
+    primes = []
+    while current:
+        merged = {}
+        for care, values in current.items():
+            if deadline is not None and perf_counter() > deadline:
+                raise SearchTimeout()
+            used = set()
+            bits = [1 << b for b in range(num_vars) if care >> b & 1]
+            for value, tag in values.items():
+                for bit in bits:
+                    if value & bit:
+                        continue
+                    partner = values.get(value | bit)
+                    if partner is None:
+                        continue
+                    shared = tag & partner
+                    if not shared:
+                        continue
+                    merged.setdefault(care & ~bit, {})[value] = shared
+                    # A cube is only subsumed by a merge that serves all of its outputs
+                    if shared == tag:
+                        used.add(value)
+                    if shared == partner:
+                        used.add(value | bit)
+            primes.extend((value, care, tag) for value, tag in values.items() if value not in used)
+        current = merged
+    return primes
+
+
+class MultiOutputCoverProblem(CoverProblem):
+    """Covering of every (output, ON minterm) pair, a product shared by outputs costing once."""
+
+    def __init__(self, num_vars, primes, functions):
+        self.num_vars = num_vars
+        self.minterms = [(k, m) for k, (on, dc) in enumerate(functions) for m in sorted(set(on))]
+        position = {pair: i for i, pair in enumerate(self.minterms)}
+        self.tags = {}
+        cubes, masks = [], []
+        for value, care, tag in primes:
+            outputs = [k for k in range(len(functions)) if tag >> k & 1]
+            mask = 0
+            for m in cube_minterms((value, care), num_vars):
+                for k in outputs:
+                    i = position.get((k, m))
+                    if i is not None:
+                        mask |= 1 << i
+            cubes.append((value, care))
+            masks.append(mask)
+            self.tags[(value, care)] = tag
+        self.set_columns(cubes, masks)
+
+    def output_covers(self, chosen, outputs):
+        """Split the chosen products into an irredundant cover per output."""
+        result = []
+        for k in range(outputs):
+            rows = {p: [i for i in self.rows[p] if self.minterms[i][0] == k] for p in chosen}
+            picked = [p for p in chosen if rows[p]]
+            times = {}
+            for p in picked:
+                for i in rows[p]:
+                    times[i] = times.get(i, 0) + 1
+            for p in sorted(picked, key=lambda p: -self.costs[p]):
+                if all(times[i] > 1 for i in rows[p]):
+                    for i in rows[p]:
+                        times[i] -= 1
+                    picked.remove(p)
+            result.append(picked)
+        return result
+
+
+def minimize_multi(num_vars, functions):
+    """Minimum shared cover of several (on, dc) functions, as one cube list per output.
+
+    The number of distinct products is minimized first, then their literals."""
+    return minimize_multi_within(num_vars, functions)[0]
+
+
+def minimize_multi_within(num_vars, functions, time_budget_ms=None):
+    """(covers, proven_minimal): the best shared cover found before the budget ran out.
+
+    When the tagged primes are not all generated in time, each output is
+    covered by expanded_cover() on its own, equal products still being shared."""
+    deadline = None if time_budget_ms is None else perf_counter() + time_budget_ms / 1000.0
+    if not any(set(on) for on, dc in functions):
+        return [[] for _ in functions], True
+    try:
+        primes = multi_output_primes(num_vars, functions, deadline)
+    except SearchTimeout:
+        return [sorted(expanded_cover(num_vars, on, dc), key=lambda c: term_order(c, num_vars))
+                for on, dc in functions], False
+    problem = MultiOutputCoverProblem(num_vars, primes, functions)
+    position = {cube: p for p, cube in enumerate(problem.primes)}
+    chosen = [position[cube] for cube in problem.exact(deadline)]
+    return [sorted((problem.primes[p] for p in picked), key=lambda c: term_order(c, num_vars))
+            for picked in problem.output_covers(chosen, len(functions))], problem.proven_minimal
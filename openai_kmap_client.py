@@ -2,21 +2,91 @@
 
 import asyncio
 import json
+import os
 import subprocess
 import sys
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict, deque
 import openai
 from openai import AsyncOpenAI
 
+from gpt_common import MAX_HISTORY_TURNS, SYSTEM_PROMPT, build_messages, create_http_client, stream_completion
+
 # 设置OpenAI API密钥
 OPENAI_API_KEY = "your-api-key-here"
 
+# Client-side tool result cache limits; KMAP_TOOL_CACHE_SIZE=0 turns the cache off
+TOOL_CACHE_SIZE = int(os.environ.get("KMAP_TOOL_CACHE_SIZE", "256"))
+TOOL_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# Only these tools are pure functions of their arguments; anything else
+# (e.g. the server's configure_profiling admin tool) is always sent
+CACHEABLE_TOOLS = frozenset({
+    "solve_kmap_2", "solve_kmap_3", "solve_kmap_4",
+    "simplify_expression", "check_equivalence", "get_kmap_info",
+})
+
+
+class ToolResultCache:
+    """LRU cache of MCP tool results keyed on tool name plus normalized arguments"""
+
+    def __init__(self, max_entries: int = TOOL_CACHE_SIZE, max_bytes: int = TOOL_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(value: Any) -> Any:
+        """Canonical form of tool arguments, so equal requests share a key"""
+        if isinstance(value, dict):
+            return {str(k): ToolResultCache.normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [ToolResultCache.normalize(v) for v in value]
+        # bool is an int subclass; True and 1 must keep distinct keys
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    def make_key(self, name: str, arguments: Dict[str, Any]) -> str:
+        arguments = self.normalize(arguments or {})
+        return name + ":" + json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: str):
+        cost = len(key) + len(value)
+        if cost > self.max_bytes:
+            return
+        if key in self.entries:
+            self.size -= len(key) + len(self.entries.pop(key))
+        self.entries[key] = value
+        self.size += cost
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            old_key, old_value = self.entries.popitem(last=False)
+            self.size -= len(old_key) + len(old_value)
+
+    def stats(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {len(self.entries)} cached results"
+
+
 class KMapMCPClient:
     """K-Map MCP client for communicating with MCP server"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = TOOL_CACHE_SIZE):
         self.process = None
         self.request_id = 1
+        # A cache_size of 0 opts out of client-side result caching
+        self.cache = ToolResultCache(cache_size) if cache_size > 0 else None
     
     async def start_server(self):
         """Start MCP server"""
@@ -76,7 +146,21 @@ class KMapMCPClient:
             raise Exception(f"Failed to get tools list: {response}")
     
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> str:
-        """Call MCP tool"""
+        """Call MCP tool, serving repeated calls of pure tools from the session cache"""
+        if self.cache is None or name not in CACHEABLE_TOOLS:
+            return await self._call_tool(name, arguments)
+
+        key = self.cache.make_key(name, arguments)
+        result = self.cache.get(key)
+        if result is None:
+            result = await self._call_tool(name, arguments)
+            # Don't keep failures around, a retry may succeed
+            if not result.startswith("Error"):
+                self.cache.put(key, result)
+        return result
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> str:
+        """Send a tools/call request to the MCP server"""
         request = {
             "jsonrpc": "2.0",
             "id": self.request_id,
@@ -109,110 +193,75 @@ class OpenAIKMapAssistant:
     """K-Map assistant using OpenAI GPT-4o"""
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        self.http_client = create_http_client()
+        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=self.http_client)
         self.mcp_client = KMapMCPClient()
         self.tools = []
+        self.system_message = {"role": "system", "content": SYSTEM_PROMPT}
+        self.history = deque(maxlen=MAX_HISTORY_TURNS)
     
     async def initialize(self):
         """Initialize MCP server and tools list"""
         await self.mcp_client.start_server()
-        self.tools = await self.mcp_client.list_tools()
-        print(f"Available tools: {[tool['name'] for tool in self.tools]}")
-    
-    async def chat_with_gpt(self, user_message: str) -> str:
-        """Chat with GPT-4o, handle K-Map related requests"""
-        
-        # Build tool call format
-        tools = []
-        for tool in self.tools:
-            tools.append({
+        mcp_tools = await self.mcp_client.list_tools()
+        print(f"Available tools: {[tool['name'] for tool in mcp_tools]}")
+
+        # Build tool call format once for the whole session
+        self.tools = [
+            {
                 "type": "function",
                 "function": {
                     "name": tool["name"],
                     "description": tool["description"],
                     "parameters": tool["inputSchema"]
                 }
-            })
+            }
+            for tool in mcp_tools
+        ]
+
+    async def chat_with_gpt(self, user_message: str, on_token=None) -> Tuple[str, Optional[str]]:
+        """Chat with GPT-4o, handle K-Map related requests, streaming the answer to on_token.
+
+        Returns (answer, None), or ("", error message) when the request failed"""
+        turn = [{"role": "user", "content": user_message}]
         
         try:
             # Call GPT-4o
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a Karnaugh Map (K-Map) solving assistant. You can help users:
-
-1. Explain what K-Map is and how to use it
-2. Solve 2, 3, 4 variable K-Maps
-3. Provide K-Map examples and exercises
-
-When users provide K-Map data, you should call the appropriate tools to solve it.
-When users ask about K-Map knowledge, you should call the get_kmap_info tool to get detailed information.
-
-Please always use the provided tools to help users, don't calculate K-Maps yourself."""
-                    },
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                tools=tools,
-                tool_choice="auto"
-            )
-            
-            # Process response
-            message = response.choices[0].message
+            messages = build_messages(self.system_message, self.history, turn)
+            content, tool_calls = await stream_completion(self.client, messages, on_token, tools=self.tools)
             
-            if message.tool_calls:
+            if tool_calls:
                 # Has tool calls
-                tool_results = []
-                for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    arguments = json.loads(tool_call.function.arguments)
+                turn.append({"role": "assistant", "content": content or None, "tool_calls": tool_calls})
+                for tool_call in tool_calls:
+                    tool_name = tool_call["function"]["name"]
+                    arguments = json.loads(tool_call["function"]["arguments"] or "{}")
                     
                     print(f"Calling tool: {tool_name}")
                     print(f"Parameters: {arguments}")
                     
                     # Call MCP tool
-                    result = await self.mcp_client.call_tool(tool_name, arguments)
-                    tool_results.append(result)
-                
-                # Send tool results to GPT
-                messages = [
-                    {
-                        "role": "system",
-                        "content": """You are a Karnaugh Map (K-Map) solving assistant."""
-                    },
-                    {
-                        "role": "user",
-                        "content": user_message
-                    },
-                    message,
-                    {
+                    turn.append({
                         "role": "tool",
-                        "tool_call_id": message.tool_calls[0].id,
-                        "content": "\n\n".join(tool_results)
-                    }
-                ]
+                        "tool_call_id": tool_call["id"],
+                        "content": await self.mcp_client.call_tool(tool_name, arguments)
+                    })
                 
-                # Get final response
-                final_response = await self.client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=messages
-                )
-                
-                return final_response.choices[0].message.content
-            else:
-                # No tool calls, return response directly
-                return message.content
+                # Stream the final response built from the tool results
+                messages = build_messages(self.system_message, self.history, turn)
+                content, _ = await stream_completion(self.client, messages, on_token)
+
+            turn.append({"role": "assistant", "content": content})
+            self.history.append(turn)
+            return content, None
                 
         except Exception as e:
-            return f"Error: {str(e)}"
+            return "", f"Error: {str(e)}"
     
     async def close(self):
         """Close connection"""
         await self.mcp_client.stop_server()
+        await self.client.close()
 
 async def main():
     """Main function"""
@@ -235,14 +284,21 @@ async def main():
             if user_input.lower() in ['exit', 'quit']:
                 break
             
-            print("GPT-4o: Processing...")
-            response = await assistant.chat_with_gpt(user_input)
-            print(f"GPT-4o: {response}")
+            print("GPT-4o: ", end="", flush=True)
+            _, error = await assistant.chat_with_gpt(
+                user_input,
+                on_token=lambda token: print(token, end="", flush=True)
+            )
+            if error:
+                print(error, end="")
+            print()
     
     except Exception as e:
         print(f"Error: {e}")
     finally:
         await assistant.close()
+        if assistant.mcp_client.cache is not None:
+            print(f"Tool cache: {assistant.mcp_client.cache.stats()}")
         print("Program exited")
 
 if __name__ == "__main__":
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Berkeley PLA (Espresso) File I/O
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# The first input column is variable A, the most significant bit of a
+# minterm index, so an input part such as "01-1" is the cube A'BD of the
+# minimizer. Cube lines are parsed one at a time while the file is read.
+#
+# Up to DENSE_MAX_INPUTS inputs every output becomes a truth table and is
+# minimized exactly, with products shared across outputs. Wider PLAs never
+# expand to 2**n bits: their cubes go straight into one BDD and each output
+# is covered greedily from its implicit primes (bdd.py), output by output.
+# Each file has a time budget, PLA_TIME_BUDGET_MS by default; past it the
+# exact searches stop and the rest is covered greedily.
+#
+#     python pla.py designs/ --out minimized/ --workers 8
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from bdd import BDD, FALSE, cover_implicit
+from minimizer import minimize_multi_within, term_order
+from sparse import SparseFunction
+from verifier import cube_mask, full_mask, mask_minterms, verify
+
+PLA_TYPES = ('f', 'fd', 'fr', 'fdr')
+DENSE_MAX_INPUTS = 16
+
+# Time one file may take before its covers are finished greedily; 0 lifts the limit
+PLA_TIME_BUDGET_MS = 10000
+UNSUPPORTED = ('.phase', '.pair', '.symbolic', '.mv', '.kiss')
+
+
+class PLAReader(object):
+    """Header of a PLA plus a lazy iterator over its cubes."""
+
+    def __init__(self, lines):
+        self.lines = iter(lines)
+        self.num_inputs = None
+        self.num_outputs = None
+        self.input_labels = None
+        self.output_labels = None
+        self.type = 'fd'
+        self.products = None
+        self.pending = None
+        self.line_number = 0
+        self.read_header()
+
+    def next_line(self):
+        for line in self.lines:
+            self.line_number += 1
+            line = line.split('#', 1)[0].strip()
+            if line:
+                return line
+        return None
+
+    def read_header(self):
+        while True:
+            line = self.next_line()
+            if line is None or not line.startswith('.'):
+                self.pending = line
+                break
+            if not self.directive(line):
+                break
+        if self.num_inputs is None:
+            raise ValueError("PLA has no .i directive")
+        if self.num_outputs is None:
+            raise ValueError("PLA has no .o directive")
+
+    def directive(self, line):
+        """Apply a header directive, False at the end of the file."""
+        words = line.split()
+        keyword = words[0]
+        if keyword in ('.e', '.end'):
+            return False
+        if keyword in UNSUPPORTED:
+            raise ValueError(f"line {self.line_number}: {keyword} is not supported")
+        if keyword == '.i':
+            self.num_inputs = int(words[1])
+        elif keyword == '.o':
+            self.num_outputs = int(words[1])
+        elif keyword == '.ilb':
+            self.input_labels = words[1:]
+        elif keyword == '.ob':
+            self.output_labels = words[1:]
+        elif keyword == '.p':
+            self.products = int(words[1])
+        elif keyword == '.type':
+            if words[1] not in PLA_TYPES:
+                raise ValueError(f"line {self.line_number}: unknown .type {words[1]}")
+            self.type = words[1]
+        return True
+
+    def parse_cube(self, line):
+        text = ''.join(line.replace('|', ' ').split())
+        if len(text) != self.num_inputs + self.num_outputs:
+            raise ValueError(f"line {self.line_number}: expected {self.num_inputs} inputs "
+                             f"and {self.num_outputs} outputs, got '{line}'")
+        value = care = 0
+        for ch in text[:self.num_inputs]:
+            value <<= 1
+            care <<= 1
+            if ch == '1':
+                value |= 1
+                care |= 1
+            elif ch == '0':
+                care |= 1
+            elif ch not in '-2':
+                raise ValueError(f"line {self.line_number}: bad input character '{ch}'")
+        outputs = text[self.num_inputs:]
+        if outputs.strip('01-2~'):
+            raise ValueError(f"line {self.line_number}: bad output part '{outputs}'")
+        return (value, care), outputs
+
+    def cubes(self):
+        """Yield ((value, care), output_part) for each cube line, reading as it goes."""
+        line, self.pending = self.pending, None
+        while line is not None:
+            if line.startswith('.'):
+                if not self.directive(line):
+                    return
+            else:
+                yield self.parse_cube(line)
+            line = self.next_line()
+
+
+def read_functions(reader):
+    """(ON, don't care) truth table of every output, following the PLA .type."""
+    n, outputs = reader.num_inputs, reader.num_outputs
+    on, off, dc = [0] * outputs, [0] * outputs, [0] * outputs
+    for cube, part in reader.cubes():
+        mask = cube_mask(cube, n)
+        for k, ch in enumerate(part):
+            if ch == '1':
+                on[k] |= mask
+            elif ch == '0':
+                off[k] |= mask
+            elif ch in '-2':
+                dc[k] |= mask
+
+    full = full_mask(n)
+    functions = []
+    for k in range(outputs):
+        if 'r' in reader.type:
+            if on[k] & off[k] & ~dc[k]:
+                raise ValueError(f"output {k} is both 1 and 0 for some minterms")
+            care_dc = (dc[k] if 'd' in reader.type else 0) | (full & ~(on[k] | off[k]))
+        else:
+            care_dc = dc[k] if 'd' in reader.type else 0
+        functions.append((on[k] & ~care_dc, care_dc))
+    return functions
+
+
+def read_function_bdds(reader):
+    """(BDD, [(ON, ON or don't care)]) of every output, the nodes ref()'d; for wide PLAs."""
+    n, outputs = reader.num_inputs, reader.num_outputs
+    bdd = BDD(n)
+    on, off, dc = [FALSE] * outputs, [FALSE] * outputs, [FALSE] * outputs
+    for cube, part in reader.cubes():
+        u = bdd.cube(cube)
+        for k, ch in enumerate(part):
+            if ch == '1':
+                on[k] = bdd.or_(on[k], u)
+            elif ch == '0':
+                off[k] = bdd.or_(off[k], u)
+            elif ch in '-2':
+                dc[k] = bdd.or_(dc[k], u)
+
+    functions = []
+    for k in range(outputs):
+        care_dc = dc[k] if 'd' in reader.type else FALSE
+        if 'r' in reader.type:
+            if bdd.diff(bdd.and_(on[k], off[k]), dc[k]) != FALSE:
+                raise ValueError(f"output {k} is both 1 and 0 for some minterms")
+            care_dc = bdd.or_(care_dc, bdd.not_(bdd.or_(on[k], off[k])))
+        f = bdd.diff(on[k], care_dc)
+        functions.append((bdd.ref(f), bdd.ref(bdd.or_(f, care_dc))))
+    return bdd, functions
+
+
+def cover_rows(covers, num_vars):
+    """Merge per-output covers into PLA rows, one per distinct cube."""
+    rows = {}
+    for k, cubes in enumerate(covers):
+        for cube in cubes:
+            rows.setdefault(cube, ['0'] * len(covers))[k] = '1'
+    return [(cube, ''.join(rows[cube])) for cube in sorted(rows, key=lambda c: term_order(c, num_vars))]
+
+
+def format_cube(cube, num_vars):
+    value, care = cube
+    chars = []
+    for v in range(num_vars):
+        bit = 1 << (num_vars - 1 - v)
+        chars.append(('1' if value & bit else '0') if care & bit else '-')
+    return ''.join(chars)
+
+
+def write_pla(f, num_inputs, num_outputs, rows, input_labels=None, output_labels=None):
+    """Write rows of (cube, output_part) as a type f PLA, one line at a time."""
+    f.write(f".i {num_inputs}\n.o {num_outputs}\n")
+    if input_labels:
+        f.write(".ilb " + " ".join(input_labels) + "\n")
+    if output_labels:
+        f.write(".ob " + " ".join(output_labels) + "\n")
+    if hasattr(rows, '__len__'):
+        f.write(f".p {len(rows)}\n")
+    f.write(".type f\n")
+    for cube, part in rows:
+        f.write(f"{format_cube(cube, num_inputs)} {part}\n")
+    f.write(".e\n")
+
+
+def remaining_ms(deadline):
+    return None if deadline is None else max(0.0, (deadline - time.perf_counter()) * 1000.0)
+
+
+def minimize_functions(num_vars, functions, shared=True, time_budget_ms=None):
+    """(covers, proven_minimal): a cover of every output, with products shared across
+    outputs unless shared is False, the best found within the budget."""
+    deadline = None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000.0
+    functions = [(mask_minterms(on), mask_minterms(dc)) for on, dc in functions]
+    if shared and len(functions) > 1:
+        return minimize_multi_within(num_vars, functions, time_budget_ms)
+    covers, proven = [], True
+    for on, dc in functions:
+        cubes, minimal = SparseFunction(num_vars, on, dc).minimize(remaining_ms(deadline))
+        covers.append(cubes)
+        proven = proven and minimal
+    return covers, proven
+
+
+def minimize_pla(source, target, shared=True, time_budget_ms=PLA_TIME_BUDGET_MS):
+    """Minimize every output of one PLA file and write the result, returning stats.
+
+    time_budget_ms (None or 0 for no limit) counts from the start of the read."""
+    began = time.perf_counter()
+    deadline = began + time_budget_ms / 1000.0 if time_budget_ms else None
+    with open(source) as f:
+        reader = PLAReader(f)
+        dense = reader.num_inputs <= DENSE_MAX_INPUTS
+        functions = read_functions(reader) if dense else read_function_bdds(reader)
+    n = reader.num_inputs
+    if dense:
+        covers, proven = minimize_functions(n, functions, shared, remaining_ms(deadline))
+        for cubes, (on, dc) in zip(covers, functions):
+            if not verify(cubes, on, dc, n):
+                raise AssertionError(f"minimized cover of {source} does not match its function")
+    else:
+        bdd, functions = functions
+        results = [cover_implicit(bdd, on, care, deadline=deadline) for on, care in functions]
+        covers = [result.cubes for result in results]
+        proven = all(result.proven_minimal for result in results)
+        for cubes, (on, care) in zip(covers, functions):
+            cover = bdd.from_cubes(cubes)
+            if bdd.diff(on, cover) != FALSE or bdd.diff(cover, care) != FALSE:
+                raise AssertionError(f"minimized cover of {source} does not match its function")
+    rows = cover_rows(covers, n)
+    tmp = target + '.tmp'
+    with open(tmp, 'w') as f:
+        write_pla(f, n, reader.num_outputs, rows, reader.input_labels, reader.output_labels)
+    os.replace(tmp, target)
+    return {
+        'inputs': n,
+        'outputs': reader.num_outputs,
+        'products_in': reader.products,
+        'products_out': len(rows),
+        'proven_minimal': proven,
+        'seconds': time.perf_counter() - began,
+    }
+
+
+def process_file(task):
+    source, target, shared, time_budget_ms = task
+    try:
+        stats = minimize_pla(source, target, shared, time_budget_ms)
+        stats['error'] = None
+    except Exception as e:
+        stats = {'error': f"{type(e).__name__}: {e}"}
+    stats['file'] = source
+    return stats
+
+
+def collect_tasks(paths, out, shared, time_budget_ms=PLA_TIME_BUDGET_MS):
+    tasks = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(name for name in os.listdir(path) if name.endswith('.pla'))
+            sources = [os.path.join(path, name) for name in names]
+        else:
+            sources = [path]
+        for source in sources:
+            tasks.append((source, os.path.join(out, os.path.basename(source)), shared, time_budget_ms))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Minimize Espresso PLA files')
+    parser.add_argument('paths', nargs='+', help='.pla files or directories of them')
+    parser.add_argument('--out', default='minimized', help='directory for the minimized PLAs')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--separate', action='store_true',
+                        help='minimize each output on its own instead of sharing products')
+    parser.add_argument('--time-budget-ms', type=float, default=PLA_TIME_BUDGET_MS,
+                        help='time per file before the covers are finished greedily, 0 for no limit')
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    tasks = collect_tasks(args.paths, args.out, not args.separate, args.time_budget_ms)
+    failed = 0
+    with multiprocessing.Pool(args.workers) as pool:
+        for stats in pool.imap_unordered(process_file, tasks):
+            if stats['error']:
+                failed += 1
+                print(f"{stats['file']}: {stats['error']}", flush=True)
+            else:
+                print(f"{stats['file']}: {stats['inputs']} inputs, {stats['outputs']} outputs, "
+                      f"{stats['products_in'] if stats['products_in'] is not None else '?'} -> "
+                      f"{stats['products_out']} products in {stats['seconds']:.2f}s"
+                      f"{'' if stats['proven_minimal'] else ' (not proven minimal)'}", flush=True)
+    print(f"{len(tasks) - failed} of {len(tasks)} files minimized into {args.out}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+K-Map Solver Request Profiling
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# A captured tool call leaves three files sharing one stem in the profile
+# directory: <stem>.pstats (cProfile, open with pstats or snakeviz),
+# <stem>.snapshot (tracemalloc, tracemalloc.Snapshot.load) and <stem>.json
+# with the tool name, its arguments, the timings and the peak allocation.
+#
+# With a latency threshold a call runs unprofiled and answers first; when it
+# was slow it is run a second time under the profilers on a background
+# thread, one re-run at a time (slow calls arriving meanwhile are skipped).
+# Only one capture holds the profilers at a time: a call selected while
+# another is being captured, or while a debugger or coverage tool owns the
+# profiling hook, runs unprofiled and counts as skipped.
+# Only tools that are pure functions of their arguments may be re-run, so
+# side-effecting tools are passed in `exclude` and never profiled. The
+# tracemalloc snapshot of a re-run also holds whatever the server allocated
+# at the same time.
+
+import asyncio
+import cProfile
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# Stack depth kept per allocation in the snapshots
+TRACE_FRAMES = 16
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfiler(object):
+    """Profiles every Nth call and/or the calls slower than threshold_ms."""
+
+    def __init__(self, directory, every=0, threshold_ms=None, tools=None, exclude=()):
+        if not every and threshold_ms is None:
+            raise ValueError("Give a sampling interval, a latency threshold or both")
+        self.directory = directory
+        self.every = every
+        self.threshold_ms = threshold_ms
+        self.tools = frozenset(tools) if tools else None
+        self.exclude = frozenset(exclude)
+        self.calls = 0
+        self.captures = 0
+        self.skipped = 0
+        self.sequence = itertools.count(1)
+        self.rerun = None
+        self.executor = None
+        # Captures on the loop and on the re-run thread share cProfile's hook and tracemalloc
+        self.lock = threading.Lock()
+        self.capturing = False
+        self.started_tracing = False
+        os.makedirs(directory, exist_ok=True)
+
+    def describe(self):
+        parts = []
+        if self.every:
+            parts.append(f"every {self.every} calls")
+        if self.threshold_ms is not None:
+            parts.append(f"calls over {self.threshold_ms} ms")
+        tools = ", ".join(sorted(self.tools)) if self.tools else "all tools"
+        return f"profiling {' and '.join(parts)} of {tools} into {self.directory}"
+
+    async def run(self, name, arguments, call):
+        """Result of `await call(name, arguments)`, capturing a profile when selected."""
+        if name in self.exclude or (self.tools is not None and name not in self.tools):
+            return await call(name, arguments)
+        self.calls += 1
+        if self.every and self.calls % self.every == 0:
+            result, _ = await self.capture(name, arguments, call, "sample")
+            return result
+
+        started = time.perf_counter()
+        result = await call(name, arguments)
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        if self.threshold_ms is not None and duration_ms > self.threshold_ms:
+            self.schedule_rerun(name, arguments, call, duration_ms)
+        return result
+
+    def schedule_rerun(self, name, arguments, call, original_ms):
+        """Profile the call again on the background thread, unless a re-run is still going."""
+        if self.rerun is not None and not self.rerun.done():
+            self.skipped += 1
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(1, thread_name_prefix="kmap-profile")
+        self.rerun = self.executor.submit(
+            asyncio.run, self.capture(name, arguments, call, "threshold", original_ms))
+
+    def close(self, wait=True):
+        """Stop the re-run thread once a pending re-run is done."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+
+    def start_capture(self):
+        """Claim the profilers and start tracing; False when another capture holds them."""
+        with self.lock:
+            if self.capturing:
+                self.skipped += 1
+                return False
+            self.capturing = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+                self.started_tracing = True
+        tracemalloc.reset_peak()
+        return True
+
+    def stop_capture(self):
+        with self.lock:
+            if self.started_tracing:
+                tracemalloc.stop()
+                self.started_tracing = False
+            self.capturing = False
+
+    async def capture(self, name, arguments, call, reason, original_ms=None):
+        """Run the call under cProfile and tracemalloc and write its files; returns (result, stem).
+
+        The stem is None when the call could not be profiled and ran without the profilers."""
+        if not self.start_capture():
+            return await call(name, arguments), None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+ allows one profiling tool at a time
+            self.stop_capture()
+            with self.lock:
+                self.skipped += 1
+            logger.warning(f"Could not profile {name}: {e}")
+            return await call(name, arguments), None
+        started = time.perf_counter()
+        try:
+            result = await call(name, arguments)
+        finally:
+            profile.disable()
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            self.stop_capture()
+
+        stem = os.path.join(self.directory, "{}-{:05d}-{}".format(
+            time.strftime("%Y%m%d-%H%M%S"), next(self.sequence), re.sub(r"[^\w-]", "_", name)))
+        record = {
+            "tool": name,
+            "arguments": arguments,
+            "reason": reason,
+            "profiled_ms": round(duration_ms, 3),
+            "original_ms": None if original_ms is None else round(original_ms, 3),
+            "peak_traced_bytes": peak,
+            "time": time.time(),
+        }
+        try:
+            profile.dump_stats(stem + ".pstats")
+            snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).dump(stem + ".snapshot")
+            with open(stem + ".json", "w") as f:
+                json.dump(record, f, indent=2, default=str)
+        except OSError as e:
+            # A full or missing profile directory must not fail the request
+            logger.warning(f"Could not write profile {stem}: {e}")
+            return result, None
+        self.captures += 1
+        return result, stem
+
+
+def profiler_from_env(environ=os.environ, exclude=()):
+    """RequestProfiler set up by KMAP_PROFILE_DIR and friends, or None when profiling is off."""
+    directory = environ.get("KMAP_PROFILE_DIR")
+    if not directory:
+        return None
+    every = int(environ.get("KMAP_PROFILE_EVERY", "0"))
+    threshold = environ.get("KMAP_PROFILE_THRESHOLD_MS")
+    tools = [t.strip() for t in environ.get("KMAP_PROFILE_TOOLS", "").split(",") if t.strip()]
+    if not every and threshold is None:
+        every = 1
+    return RequestProfiler(directory, every, None if threshold is None else float(threshold), tools, exclude)
@@ -0,0 +1,168 @@
+"""
+K-Map Solver Server Logging
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Request handlers only put records on a bounded queue; a listener thread
+# formats them as one JSON object per line and writes them to stderr. When
+# stderr is slow or never drained, the listener blocks, the queue fills up
+# and further records are dropped (and counted) instead of stalling the
+# event loop. The next record that gets through carries the drop count.
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and any extra= fields."""
+
+    def format(self, record):
+        entry = {
+            'time': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never waits: records that do not fit are dropped and counted."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only merge the arguments into the message; the listener does the formatting
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        # Handler.handle() holds self.lock here, so the counter needs no lock of its own
+        if self.queue.full():
+            self.dropped += 1
+            return
+        super().emit(record)
+
+    def enqueue(self, record):
+        if self.dropped:
+            record.dropped_records = self.dropped
+        try:
+            self.queue.put_nowait(record)
+            self.dropped = 0
+        except queue.Full:
+            self.dropped += 1
+
+
+class _JsonWriter(object):
+    """Writes records for the listener thread. Not a logging.Handler, so
+    logging.shutdown() at exit never waits on a stream nobody reads."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.formatter = JsonFormatter()
+
+    def handle(self, record):
+        try:
+            self.stream.write(self.formatter.format(record) + '\n')
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+class _Listener(QueueListener):
+
+    def stop(self, timeout=1.0):
+        # Never wait on a writer stuck on a full pipe at exit
+        if self._thread is not None:
+            try:
+                self.enqueue_sentinel()
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class SamplingFilter(logging.Filter):
+    """Let through a fraction of the records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate, seed=None):
+        super().__init__()
+        self.rate = rate
+        self.random = random.Random(seed)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        if self.random.random() < self.rate:
+            record.sample_rate = self.rate
+            return True
+        return False
+
+
+def configure_logging(level=logging.INFO, queue_size=10000, stream=None):
+    """Route the root logger through a bounded queue to a JSON writer thread.
+
+    Returns the queue handler, whose `dropped` attribute counts pending drops."""
+    log_queue = queue.Queue(maxsize=queue_size)
+    listener = _Listener(log_queue, _JsonWriter(stream or sys.stderr))
+    handler = DroppingQueueHandler(log_queue)
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return handler
+
+
+def request_logger(name, rate):
+    """Logger for per-request records, sampled at the given rate."""
+    logger = logging.getLogger(name)
+    for old in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+        logger.removeFilter(old)
+    logger.addFilter(SamplingFilter(rate))
+    return logger
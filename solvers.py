@@ -22,20 +22,100 @@ with this program; if not, write to the Free Software Foundation, Inc.,
 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
 from helpers import *
-from functools import reduce
+from functools import reduce, lru_cache
+from types import MappingProxyType
+from minimizer import (map_layout, map_to_minterms, prime_implicants, expanded_cover, CoverProblem,
+                       SearchTimeout, term_order, cube_cells, cube_to_term, iter_minimum_covers,
+                       cubes_to_expression)
+from decompose import decompose, embed_cube
+from evaluators import compile_evaluator, compile_word_evaluator
+
+
+class SolveProfile(object):
+    """Wall time, call counts and produced group counts per solve phase, summed over solves."""
+
+    def __init__(self):
+        self.solves = 0
+        self.phases = {}  # name -> [seconds, calls, groups]
+        self.lock = threading.Lock()
+
+    def record(self, phase, seconds, calls, groups):
+        entry = self.phases.setdefault(phase, [0.0, 0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+        entry[2] += groups
+
+    def merge(self, other):
+        with self.lock:
+            self.solves += other.solves
+            for phase, (seconds, calls, groups) in other.phases.items():
+                self.record(phase, seconds, calls, groups)
+
+    def as_dict(self):
+        with self.lock:
+            return {'solves': self.solves,
+                    'phases': {name: {'seconds': s, 'calls': c, 'groups': g}
+                               for name, (s, c, g) in self.phases.items()}}
+
+    def summary(self):
+        data = self.as_dict()
+        total = sum(p['seconds'] for p in data['phases'].values()) or 1.0
+        lines = ['{} solves'.format(data['solves'])]
+        for name, p in data['phases'].items():
+            lines.append('  {:<16} {:>10.3f} ms {:>6.1%} {:>10} calls {:>10} groups'.format(
+                name, p['seconds'] * 1000, p['seconds'] / total, p['calls'], p['groups']))
+        return '\n'.join(lines)
+
+
+_active_profile = ContextVar('kmap_solve_profile', default=None)
+
+
+@contextmanager
+def profile_solves(profile=None):
+    """Record the phases of every solve() in this context (thread or task) into profile."""
+    profile = profile if profile is not None else SolveProfile()
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+def frozen_zones(zones):
+    """Read-only ZONES table, so solvers of one class share nothing mutable."""
+    return MappingProxyType({name: frozenset(cells) for name, cells in zones.items()})
 
 
 class KMapSolver(object):
     NUMBER_OF_VARS = None
-    ZONES = {}
+    ZONES = frozen_zones({})
 
-    def __init__(self, map_data):
+    def __init__(self, map_data, output_forms=('sop',)):
         self.map_data = map_data
+        self.output_forms = output_forms
         self.groups = []
+        self.candidates = None
         self.result_group_set = []
         self.terms = []
         self.result = ''
+        self.complement = None
+        self.pos_result = ''
+
+    @classmethod
+    def shape(cls):
+        cells = set().union(*cls.ZONES.values())
+        return max(i for i, j in cells) + 1, max(j for i, j in cells) + 1
+
+    @classmethod
+    def dependents(cls):
+        """Map each cell to the anchors whose create_group() reads it."""
+        return _dependents(cls)
 
     def create_group(self, i, j):
         size = 0
@@ -168,12 +248,64 @@ class KMapSolver(object):
             result = result.replace(cmpl, '')
         return result.replace('a', 'A\'').replace('b', 'B\'').replace('c', 'C\'').replace('d', 'D\'')
 
+    def phases(self):
+        return (('create_group', self.scan_groups),
+                ('verify_group', self.verify_groups),
+                ('render', self.render_terms))
+
+    def solve_phases(self):
+        if 'pos' in self.output_forms:
+            return self.phases() + (('pos', self.solve_pos),)
+        return self.phases()
+
     def solve(self):
+        profile = _active_profile.get()
+        if profile is None:
+            for _, step in self.solve_phases():
+                step()
+            return
+
+        run = SolveProfile()
+        run.solves = 1
+        for phase, step in self.solve_phases():
+            start = perf_counter()
+            calls, groups = step()
+            run.record(phase, perf_counter() - start, calls, groups)
+        profile.merge(run)
+
+    def scan_groups(self):
+        self.candidates = {}
+        found = 0
         for i, row in enumerate(self.map_data):
             for j, elem in enumerate(row):
-                for group in self.create_group(i, j):
-                    self.verify_group(group)
-
+                self.candidates[(i, j)] = groups = self.create_group(i, j)
+                found += len(groups)
+        return len(self.candidates), found
+
+    def update_cell(self, i, j, value):
+        """Change one cell of a solved map, re-deriving only the groups that can see it."""
+        self.map_data[i][j] = value
+        if self.candidates is None:
+            return self.solve()
+        for anchor in self.dependents()[(i, j)]:
+            self.candidates[anchor] = self.create_group(*anchor)
+        self.verify_groups()
+        self.render_terms()
+        if self.complement is not None:
+            self.complement.update_cell(i, j, COMPLEMENT[value])
+            self.pos_result = pos_from_terms(self.complement.terms)
+
+    def verify_groups(self):
+        self.result_group_set = []
+        checked = 0
+        for groups in self.candidates.values():
+            for group in groups:
+                self.verify_group(group)
+                checked += 1
+        return checked, len(self.result_group_set)
+
+    def render_terms(self):
+        self.terms = []
         for x in self.result_group_set:
             self.terms.append(self.group_to_term(x))
 
@@ -186,36 +318,233 @@ class KMapSolver(object):
                     self.terms.append('1')
 
         self.result =  reduce(lambda p, q: (p+' + '+q), self.terms, '0').replace('0 + ', '')
+        return len(self.result_group_set), len(self.terms)
+
+    def solve_pos(self):
+        """Product of sums: the SOP of the OFF-set (don't cares kept) complemented by De Morgan."""
+        if self.complement is None:
+            self.complement = type(self)(complement_map(self.map_data))
+        else:
+            self.complement.map_data = complement_map(self.map_data)
+        for _, step in self.complement.phases():
+            step()
+        self.pos_result = pos_from_terms(self.complement.terms)
+        return 1, len(self.complement.terms)
 
     def get_result(self):
         return self.result
 
+    def get_pos_result(self):
+        return self.pos_result
+
+
+class _RecordingRow(list):
+    def __init__(self, i, values, reads):
+        super().__init__(values)
+        self.i = i
+        self.reads = reads
+
+    def __getitem__(self, j):
+        self.reads.add((self.i, j % len(self)))
+        return list.__getitem__(self, j)
+
+
+@lru_cache(maxsize=None)
+def _dependents(solver_class):
+    # On an all-ones map create_group() tries every shape, so the cells it
+    # reads there are every cell that can influence the groups of that anchor.
+    rows, cols = solver_class.shape()
+    dependents = {(i, j): [] for i in range(rows) for j in range(cols)}
+    for i in range(rows):
+        for j in range(cols):
+            reads = set()
+            probe = solver_class([_RecordingRow(r, [1] * cols, reads) for r in range(rows)])
+            probe.create_group(i, j)
+            for cell in reads:
+                dependents[cell].append((i, j))
+    return MappingProxyType({cell: tuple(sorted(anchors)) for cell, anchors in dependents.items()})
+
 
 class KMapSolver2(KMapSolver):
     NUMBER_OF_VARS = 2
-    ZONES = {'A': {(1, 0), (1, 1)},
-             'a': {(0, 0), (0, 1)},
-             'B': {(0, 1), (1, 1)},
-             'b': {(0, 0), (1, 0)},}
+    ZONES = frozen_zones({'A': {(1, 0), (1, 1)},
+                          'a': {(0, 0), (0, 1)},
+                          'B': {(0, 1), (1, 1)},
+                          'b': {(0, 0), (1, 0)},})
 
 
 class KMapSolver3(KMapSolver):
     NUMBER_OF_VARS = 3
-    ZONES = {'A': {(1, 0), (1, 1), (1, 2), (1, 3)},
-             'a': {(0, 0), (0, 1), (0, 2), (0, 3)},
-             'B': {(0, 2), (0, 3), (1, 2), (1, 3)},
-             'b': {(0, 0), (0, 1), (1, 0), (1, 1)},
-             'C': {(0, 1), (0, 2), (1, 1), (1, 2)},
-             'c': {(0, 0), (1, 0), (0, 3), (1, 3)}}
+    ZONES = frozen_zones({'A': {(1, 0), (1, 1), (1, 2), (1, 3)},
+                          'a': {(0, 0), (0, 1), (0, 2), (0, 3)},
+                          'B': {(0, 2), (0, 3), (1, 2), (1, 3)},
+                          'b': {(0, 0), (0, 1), (1, 0), (1, 1)},
+                          'C': {(0, 1), (0, 2), (1, 1), (1, 2)},
+                          'c': {(0, 0), (1, 0), (0, 3), (1, 3)}})
 
 
 class KMapSolver4(KMapSolver):
     NUMBER_OF_VARS = 4
-    ZONES = {'A': {(2, 0), (2, 1), (2, 2), (2, 3), (3, 0), (3, 1), (3, 2), (3, 3)},
-             'a': {(0, 0), (0, 1), (0, 2), (0, 3), (1, 0), (1, 1), (1, 2), (1, 3)},
-             'B': {(1, 0), (1, 1), (1, 2), (1, 3), (2, 0), (2, 1), (2, 2), (2, 3)},
-             'b': {(0, 0), (0, 1), (0, 2), (0, 3), (3, 0), (3, 1), (3, 2), (3, 3)},
-             'C': {(0, 2), (1, 2), (2, 2), (3, 2), (0, 3), (1, 3), (2, 3), (3, 3)},
-             'c': {(0, 0), (1, 0), (2, 0), (3, 0), (0, 1), (1, 1), (2, 1), (3, 1)},
-             'D': {(0, 1), (1, 1), (2, 1), (3, 1), (0, 2), (1, 2), (2, 2), (3, 2)},
-             'd': {(0, 0), (1, 0), (2, 0), (3, 0), (0, 3), (1, 3), (2, 3), (3, 3)}}
+    ZONES = frozen_zones({'A': {(2, 0), (2, 1), (2, 2), (2, 3), (3, 0), (3, 1), (3, 2), (3, 3)},
+                          'a': {(0, 0), (0, 1), (0, 2), (0, 3), (1, 0), (1, 1), (1, 2), (1, 3)},
+                          'B': {(1, 0), (1, 1), (1, 2), (1, 3), (2, 0), (2, 1), (2, 2), (2, 3)},
+                          'b': {(0, 0), (0, 1), (0, 2), (0, 3), (3, 0), (3, 1), (3, 2), (3, 3)},
+                          'C': {(0, 2), (1, 2), (2, 2), (3, 2), (0, 3), (1, 3), (2, 3), (3, 3)},
+                          'c': {(0, 0), (1, 0), (2, 0), (3, 0), (0, 1), (1, 1), (2, 1), (3, 1)},
+                          'D': {(0, 1), (1, 1), (2, 1), (3, 1), (0, 2), (1, 2), (2, 2), (3, 2)},
+                          'd': {(0, 0), (1, 0), (2, 0), (3, 0), (0, 3), (1, 3), (2, 3), (3, 3)}})
+
+
+class KMapSolverN(KMapSolver):
+    # Past four variables the shapes no longer fit go_right/go_down walks,
+    # so these maps are minimized on cubes and the groups mapped back to cells.
+
+    def __init__(self, map_data, output_forms=('sop',), time_budget_ms=None):
+        super().__init__(map_data, output_forms)
+        self.time_budget_ms = time_budget_ms
+        self.deadline = None
+        self.proven_minimal = None
+        self.budget_used_ms = None
+
+    @classmethod
+    def shape(cls):
+        layout = map_layout(cls.NUMBER_OF_VARS)
+        return len(layout), len(layout[0])
+
+    def phases(self):
+        return (('decompose', self.split_function),
+                ('prime_implicants', self.find_primes),
+                ('cover', self.select_cover),
+                ('render', self.render_terms))
+
+    def split_function(self):
+        # Unused variables are dropped and disjoint OR parts are solved apart
+        self.started = perf_counter()
+        if self.time_budget_ms is not None:
+            self.deadline = self.started + self.time_budget_ms / 1000.0
+        on, dc = map_to_minterms(self.map_data, self.NUMBER_OF_VARS)
+        self.parts = decompose(self.NUMBER_OF_VARS, on, dc)
+        return len(on) + len(dc), len(self.parts)
+
+    def find_primes(self):
+        self.primes = []
+        for part in self.parts:
+            try:
+                self.primes.append(prime_implicants(len(part.variables), part.on, part.dc, self.deadline))
+            except SearchTimeout:
+                # Out of budget, the part is covered by expanding its minterms instead
+                self.primes.append(None)
+        return len(self.parts), sum(len(primes) for primes in self.primes if primes)
+
+    def select_cover(self):
+        n = self.NUMBER_OF_VARS
+        cubes, self.proven_minimal = [], True
+        for part, primes in zip(self.parts, self.primes):
+            if primes is None:
+                cubes.extend(embed_cube(c, part.variables, n)
+                             for c in expanded_cover(len(part.variables), part.on, part.dc))
+                self.proven_minimal = False
+                continue
+            # Greedy cover first, then branch and bound until the deadline, if any
+            problem = CoverProblem(len(part.variables), primes, part.on)
+            cubes.extend(embed_cube(c, part.variables, n) for c in problem.exact(self.deadline))
+            self.proven_minimal = self.proven_minimal and problem.proven_minimal
+        self.cubes = sorted(cubes, key=lambda c: term_order(c, n))
+        self.budget_used_ms = (perf_counter() - self.started) * 1000.0
+        return sum(len(primes) for primes in self.primes if primes), len(self.cubes)
+
+    def solve_pos(self):
+        # The complement gets what is left of the budget; time and proof then cover both forms
+        if self.time_budget_ms is not None:
+            remaining_ms = max(0.0, self.time_budget_ms - (perf_counter() - self.started) * 1000.0)
+            self.complement = type(self)(complement_map(self.map_data), time_budget_ms=remaining_ms)
+        calls, terms = super().solve_pos()
+        self.proven_minimal = self.proven_minimal and self.complement.proven_minimal
+        self.budget_used_ms = (perf_counter() - self.started) * 1000.0
+        return calls, terms
+
+    def render_terms(self):
+        n = self.NUMBER_OF_VARS
+        self.result_group_set = [cube_cells(c, n) for c in self.cubes]
+        self.terms = [cube_to_term(c, n) for c in self.cubes]
+        self.result = ' + '.join(self.terms) or '0'
+        return len(self.cubes), len(self.terms)
+
+    def update_cell(self, i, j, value):
+        self.map_data[i][j] = value
+        self.solve()
+
+
+class KMapSolver5(KMapSolverN):
+    NUMBER_OF_VARS = 5
+
+
+class KMapSolver6(KMapSolverN):
+    NUMBER_OF_VARS = 6
+
+
+SOLVER_CLASSES = MappingProxyType({2: KMapSolver2, 3: KMapSolver3, 4: KMapSolver4,
+                                   5: KMapSolver5, 6: KMapSolver6})
+
+
+@lru_cache(maxsize=None)
+def cube_solver_class(num_vars):
+    """Cube engine for any map size; it alone honours a time budget and proves minimality."""
+    if num_vars > 4:
+        return SOLVER_CLASSES[num_vars]
+    return type('KMapSolverN{}'.format(num_vars), (KMapSolverN,), {'NUMBER_OF_VARS': num_vars})
+
+
+class SolveResult(namedtuple('SolveResult', 'expression terms groups pos proven_minimal num_vars',
+                             defaults=(None,))):
+    __slots__ = ()
+
+    def evaluator(self):
+        """Cached compiled function of a minterm index giving the value of the result."""
+        return compile_evaluator(self.expression, self.num_vars)
+
+    def word_evaluator(self):
+        """Cached compiled function of packed uint64 input columns (see evaluators.pack_columns)."""
+        return compile_word_evaluator(self.expression, self.num_vars)
+
+
+class MapSolver(object):
+    """Reentrant front end: holds only immutable settings, every solve() works on its own state.
+
+    One instance can be shared by any number of threads."""
+
+    def __init__(self, num_vars, output_forms=('sop',), time_budget_ms=None):
+        self.num_vars = num_vars
+        self.output_forms = tuple(output_forms)
+        self.time_budget_ms = time_budget_ms
+        if time_budget_ms is None:
+            self.solver_class = SOLVER_CLASSES[num_vars]
+        else:
+            self.solver_class = cube_solver_class(num_vars)
+
+    def solve(self, map_data):
+        # The solver reads the map only, so a tuple copy guards against callers editing it mid-solve
+        map_data = tuple(tuple(row) for row in map_data)
+        if self.time_budget_ms is None:
+            solver = self.solver_class(map_data, self.output_forms)
+        else:
+            solver = self.solver_class(map_data, self.output_forms, self.time_budget_ms)
+        solver.solve()
+        return SolveResult(solver.get_result(),
+                           tuple(solver.terms),
+                           tuple(tuple(group) for group in solver.result_group_set),
+                           solver.get_pos_result() if 'pos' in self.output_forms else None,
+                           getattr(solver, 'proven_minimal', None),
+                           self.num_vars)
+
+
+def solve_map(map_data, num_vars, output_forms=('sop',), time_budget_ms=None):
+    """Solve a K-Map without touching any shared state, returning a SolveResult."""
+    return MapSolver(num_vars, output_forms, time_budget_ms).solve(map_data)
+
+
+def iter_minimal_solutions(map_data, num_vars):
+    """Yield every minimum SOP expression of a map, computing each one only when asked for."""
+    on, dc = map_to_minterms(map_data, num_vars)
+    for cubes in iter_minimum_covers(num_vars, on, dc):
+        yield cubes_to_expression(cubes, num_vars)
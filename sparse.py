@@ -0,0 +1,213 @@
+"""
+K-Map Solver Sparse Function Container
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# ON and don't care sets are kept as sorted arrays of 32-bit minterm
+# indexes, so memory follows the number of specified minterms rather than
+# 2**num_vars. With NumPy installed the arrays are viewed as uint32 without
+# copying and unions, cofactors and batch lookups run vectorized.
+
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from time import perf_counter
+
+from bdd import EXPLICIT_MEMORY_LIMIT, explicit_memory, minimize_implicit
+from decompose import DECOMPOSE_TABLE_MAX_VARS, Subproblem, decompose, embed_cube
+from minimizer import cube_minterms, minimize_within, iter_minimum_covers, term_order
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+MAX_VARS = 32
+
+# Below this many minterms the pure Python paths are faster than NumPy's call overhead
+NUMPY_MIN_SIZE = 1024
+
+
+def _sorted_array(minterms):
+    values = sorted(set(minterms))
+    return array(TYPECODE, values)
+
+
+def _contains(values, minterm):
+    k = bisect_left(values, minterm)
+    return k < len(values) and values[k] == minterm
+
+
+def _merge_unique(a, b):
+    out = array(TYPECODE)
+    last = None
+    for m in merge(a, b):
+        if m != last:
+            out.append(m)
+            last = m
+    return out
+
+
+def _difference(a, b):
+    """Sorted a without the members of sorted b."""
+    out = array(TYPECODE)
+    k = 0
+    for m in a:
+        while k < len(b) and b[k] < m:
+            k += 1
+        if k == len(b) or b[k] != m:
+            out.append(m)
+    return out
+
+
+def _as_numpy(values):
+    return np.frombuffer(values, dtype=np.uint32) if len(values) else np.zeros(0, dtype=np.uint32)
+
+
+def _from_numpy(values):
+    return array(TYPECODE, values.astype(np.uint32).tobytes()) if TYPECODE == 'I' else array(TYPECODE, values.tolist())
+
+
+class SparseFunction(object):
+    """Incompletely specified function of num_vars variables as sorted ON and DC minterm arrays."""
+
+    __slots__ = ('num_vars', 'on', 'dc')
+
+    def __init__(self, num_vars, on=(), dc=()):
+        if not 0 <= num_vars <= MAX_VARS:
+            raise ValueError(f"SparseFunction supports up to {MAX_VARS} variables")
+        self.num_vars = num_vars
+        self.on = on if isinstance(on, array) else _sorted_array(on)
+        dc = dc if isinstance(dc, array) else _sorted_array(dc)
+        self.dc = _difference(dc, self.on) if len(dc) and len(self.on) else dc
+        for values in (self.on, self.dc):
+            if len(values) and values[-1] >> num_vars:
+                raise ValueError(f"minterm {values[-1]} is out of range for {num_vars} variables")
+
+    @classmethod
+    def from_cubes(cls, num_vars, on_cubes, dc_cubes=()):
+        on = [m for cube in on_cubes for m in cube_minterms(cube, num_vars)]
+        dc = [m for cube in dc_cubes for m in cube_minterms(cube, num_vars)]
+        return cls(num_vars, on, dc)
+
+    def __repr__(self):
+        return f"SparseFunction({self.num_vars} vars, {len(self.on)} on, {len(self.dc)} dc)"
+
+    def __eq__(self, other):
+        return (isinstance(other, SparseFunction) and self.num_vars == other.num_vars
+                and self.on == other.on and self.dc == other.dc)
+
+    @property
+    def nbytes(self):
+        return (len(self.on) + len(self.dc)) * self.on.itemsize
+
+    def value(self, minterm):
+        """1 for ON, 2 for don't care, 0 for OFF."""
+        if _contains(self.on, minterm):
+            return 1
+        return 2 if _contains(self.dc, minterm) else 0
+
+    def __contains__(self, minterm):
+        return _contains(self.on, minterm)
+
+    def values(self, minterms):
+        """value() of many minterms at once."""
+        if np is None or len(minterms) < NUMPY_MIN_SIZE:
+            return [self.value(m) for m in minterms]
+        minterms = np.asarray(minterms, dtype=np.uint32)
+        result = np.zeros(len(minterms), dtype=np.uint8)
+        for values, code in ((_as_numpy(self.dc), 2), (_as_numpy(self.on), 1)):
+            if len(values):
+                k = np.minimum(np.searchsorted(values, minterms), len(values) - 1)
+                result[values[k] == minterms] = code
+        return result
+
+    def union(self, other):
+        """F + G: ON where either is ON, don't care where neither is ON and one is don't care."""
+        if self.num_vars != other.num_vars:
+            raise ValueError("Functions have different numbers of variables")
+        if np is not None and len(self.on) + len(other.on) >= NUMPY_MIN_SIZE:
+            on = np.union1d(_as_numpy(self.on), _as_numpy(other.on))
+            dc = np.setdiff1d(np.union1d(_as_numpy(self.dc), _as_numpy(other.dc)), on, assume_unique=True)
+            return SparseFunction(self.num_vars, _from_numpy(on), _from_numpy(dc))
+        on = _merge_unique(self.on, other.on)
+        return SparseFunction(self.num_vars, on, _difference(_merge_unique(self.dc, other.dc), on))
+
+    def cofactor(self, variable, value):
+        """Function of the other num_vars - 1 variables with variable (A = 0) fixed to value."""
+        shift = self.num_vars - 1 - variable
+        low = (1 << shift) - 1
+        parts = []
+        for values in (self.on, self.dc):
+            if np is not None and len(values) >= NUMPY_MIN_SIZE:
+                values = _as_numpy(values)
+                chosen = values[(values >> np.uint32(shift)) & np.uint32(1) == value]
+                parts.append(_from_numpy(((chosen >> np.uint32(shift + 1)) << np.uint32(shift)) | (chosen & np.uint32(low))))
+            else:
+                # Dropping the bit keeps the order, so the result is still sorted
+                parts.append(array(TYPECODE, [((m >> (shift + 1)) << shift) | (m & low)
+                                              for m in values if (m >> shift) & 1 == value]))
+        return SparseFunction(self.num_vars - 1, parts[0], parts[1])
+
+    def vacuous_variables(self):
+        """Variables whose two cofactors are equal, ON and don't care alike."""
+        return [v for v in range(self.num_vars) if self.cofactor(v, 0) == self.cofactor(v, 1)]
+
+    def restrict(self, vacuous):
+        """The function over its remaining variables once the vacuous ones are dropped."""
+        f = self
+        for v in sorted(vacuous, reverse=True):
+            f = f.cofactor(v, 0)
+        return f
+
+    def minimize(self, time_budget_ms=None, memory_limit=EXPLICIT_MEMORY_LIMIT):
+        """(cubes, proven_minimal), reading the arrays directly.
+
+        Unused variables are dropped and, up to DECOMPOSE_TABLE_MAX_VARS
+        variables, disjoint OR parts are minimized one by one. Parts whose
+        explicit cube lists would outgrow memory_limit bytes go through the
+        BDD engine, which picks a cover greedily. The budget bounds both engines."""
+        deadline = None if time_budget_ms is None else perf_counter() + time_budget_ms / 1000.0
+        if self.num_vars <= DECOMPOSE_TABLE_MAX_VARS:
+            parts = decompose(self.num_vars, self.on, self.dc)
+        else:
+            vacuous = self.vacuous_variables()
+            reduced = self.restrict(vacuous) if vacuous else self
+            support = tuple(v for v in range(self.num_vars) if v not in vacuous)
+            parts = [Subproblem(support, reduced.on, reduced.dc)] if len(reduced.on) else []
+
+        cubes, proven = [], True
+        for part in parts:
+            num_vars = len(part.variables)
+            remaining = None if deadline is None else max(0.0, (deadline - perf_counter()) * 1000.0)
+            if explicit_memory(num_vars, len(part.on) + len(part.dc)) > memory_limit:
+                cover = minimize_implicit(num_vars, part.on, part.dc, time_budget_ms=remaining)
+                part_cubes, part_proven = cover.cubes, cover.proven_minimal
+            else:
+                part_cubes, part_proven = minimize_within(num_vars, part.on, part.dc, remaining)
+            cubes.extend(embed_cube(cube, part.variables, self.num_vars) for cube in part_cubes)
+            proven = proven and part_proven
+        return sorted(cubes, key=lambda c: term_order(c, self.num_vars)), proven
+
+    def minimum_covers(self):
+        return iter_minimum_covers(self.num_vars, self.on, self.dc)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Exhaustive sweep of KMapSolver4 over every ternary 4x4 map.
+
+The 3**16 = 43,046,721 maps are numbered in base 3, cell (i, j) being digit
+4*i + j (least significant first). The index space is split into chunks
+that a process pool solves independently; each finished chunk is written to
+its own JSON file named after its first and last index, so an interrupted
+sweep resumes where it stopped when run again with the same range and chunk
+size. Chunks swept without --minimality are redone when it is asked for.
+
+Every result is checked against the truth table of its map: it must cover
+the ON-set and avoid the OFF-set. With --minimality the term and literal
+counts are also compared with the exact minimum from the cube minimizer.
+
+    python sweep_kmap4.py --out sweep4 --workers 8
+    python sweep_kmap4.py --out sweep4 --start 0 --stop 1000000   # one shard
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from minimizer import minimize, literal_count
+from solvers import KMapSolver4
+from verifier import map_masks, map_masks_batch, parse_sop, mask_minterms, verify_batch, verify_map
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TOTAL_MAPS = 3 ** 16
+
+
+def verify_maps(maps, results):
+    """Whether each result covers its map, checked in one NumPy batch when available."""
+    if np is None:
+        return [verify_map(map_data, result, 4) for map_data, result in zip(maps, results)]
+    on, dc = map_masks_batch(maps, 4)
+    return verify_batch(on, dc, results, 4).tolist()
+
+
+def sweep_chunk(task):
+    """Solve and check maps [start, stop); write chunk file, return its stats."""
+    start, stop, path, minimality, max_cases = task
+    began = time.perf_counter()
+    failing, non_minimal = [], []
+    failing_count = non_minimal_count = 0
+
+    digits = [0] * 16
+    n = start
+    for k in range(16):
+        n, digits[k] = divmod(n, 3)
+
+    maps, results = [], []
+    for index in range(start, stop):
+        map_data = [digits[0:4], digits[4:8], digits[8:12], digits[12:16]]
+        solver = KMapSolver4(map_data)
+        solver.solve()
+        maps.append(map_data)
+        results.append(solver.get_result())
+
+        # Odometer step to the next map
+        k = 0
+        while k < 16 and digits[k] == 2:
+            digits[k] = 0
+            k += 1
+        if k < 16:
+            digits[k] += 1
+
+    for index, map_data, result, correct in zip(range(start, stop), maps, results, verify_maps(maps, results)):
+        if not correct:
+            failing_count += 1
+            if len(failing) < max_cases:
+                failing.append({'index': index, 'map': map_data, 'result': result})
+        elif minimality:
+            on, dc = map_masks(map_data, 4)
+            cubes = parse_sop(result, 4)
+            cost = (len(cubes), sum(literal_count(c) for c in cubes))
+            best = minimize(4, mask_minterms(on), mask_minterms(dc))
+            best_cost = (len(best), sum(literal_count(c) for c in best))
+            if cost > best_cost:
+                non_minimal_count += 1
+                if len(non_minimal) < max_cases:
+                    non_minimal.append({'index': index, 'map': map_data, 'result': result,
+                                        'cost': cost, 'minimum_cost': best_cost})
+
+    stats = {
+        'start': start,
+        'stop': stop,
+        'maps': stop - start,
+        'seconds': time.perf_counter() - began,
+        'failing': failing_count,
+        'non_minimal': non_minimal_count,
+        'minimality_checked': minimality,
+        'failing_cases': failing,
+        'non_minimal_cases': non_minimal,
+    }
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(stats, f)
+    os.replace(tmp, path)
+    return stats
+
+
+def chunk_ranges(start, stop, chunk_size):
+    return [(s, min(s + chunk_size, stop)) for s in range(start, stop, chunk_size)]
+
+
+def chunk_path(out, start, stop):
+    # Both ends are in the name, so a run with another --chunk-size or --stop
+    # never picks up a partial or overlapping chunk of an earlier plan
+    return os.path.join(out, 'chunk_{:08d}_{:08d}.json'.format(start, stop))
+
+
+def chunk_done(path, minimality):
+    """Whether the chunk file exists and covers the checks asked for."""
+    if not os.path.exists(path):
+        return False
+    if not minimality:
+        return True
+    with open(path) as f:
+        return json.load(f).get('minimality_checked', False)
+
+
+def summarize(out, ranges, wall, workers, swept=0):
+    """Totals over every chunk file of the range; the wall time and swept maps are this run's only."""
+    totals = {'maps': 0, 'seconds': 0.0, 'failing': 0, 'non_minimal': 0}
+    failing, non_minimal = [], []
+    for start, stop in ranges:
+        path = chunk_path(out, start, stop)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            chunk = json.load(f)
+        for key in totals:
+            totals[key] += chunk[key]
+        failing.extend(chunk['failing_cases'])
+        non_minimal.extend(chunk['non_minimal_cases'])
+
+    summary = dict(totals)
+    summary.update({
+        'range': [ranges[0][0], ranges[-1][1]] if ranges else [],
+        'complete': totals['maps'] == sum(stop - start for start, stop in ranges),
+        'workers': workers,
+        'maps_this_run': swept,
+        'wall_seconds_this_run': wall,
+        'maps_per_second_per_core': totals['maps'] / totals['seconds'] if totals['seconds'] else 0.0,
+    })
+    with open(os.path.join(out, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    with open(os.path.join(out, 'failing.json'), 'w') as f:
+        json.dump(failing, f)
+    with open(os.path.join(out, 'non_minimal.json'), 'w') as f:
+        json.dump(non_minimal, f)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exhaustive KMapSolver4 sweep')
+    parser.add_argument('--out', default='sweep4', help='directory for chunk files and the summary')
+    parser.add_argument('--start', type=int, default=0)
+    parser.add_argument('--stop', type=int, default=TOTAL_MAPS)
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--minimality', action='store_true',
+                        help='also compare against the exact minimum (about twice as slow)')
+    parser.add_argument('--max-cases', type=int, default=1000,
+                        help='failing / non-minimal maps kept per chunk')
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    ranges = chunk_ranges(args.start, args.stop, args.chunk_size)
+    tasks = []
+    for start, stop in ranges:
+        path = chunk_path(args.out, start, stop)
+        if not chunk_done(path, args.minimality):
+            tasks.append((start, stop, path, args.minimality, args.max_cases))
+    print(f"{len(tasks)} chunks to sweep, {len(ranges) - len(tasks)} already done")
+
+    began = time.perf_counter()
+    done = swept = 0
+    with multiprocessing.Pool(args.workers) as pool:
+        for stats in pool.imap_unordered(sweep_chunk, tasks):
+            done += 1
+            swept += stats['maps']
+            rate = stats['maps'] / stats['seconds'] if stats['seconds'] else 0.0
+            print(f"[{done}/{len(tasks)}] {stats['start']}-{stats['stop']}: "
+                  f"{rate:,.0f} maps/s/core, {stats['failing']} failing, "
+                  f"{stats['non_minimal']} non-minimal", flush=True)
+
+    summary = summarize(args.out, ranges, time.perf_counter() - began, args.workers, swept)
+    print(f"{summary['maps']:,} maps, {summary['maps_per_second_per_core']:,.0f} maps/s/core, "
+          f"{summary['failing']:,} failing, {summary['non_minimal']:,} non-minimal"
+          f"{'' if summary['complete'] else ' (incomplete range)'}")
+    sys.exit(1 if summary['failing'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Checks for the BDD route of SparseFunction.minimize.
+
+Covers from the implicit primes must cover exactly the ON-set within the
+don't cares, must be minimum whenever they claim to be, and must come back
+within the time budget with a valid, unproven cover when it runs out.
+
+    python test_bdd.py
+"""
+
+import random
+import time
+
+from bdd import BDD, FALSE, minimize_implicit
+from expressions import truth_table
+from minimizer import cube_minterms, literal_count, minimize_within
+from sparse import SparseFunction
+from verifier import mask_minterms
+
+# Time allowed past the budget for building the diagrams and the fallback cover
+BUDGET_SLACK_S = 1.5
+
+
+def cost(cubes):
+    return len(cubes), sum(literal_count(c) for c in cubes)
+
+
+def random_function(rng, num_vars):
+    on = [m for m in range(1 << num_vars) if rng.random() < 0.4]
+    dc = [m for m in range(1 << num_vars) if m not in on and rng.random() < 0.2]
+    return on, dc
+
+
+def assert_cover(cubes, num_vars, on, dc):
+    covered = {m for c in cubes for m in cube_minterms(c, num_vars)}
+    assert set(on) <= covered <= set(on) | set(dc), (num_vars, on, dc, cubes)
+
+
+def test_implicit_covers(seed=4, count=300):
+    rng = random.Random(seed)
+    proven = 0
+    for _ in range(count):
+        num_vars = rng.randint(1, 6)
+        on, dc = random_function(rng, num_vars)
+        cover = minimize_implicit(num_vars, on, dc)
+        assert_cover(cover.cubes, num_vars, on, dc)
+        if cover.proven_minimal:
+            proven += 1
+            assert cost(cover.cubes) == cost(minimize_within(num_vars, on, dc)[0]), (num_vars, on, dc)
+    assert proven, "no cover was proven minimal"
+
+
+def test_essential_primes_are_proven():
+    # Every prime of a sum of disjoint products is essential
+    cover = minimize_implicit(12, mask_minterms(truth_table("AB + C'D + EFG' + H'IJ + KL", 12)))
+    assert cover.proven_minimal and len(cover.cubes) == 5
+
+
+def test_expired_budget_still_covers(seed=8, count=100):
+    rng = random.Random(seed)
+    for _ in range(count):
+        num_vars = rng.randint(1, 7)
+        on, dc = random_function(rng, num_vars)
+        cover = minimize_implicit(num_vars, on, dc, time_budget_ms=0)
+        assert_cover(cover.cubes, num_vars, on, dc)
+        assert not cover.proven_minimal or not on
+
+
+def test_contains():
+    bdd = BDD(4)
+    f = bdd.from_minterms(mask_minterms(truth_table("AB + CD", 4)))
+    for value in range(16):
+        for care in range(16):
+            cube = (value & care, care)
+            inside = all(truth_table("AB + CD", 4) >> m & 1 for m in cube_minterms(cube, 4))
+            assert bdd.contains(f, cube) == inside == (bdd.diff(bdd.cube(cube), f) == FALSE)
+
+
+def test_sparse_bdd_route_honours_budget():
+    rng = random.Random(1)
+    products = []
+    for _ in range(50):
+        chosen = rng.sample(range(18), rng.randint(2, 5))
+        products.append(''.join(chr(65 + v) + ("'" if rng.random() < 0.5 else '') for v in chosen))
+    on = truth_table(' + '.join(products), 18)
+    function = SparseFunction(18, mask_minterms(on))
+    for budget_ms in (50, 300):
+        started = time.perf_counter()
+        cubes, proven = function.minimize(time_budget_ms=budget_ms, memory_limit=0)
+        elapsed = time.perf_counter() - started
+        assert elapsed < budget_ms / 1000.0 + BUDGET_SLACK_S, f"{elapsed:.2f} s for a {budget_ms} ms budget"
+        covered = 0
+        for value, care in cubes:
+            covered |= truth_table(' '.join(chr(65 + v) + ("" if value >> (17 - v) & 1 else "'")
+                                            for v in range(18) if care >> (17 - v) & 1) or '1', 18)
+        assert covered == on and not proven
+
+
+if __name__ == '__main__':
+    test_implicit_covers()
+    test_essential_primes_are_proven()
+    test_expired_budget_still_covers()
+    test_contains()
+    test_sparse_bdd_route_honours_budget()
+    print("BDD checks passed")
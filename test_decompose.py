@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Checks for support reduction and disjoint decomposition.
+
+Decomposed covers must cost exactly what the plain minimizer finds, and a
+wide OR of disjoint products must split into its parts instead of going
+through prime generation over all of its variables.
+
+    python test_decompose.py
+"""
+
+import random
+import time
+
+from decompose import decompose, minimize_decomposed
+from expressions import truth_table
+from minimizer import cube_minterms, literal_count, minimize
+from sparse import SparseFunction
+from verifier import mask_minterms
+
+
+def cost(cubes):
+    return len(cubes), sum(literal_count(c) for c in cubes)
+
+
+def disjoint_function(rng, num_vars):
+    """ON-set of an OR of random functions over a random split of the variables."""
+    variables = list(range(num_vars))
+    rng.shuffle(variables)
+    cut = rng.randint(1, num_vars)
+    on = set()
+    for block in (variables[:cut], variables[cut:]):
+        if not block:
+            continue
+        chosen = {tuple(rng.randint(0, 1) for _ in block) for _ in range(rng.randint(1, 3))}
+        for m in range(1 << num_vars):
+            if tuple(m >> (num_vars - 1 - v) & 1 for v in block) in chosen:
+                on.add(m)
+    return sorted(on)
+
+
+def test_decomposed_covers_are_minimum(seed=3, count=300):
+    rng = random.Random(seed)
+    for _ in range(count):
+        num_vars = rng.randint(1, 7)
+        if rng.random() < 0.5:
+            on = [m for m in range(1 << num_vars) if rng.random() < 0.4]
+        else:
+            on = disjoint_function(rng, num_vars)
+        cubes = minimize_decomposed(num_vars, on)
+        assert {m for c in cubes for m in cube_minterms(c, num_vars)} == set(on)
+        assert cost(cubes) == cost(minimize(num_vars, on)), (num_vars, on)
+
+
+def test_wide_disjoint_or_splits():
+    # Ten two-literal products over 20 variables used to take over a minute in prime generation
+    expression = 'AB+CD+EF+GH+IJ+KL+MN+OP+QR+ST'
+    on = mask_minterms(truth_table(expression))
+    assert [part.variables for part in decompose(20, on)] == [(v, v + 1) for v in range(0, 20, 2)]
+
+    started = time.perf_counter()
+    cubes, proven = SparseFunction(20, on).minimize(time_budget_ms=2000)
+    assert proven and len(cubes) == 10 and all(literal_count(c) == 2 for c in cubes)
+    assert time.perf_counter() - started < 10
+
+
+def test_parity_does_not_split():
+    on = mask_minterms(truth_table('A^B^C^D^E^F^G^H^I^J^K^L'))
+    parts = decompose(12, on)
+    assert len(parts) == 1 and parts[0].variables == tuple(range(12))
+
+
+if __name__ == '__main__':
+    test_decomposed_covers_are_minimum()
+    test_wide_disjoint_or_splits()
+    test_parity_does_not_split()
+    print("Decomposition checks passed")
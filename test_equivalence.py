@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Checks for equivalence checking of submitted expressions.
+
+Reference maps and don't care expressions must combine into one don't care
+mask, and submissions that are not strings must be refused by position.
+The check_equivalence tool is exercised too when the mcp package is installed.
+
+    python test_equivalence.py
+"""
+
+import asyncio
+
+from expressions import check_equivalence_batch, truth_table
+from verifier import map_masks
+
+try:
+    import mcp_server
+except ImportError:
+    mcp_server = None
+
+# ON-set 0, 1, 5, 9, 13, 15 with don't cares 2 and 8
+MAP = [[1, 1, 0, 2],
+       [0, 1, 0, 0],
+       [0, 1, 1, 0],
+       [2, 1, 0, 0]]
+
+
+def tool_text(arguments):
+    result = asyncio.run(mcp_server.check_equivalence_tool(arguments))
+    return result.content[0].text
+
+
+def test_map_dont_cares_combine_with_expression():
+    on, dc = map_masks(MAP, 4)
+    extra = truth_table("A'B'C", 4)
+    # A'B' also covers minterm 3, a don't care only through the expression
+    for submission, with_map, with_both in (("C'D + A'B'C' + ABD", True, True),
+                                            ("A'B' + C'D + ABD", False, True),
+                                            ("C'D + ABD", False, False)):
+        assert check_equivalence_batch(on, [submission], 4, dc)[0].equivalent == with_map, submission
+        assert check_equivalence_batch(on, [submission], 4, dc | extra)[0].equivalent == with_both, submission
+
+
+def test_non_string_submissions_are_refused():
+    for submissions, positions in (([["A"]], "1"), (["A", 3, "B", {"x": 1}], "2, 4")):
+        try:
+            check_equivalence_batch("A", submissions)
+        except ValueError as e:
+            assert str(e).endswith(f"position {positions}"), str(e)
+        else:
+            raise AssertionError(f"{submissions!r} was accepted")
+
+
+def test_tool_dont_cares_with_map_data():
+    if mcp_server is None:
+        return
+    text = tool_text({"map_data": MAP, "num_vars": 4, "dont_cares": "A'B'C",
+                      "submissions": ["A'B' + C'D + ABD", "C'D + ABD"]})
+    assert "1. A'B' + C'D + ABD: equivalent" in text and "2. C'D + ABD: NOT equivalent" in text, text
+    text = tool_text({"reference": "AB + C", "dont_cares": "AB'", "submissions": ["A + C"]})
+    assert "1. A + C: equivalent" in text, text
+
+
+def test_tool_refuses_non_string_submissions():
+    if mcp_server is None:
+        return
+    text = tool_text({"reference": "AB", "submissions": [["A"], "BA", 7]})
+    assert text.startswith("Error: Invalid input.") and "position 1, 3" in text, text
+
+
+if __name__ == '__main__':
+    test_map_dont_cares_combine_with_expression()
+    test_non_string_submissions_are_refused()
+    test_tool_dont_cares_with_map_data()
+    test_tool_refuses_non_string_submissions()
+    print("Equivalence checks passed")
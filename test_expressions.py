@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Checks for expression simplification and its time budget.
+
+Every answer must cover exactly the ON-set of the expression outside the
+don't cares, minimal answers must match the plain minimizer, and a budget
+must bound the whole solve, prime generation included.
+
+    python test_expressions.py
+"""
+
+import random
+import time
+
+from expressions import simplify_expression, truth_table
+from minimizer import VARIABLE_NAMES, expanded_cover, literal_count, minimize, minimize_within
+from solvers import cube_solver_class, solve_map
+from verifier import verify, map_masks
+
+# Time allowed past the budget for the fallback cover and the conversions around the solve
+BUDGET_SLACK_S = 1.5
+
+
+def random_expression(rng, num_vars, terms):
+    products = []
+    for _ in range(terms):
+        chosen = rng.sample(range(num_vars), rng.randint(2, min(5, num_vars)))
+        products.append(''.join(VARIABLE_NAMES[v] + ("'" if rng.random() < 0.5 else '') for v in chosen))
+    return ' + '.join(products)
+
+
+def cost(cubes):
+    return len(cubes), sum(literal_count(c) for c in cubes)
+
+
+def test_simplified_expressions_are_minimum(seed=11, count=200):
+    rng = random.Random(seed)
+    for _ in range(count):
+        num_vars = rng.randint(2, 6)
+        expression = random_expression(rng, num_vars, rng.randint(1, 6))
+        num_vars, result = simplify_expression(expression, num_vars, output_forms=('sop', 'pos'))
+        on = truth_table(expression, num_vars)
+        assert result.proven_minimal
+        assert verify(result.expression, on, 0, num_vars), expression
+        assert truth_table(result.pos, num_vars) == on, expression
+        minterms = [m for m in range(1 << num_vars) if on >> m & 1]
+        assert len(result.terms) == len(minimize(num_vars, minterms)), expression
+
+
+def test_dont_care_expression():
+    num_vars, result = simplify_expression("A'B'C' + AB", dont_cares="AB'C'")
+    on = truth_table("A'B'C' + AB", 3) & ~truth_table("AB'C'", 3)
+    assert verify(result.expression, on, truth_table("AB'C'", 3), 3)
+    assert result.expression == "AB + B'C'"
+
+
+def test_parse_errors():
+    for text, fragment in (("A +", "Unexpected end"), ("(A + B", "Expected ')'"),
+                           ("A $ B", "Unexpected '$'"), ("", "Empty expression")):
+        try:
+            simplify_expression(text)
+        except ValueError as e:
+            assert fragment in str(e), (text, str(e))
+        else:
+            raise AssertionError(f"{text!r} was accepted")
+
+
+def test_expanded_cover_is_a_cover(seed=5, count=300):
+    rng = random.Random(seed)
+    for _ in range(count):
+        num_vars = rng.randint(1, 6)
+        on = [m for m in range(1 << num_vars) if rng.random() < 0.4]
+        dc = [m for m in range(1 << num_vars) if m not in on and rng.random() < 0.2]
+        cubes = expanded_cover(num_vars, on, dc)
+        covered = {m for m in range(1 << num_vars) if any(m & c[1] == c[0] for c in cubes)}
+        assert set(on) <= covered <= set(on) | set(dc)
+        assert cost(cubes) >= cost(minimize_within(num_vars, on, dc)[0])
+
+
+def test_budget_bounds_prime_generation():
+    # Prime generation of this function alone takes minutes
+    expression = random_expression(random.Random(1), 16, 40)
+    for budget_ms in (100, 500):
+        started = time.perf_counter()
+        num_vars, result = simplify_expression(expression, 16, time_budget_ms=budget_ms)
+        elapsed = time.perf_counter() - started
+        assert not result.proven_minimal
+        assert elapsed < budget_ms / 1000.0 + BUDGET_SLACK_S, f"{elapsed:.2f} s for a {budget_ms} ms budget"
+        assert verify(result.expression, truth_table(expression, 16), 0, 16)
+
+
+def test_budget_is_shared_with_pos():
+    expression = random_expression(random.Random(1), 16, 40)
+    started = time.perf_counter()
+    simplify_expression(expression, 16, output_forms=('sop', 'pos'), time_budget_ms=300)
+    assert time.perf_counter() - started < 0.3 + 2 * BUDGET_SLACK_S
+
+
+def test_oversized_cover_is_refused():
+    started = time.perf_counter()
+    try:
+        simplify_expression('A^B^C^D^E^F^G^H^I^J^K^L^M^N^O^P^Q^R^S^T', time_budget_ms=2000, max_terms=4096)
+    except ValueError as e:
+        assert "at least 524288 terms" in str(e)
+    else:
+        raise AssertionError("a 20 variable XOR was solved")
+    assert time.perf_counter() - started < 1.0
+    # The POS of a NAND is the single sum A' + B', its SOP needs no isolated minterm either
+    assert simplify_expression("(AB)'", max_terms=1, output_forms=('sop', 'pos'))[1].pos == "(A' + B')"
+
+
+def test_map_budget_falls_back_to_expanded_cover():
+    rng = random.Random(2)
+    for _ in range(20):
+        map_data = [[rng.choice((0, 1, 1, 2)) for _ in range(8)] for _ in range(8)]
+        result = solve_map(map_data, 6, time_budget_ms=0.001)
+        on, dc = map_masks(map_data, 6)
+        assert verify(result.expression, on, dc, 6)
+
+
+def test_map_budget_covers_pos():
+    rng = random.Random(3)
+    for _ in range(20):
+        map_data = [[rng.choice((0, 1, 1, 2)) for _ in range(8)] for _ in range(8)]
+        solver = cube_solver_class(6)(map_data, ('sop', 'pos'), 0.001)
+        started = time.perf_counter()
+        solver.solve()
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        assert solver.budget_used_ms <= elapsed_ms and not solver.proven_minimal
+        assert not solver.complement.proven_minimal and solver.complement.time_budget_ms < 0.001
+        on, dc = map_masks(map_data, 6)
+        off = ((1 << 64) - 1) & ~(on | dc)
+        assert verify(solver.get_result(), on, dc, 6)
+        assert truth_table(solver.get_pos_result(), 6) & off == 0
+        assert on & ~truth_table(solver.get_pos_result(), 6) == 0
+
+
+if __name__ == '__main__':
+    test_simplified_expressions_are_minimum()
+    test_dont_care_expression()
+    test_parse_errors()
+    test_expanded_cover_is_a_cover()
+    test_budget_bounds_prime_generation()
+    test_budget_is_shared_with_pos()
+    test_oversized_cover_is_refused()
+    test_map_budget_falls_back_to_expanded_cover()
+    test_map_budget_covers_pos()
+    print("Expression checks passed")
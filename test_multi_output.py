@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Checks for shared multi-output minimization.
+
+Each output's cover must stay inside its ON and don't care sets, products
+must be shared where the exact search shares them, and a time budget must
+bound the search with a valid cover when it runs out.
+
+    python test_multi_output.py
+"""
+
+import random
+import time
+
+from minimizer import cube_minterms, minimize, minimize_multi, minimize_multi_within
+
+# Time allowed past the budget for the fallback cover
+BUDGET_SLACK_S = 0.5
+
+
+def random_functions(rng, num_vars, outputs, density=0.5):
+    functions = []
+    for _ in range(outputs):
+        on = [m for m in range(1 << num_vars) if rng.random() < density]
+        dc = [m for m in range(1 << num_vars) if m not in on and rng.random() < 0.1]
+        functions.append((on, dc))
+    return functions
+
+
+def assert_covers(num_vars, functions, covers):
+    for (on, dc), cubes in zip(functions, covers):
+        covered = {m for c in cubes for m in cube_minterms(c, num_vars)}
+        assert set(on) <= covered <= set(on) | set(dc), (num_vars, functions)
+
+
+def test_shared_covers_are_valid(seed=2, count=200):
+    rng = random.Random(seed)
+    for _ in range(count):
+        num_vars = rng.randint(1, 5)
+        functions = random_functions(rng, num_vars, rng.randint(1, 3))
+        covers, proven = minimize_multi_within(num_vars, functions)
+        assert proven
+        assert_covers(num_vars, functions, covers)
+        # Shared products never cost more distinct terms than separate minimum covers
+        separate = {c for on, dc in functions for c in minimize(num_vars, on, dc)}
+        assert len({c for cubes in covers for c in cubes}) <= len(separate)
+
+
+def test_single_output_matches_minimize():
+    rng = random.Random(6)
+    for _ in range(100):
+        num_vars = rng.randint(1, 5)
+        functions = random_functions(rng, num_vars, 1)
+        on, dc = functions[0]
+        assert len(minimize_multi(num_vars, functions)[0]) == len(minimize(num_vars, on, dc))
+
+
+def test_budget_bounds_shared_search(seed=9, count=40):
+    # Several of these 6-input, 3-output functions take over 20 s without a budget
+    rng = random.Random(seed)
+    for _ in range(count):
+        functions = random_functions(rng, 6, 3)
+        started = time.perf_counter()
+        covers, proven = minimize_multi_within(6, functions, time_budget_ms=200)
+        elapsed = time.perf_counter() - started
+        assert elapsed < 0.2 + BUDGET_SLACK_S, f"{elapsed:.2f} s for a 200 ms budget"
+        assert_covers(6, functions, covers)
+
+
+def test_expired_prime_generation_still_covers():
+    rng = random.Random(12)
+    for _ in range(20):
+        functions = random_functions(rng, 7, 4)
+        covers, proven = minimize_multi_within(7, functions, time_budget_ms=0)
+        assert not proven
+        assert_covers(7, functions, covers)
+
+
+if __name__ == '__main__':
+    test_shared_covers_are_valid()
+    test_single_output_matches_minimize()
+    test_budget_bounds_shared_search()
+    test_expired_prime_generation_still_covers()
+    print("Multi-output checks passed")
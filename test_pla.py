@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Checks for PLA minimization and its per-file time budget.
+
+Written covers must match the function of the source file, and a budget
+must bound shared minimization with a valid, unproven cover when it runs out.
+
+    python test_pla.py
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from pla import PLAReader, minimize_pla, read_functions
+
+# Time allowed past the budget for reading, verifying and writing the file
+BUDGET_SLACK_S = 1.0
+
+
+def write_random_pla(path, rng, num_inputs, num_outputs):
+    with open(path, 'w') as f:
+        f.write(f".i {num_inputs}\n.o {num_outputs}\n.type fd\n")
+        for m in range(1 << num_inputs):
+            part = ''.join(rng.choice('0011-') for _ in range(num_outputs))
+            f.write(f"{m:0{num_inputs}b} {part}\n")
+        f.write(".e\n")
+
+
+def assert_same_function(source, target):
+    with open(source) as f:
+        expected = read_functions(PLAReader(f))
+    with open(target) as f:
+        written = read_functions(PLAReader(f))
+    for (on, dc), (cover, _) in zip(expected, written):
+        assert cover & ~(on | dc) == 0 and on & ~cover == 0, source
+
+
+def test_budget_bounds_shared_minimization(seed=9, count=10):
+    # Shared minimization of several of these takes over 20 s without a budget
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as out:
+        source, target = os.path.join(out, 'in.pla'), os.path.join(out, 'out.pla')
+        for _ in range(count):
+            write_random_pla(source, rng, 6, 3)
+            started = time.perf_counter()
+            stats = minimize_pla(source, target, time_budget_ms=200)
+            elapsed = time.perf_counter() - started
+            assert elapsed < 0.2 + BUDGET_SLACK_S, f"{elapsed:.2f} s for a 200 ms budget"
+            assert_same_function(source, target)
+            assert stats['seconds'] <= elapsed
+
+
+def test_small_files_are_proven(seed=4, count=20):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as out:
+        source, target = os.path.join(out, 'in.pla'), os.path.join(out, 'out.pla')
+        for _ in range(count):
+            write_random_pla(source, rng, rng.randint(1, 4), rng.randint(1, 3))
+            for shared in (True, False):
+                assert minimize_pla(source, target, shared)['proven_minimal']
+                assert_same_function(source, target)
+
+
+def test_wide_file_under_budget():
+    with tempfile.TemporaryDirectory() as out:
+        source, target = os.path.join(out, 'in.pla'), os.path.join(out, 'out.pla')
+        with open(source, 'w') as f:
+            f.write(".i 34\n.o 2\n.type fd\n1-0" + "-" * 31 + " 10\n" + "-" * 33 + "1 01\n.e\n")
+        stats = minimize_pla(source, target, time_budget_ms=0.001)
+        assert stats['products_out'] == 2
+        with open(target) as f:
+            assert sorted(line.split()[0] for line in f if line[0] in '01-') == \
+                sorted(["1-0" + "-" * 31, "-" * 33 + "1"])
+
+
+if __name__ == '__main__':
+    test_budget_bounds_shared_minimization()
+    test_small_files_are_proven()
+    test_wide_file_under_budget()
+    print("PLA checks passed")
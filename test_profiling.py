@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Checks for request profiling.
+
+Overlapping captures must not fail a request or leave tracemalloc running,
+and a profiling hook owned by another tool must only skip the capture.
+
+    python test_profiling.py
+"""
+
+import asyncio
+import cProfile
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from request_profiling import RequestProfiler
+
+
+async def answer(name, arguments):
+    await asyncio.sleep(0.05)
+    return name
+
+
+def test_overlapping_captures_are_skipped():
+    with tempfile.TemporaryDirectory() as out:
+        profiler = RequestProfiler(out, every=1)
+
+        async def overlap():
+            return await asyncio.gather(*(profiler.run('tool', {}, answer) for _ in range(4)))
+
+        assert asyncio.run(overlap()) == ['tool'] * 4
+        assert profiler.captures == 1 and profiler.skipped == 3
+        assert not profiler.capturing and not tracemalloc.is_tracing()
+        assert len(os.listdir(out)) == 3
+
+
+class BusyProfile(object):
+    """Fails like cProfile.Profile.enable() on 3.12+ while another tool holds the hook."""
+
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+    def disable(self):
+        pass
+
+
+def test_busy_profiling_hook_skips_capture():
+    with tempfile.TemporaryDirectory() as out:
+        profiler = RequestProfiler(out, every=1)
+        original = cProfile.Profile
+        if hasattr(sys, 'monitoring'):
+            sys.monitoring.use_tool_id(sys.monitoring.PROFILER_ID, "other profiler")
+        else:
+            cProfile.Profile = BusyProfile
+        try:
+            result, stem = asyncio.run(profiler.capture('tool', {}, answer, "sample"))
+        finally:
+            if hasattr(sys, 'monitoring'):
+                sys.monitoring.free_tool_id(sys.monitoring.PROFILER_ID)
+            else:
+                cProfile.Profile = original
+        assert result == 'tool' and stem is None and profiler.skipped == 1
+        assert not profiler.capturing and not tracemalloc.is_tracing()
+
+        assert asyncio.run(profiler.run('tool', {}, answer)) == 'tool'
+        assert profiler.captures == 1
+
+
+if __name__ == '__main__':
+    test_overlapping_captures_are_skipped()
+    test_busy_profiling_hook_skips_capture()
+    print("Profiling checks passed")
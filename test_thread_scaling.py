@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Thread-safety and scaling check for the stateless solve API.
+
+Many threads share one MapSolver per map size and every answer must match
+the single-threaded one. On a free-threaded (no-GIL) CPython build the
+throughput must also grow close to linearly with the thread count; with
+the GIL the speedups are only printed.
+
+    python test_thread_scaling.py
+    python3.13t test_thread_scaling.py
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+from solvers import MapSolver
+
+SHAPES = {2: (2, 2), 3: (2, 4), 4: (4, 4), 5: (4, 8), 6: (8, 8)}
+MIN_EFFICIENCY = 0.7  # speedup / threads required without a GIL
+
+
+def make_maps(seed=7):
+    rng = random.Random(seed)
+    maps = []
+    for num_vars, count in ((2, 50), (3, 100), (4, 400), (5, 20), (6, 5)):
+        rows, cols = SHAPES[num_vars]
+        for _ in range(count):
+            maps.append((num_vars, [rng.choices((0, 1, 2), (0.45, 0.45, 0.10), k=cols) for _ in range(rows)]))
+    return maps
+
+
+def gil_enabled():
+    check = getattr(sys, '_is_gil_enabled', None)
+    return True if check is None else check()
+
+
+def run_threads(solvers, maps, threads, rounds):
+    """Every thread solves all maps `rounds` times; returns (seconds, results per thread)."""
+    results = [None] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(k):
+        barrier.wait()
+        out = []
+        for _ in range(rounds):
+            out = [solvers[num_vars].solve(map_data) for num_vars, map_data in maps]
+        results[k] = out
+
+    workers = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start, results
+
+
+def test_shared_solver_is_thread_safe():
+    maps = make_maps()
+    solvers = {n: MapSolver(n, ('sop', 'pos')) for n in SHAPES}
+    expected = [solvers[n].solve(m) for n, m in maps]
+    _, results = run_threads(solvers, maps, 8, 1)
+    for out in results:
+        assert out == expected
+
+
+def test_thread_scaling(max_threads=None, rounds=3):
+    maps = make_maps()
+    solvers = {n: MapSolver(n) for n in SHAPES}
+    max_threads = max_threads or min(os.cpu_count() or 1, 8)
+    free_threaded = not gil_enabled()
+
+    base, _ = run_threads(solvers, maps, 1, rounds)
+    print(f"{'threads':>8}{'seconds':>10}{'speedup':>10}  ({'free-threaded' if free_threaded else 'GIL'} build)")
+    threads = 1
+    while threads <= max_threads:
+        elapsed, _ = run_threads(solvers, maps, threads, rounds)
+        speedup = threads * base / elapsed
+        print(f"{threads:>8}{elapsed:>10.3f}{speedup:>10.2f}")
+        if free_threaded:
+            assert speedup >= MIN_EFFICIENCY * threads, f"{threads} threads only gave a {speedup:.2f}x speedup"
+        threads *= 2
+
+
+if __name__ == '__main__':
+    test_shared_solver_is_thread_safe()
+    print("Shared MapSolver gave identical results on 8 threads")
+    test_thread_scaling()
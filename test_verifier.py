@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Checks for the bit-parallel verifier.
+
+verify() must agree with evaluating the result minterm by minterm, and the
+NumPy batch must agree with verify() pair by pair, flagging results that do
+not parse instead of failing the whole batch.
+
+    python test_verifier.py
+"""
+
+import os
+import random
+import tempfile
+
+from minimizer import cube_to_term
+from solvers import solve_map
+from sweep_kmap4 import chunk_path, chunk_ranges, summarize, sweep_chunk, verify_maps
+from verifier import compile_expression, map_masks, map_masks_batch, verify, verify_batch, verify_map
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SHAPES = {2: (2, 2), 3: (2, 4), 4: (4, 4), 5: (4, 8), 6: (8, 8)}
+
+
+def random_map(rng, num_vars):
+    rows, cols = SHAPES[num_vars]
+    return [[rng.choice((0, 1, 1, 2)) for _ in range(cols)] for _ in range(rows)]
+
+
+def random_sop(rng, num_vars):
+    cubes = []
+    for _ in range(rng.randint(0, 4)):
+        care = rng.randrange(1 << num_vars)
+        cubes.append((rng.randrange(1 << num_vars) & care, care))
+    return ' + '.join(cube_to_term(c, num_vars) for c in cubes) or '0'
+
+
+def test_verify_matches_evaluation(seed=3, count=500):
+    rng = random.Random(seed)
+    for _ in range(count):
+        num_vars = rng.randint(2, 6)
+        map_data = random_map(rng, num_vars)
+        sop = random_sop(rng, num_vars)
+        on, dc = map_masks(map_data, num_vars)
+        table = compile_expression(sop, num_vars)
+        expected = all((table >> m & 1) or not on >> m & 1 for m in range(1 << num_vars)) and \
+            all(not table >> m & 1 or (on | dc) >> m & 1 for m in range(1 << num_vars))
+        assert verify(sop, on, dc, num_vars) == expected == verify_map(map_data, sop, num_vars), sop
+
+
+def test_batch_matches_verify(seed=5, count=400):
+    if np is None:
+        return
+    rng = random.Random(seed)
+    for num_vars in (2, 3, 4, 5, 6):
+        maps = [random_map(rng, num_vars) for _ in range(count)]
+        results = [solve_map(m, num_vars).expression if rng.random() < 0.5 else random_sop(rng, num_vars)
+                   for m in maps]
+        results[0] = "A +"
+        on, dc = map_masks_batch(maps, num_vars)
+        batch = verify_batch(on, dc, results, num_vars).tolist()
+        assert batch == [verify_map(m, r, num_vars) for m, r in zip(maps, results)]
+        assert not batch[0]
+        # Compiled uint64 tables are accepted in place of strings
+        tables = np.array([compile_expression(r, num_vars) for r in results[1:]], dtype=np.uint64)
+        assert verify_batch(on[1:], dc[1:], tables, num_vars).tolist() == batch[1:]
+
+
+def test_sweep_chunk_verifies_every_map():
+    rng = random.Random(9)
+    maps = [random_map(rng, 4) for _ in range(200)]
+    results = [solve_map(m, 4).expression for m in maps]
+    results[10] = "A'B"
+    checks = verify_maps(maps, results)
+    assert checks == [verify_map(m, r, 4) for m, r in zip(maps, results)] and not checks[10]
+
+    with tempfile.TemporaryDirectory() as out:
+        stats = sweep_chunk((1000, 1500, os.path.join(out, 'chunk.json'), True, 10))
+    assert stats['maps'] == 500 and stats['failing'] == 0
+
+
+def test_summary_separates_this_run():
+    with tempfile.TemporaryDirectory() as out:
+        ranges = chunk_ranges(0, 600, 300)
+        sweep_chunk((0, 300, chunk_path(out, 0, 300), False, 10))
+        stats = sweep_chunk((300, 600, chunk_path(out, 300, 600), False, 10))
+        summary = summarize(out, ranges, stats['seconds'], 1, stats['maps'])
+    assert summary['complete'] and summary['maps'] == 600
+    assert summary['maps_this_run'] == 300 and summary['wall_seconds_this_run'] < summary['seconds']
+
+
+if __name__ == '__main__':
+    test_verify_matches_evaluation()
+    test_batch_matches_verify()
+    test_sweep_chunk_verifies_every_map()
+    test_summary_separates_this_run()
+    print("Verifier checks passed")
@@ -0,0 +1,194 @@
+"""
+K-Map Solver Result Verification
+
+This project is based on the original KMapSolver by salmanmorshed:
+https://github.com/salmanmorshed/KMapSolver
+
+Original Copyright (C) salmanmorshed
+This enhanced version adds GPT-4o integration and MCP server capabilities.
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along
+with this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+# Truth tables are Python ints with bit m set when minterm m is in the set,
+# so a product term compiles to one AND per literal over whole tables and a
+# check is two ANDs against the ON and OFF sets of the map.
+
+from functools import lru_cache
+
+from minimizer import VARIABLE_NAMES, map_layout, mask_minterms, minterms_mask
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@lru_cache(maxsize=None)
+def variable_masks(num_vars):
+    """Truth table of each plain variable, A first."""
+    size = 1 << num_vars
+    masks = []
+    for v in range(num_vars):
+        stride = 1 << (num_vars - 1 - v)
+        block = ((1 << stride) - 1) << stride  # stride zeros then stride ones
+        pattern = block
+        width = 2 * stride
+        while width < size:
+            pattern |= pattern << width
+            width *= 2
+        masks.append(pattern)
+    return tuple(masks)
+
+
+def full_mask(num_vars):
+    return (1 << (1 << num_vars)) - 1
+
+
+def cube_mask(cube, num_vars):
+    value, care = cube
+    full = full_mask(num_vars)
+    mask = full
+    for v, var_mask in enumerate(variable_masks(num_vars)):
+        bit = 1 << (num_vars - 1 - v)
+        if care & bit:
+            mask &= var_mask if value & bit else full ^ var_mask
+    return mask
+
+
+def parse_sop(expression, num_vars, names=VARIABLE_NAMES):
+    """Cubes of a rendered sum of products such as "A'B + CD" (also "0" and "1")."""
+    expression = expression.replace('’', '\'').strip()
+    if expression == '0':
+        return []
+    cubes = []
+    for term in expression.split('+'):
+        term = term.strip()
+        value = care = 0
+        if term != '1':
+            k = 0
+            while k < len(term):
+                v = names.find(term[k])
+                if v < 0 or v >= num_vars:
+                    raise ValueError(f"Unexpected '{term[k]}' in term '{term}'")
+                bit = 1 << (num_vars - 1 - v)
+                negated = term[k + 1:k + 2] == '\''
+                if care & bit and bool(value & bit) == negated:
+                    value = care = -1  # x and x' together, the term is empty
+                    break
+                care |= bit
+                if not negated:
+                    value |= bit
+                k += 2 if negated else 1
+            if not term:
+                raise ValueError(f"Empty term in '{expression}'")
+        if care >= 0:
+            cubes.append((value, care))
+    return cubes
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression, num_vars):
+    return compile_sop(parse_sop(expression, num_vars), num_vars)
+
+
+def compile_sop(sop, num_vars):
+    """Truth table of a sum of products given as a string or an iterable of cubes."""
+    if isinstance(sop, str):
+        return compile_expression(sop, num_vars)
+    cover = 0
+    for cube in sop:
+        cover |= cube_mask(cube, num_vars)
+    return cover
+
+
+def map_masks(map_data, num_vars):
+    """(ON, don't care) truth tables of a K-Map in its Gray-code layout."""
+    on = dc = 0
+    for row, indexes in zip(map_data, map_layout(num_vars)):
+        for value, index in zip(row, indexes):
+            if value == 1:
+                on |= 1 << index
+            elif value == 2:
+                dc |= 1 << index
+    return on, dc
+
+
+def check_cover(cover, on, dc):
+    """(ON minterms left uncovered, OFF minterms wrongly covered), both 0 when correct."""
+    return on & ~cover, cover & ~(on | dc)
+
+
+def verify(sop, on, dc, num_vars):
+    missing, extra = check_cover(compile_sop(sop, num_vars), on, dc)
+    return not missing and not extra
+
+
+def verify_map(map_data, result, num_vars):
+    on, dc = map_masks(map_data, num_vars)
+    try:
+        return verify(result, on, dc, num_vars)
+    except ValueError:
+        return False
+
+
+def _require_numpy(num_vars):
+    if np is None:
+        raise RuntimeError("NumPy is required for batched verification")
+    if num_vars > 6:
+        raise ValueError("Batched verification packs a truth table into one uint64 (6 variables at most)")
+
+
+def map_masks_batch(maps, num_vars):
+    """(ON, don't care) uint64 truth tables of an (N, rows, cols) array of maps."""
+    _require_numpy(num_vars)
+    maps = np.asarray(maps, dtype=np.uint8)
+    weights = np.array(map_layout(num_vars), dtype=np.uint64)
+    weights = np.left_shift(np.uint64(1), weights)
+    on = np.bitwise_or.reduce(np.where(maps == 1, weights, np.uint64(0)), axis=(1, 2))
+    dc = np.bitwise_or.reduce(np.where(maps == 2, weights, np.uint64(0)), axis=(1, 2))
+    return on, dc
+
+
+def compile_batch(results, num_vars):
+    """uint64 truth tables of many result strings, compiling each distinct string once."""
+    _require_numpy(num_vars)
+    compiled = {}
+    covers, valid = [], []
+    for expression in results:
+        entry = compiled.get(expression)
+        if entry is None:
+            try:
+                entry = compiled[expression] = (compile_expression(expression, num_vars), True)
+            except ValueError:
+                entry = compiled[expression] = (0, False)
+        covers.append(entry[0])
+        valid.append(entry[1])
+    return np.array(covers, dtype=np.uint64), np.array(valid, dtype=bool)
+
+
+def verify_batch(on, dc, results, num_vars):
+    """Boolean array, True where results[k] is a correct cover of (on[k], dc[k]).
+
+    results may be strings or uint64 truth tables."""
+    _require_numpy(num_vars)
+    on = np.asarray(on, dtype=np.uint64)
+    dc = np.asarray(dc, dtype=np.uint64)
+    if np.asarray(results).dtype == np.uint64:
+        covers, valid = np.asarray(results), True
+    else:
+        covers, valid = compile_batch(results, num_vars)
+    zero = np.uint64(0)
+    return valid & ((on & ~covers) == zero) & ((covers & ~(on | dc)) == zero)
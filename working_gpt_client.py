@@ -2,16 +2,114 @@
 
 import asyncio
 import json
+from collections import deque
+from typing import Optional, Tuple
 from openai import AsyncOpenAI
 
+from gpt_common import MAX_HISTORY_TURNS, SYSTEM_PROMPT, build_messages, create_http_client, stream_completion
+
 # Set OpenAI API key
 OPENAI_API_KEY = "your-api-key-here"
 
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "solve_kmap_2",
+            "description": "Solve a 2-variable Karnaugh Map. Input should be a 2x2 matrix with values 0, 1, or 2 (don't care).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "map_data": {
+                        "type": "array",
+                        "items": {
+                            "type": "array",
+                            "items": {"type": "integer", "enum": [0, 1, 2]},
+                            "minItems": 2,
+                            "maxItems": 2
+                        },
+                        "minItems": 2,
+                        "maxItems": 2,
+                        "description": "2x2 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
+                    }
+                },
+                "required": ["map_data"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "solve_kmap_3",
+            "description": "Solve a 3-variable Karnaugh Map. Input should be a 2x4 matrix with values 0, 1, or 2 (don't care).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "map_data": {
+                        "type": "array",
+                        "items": {
+                            "type": "array",
+                            "items": {"type": "integer", "enum": [0, 1, 2]},
+                            "minItems": 4,
+                            "maxItems": 4
+                        },
+                        "minItems": 2,
+                        "maxItems": 2,
+                        "description": "2x4 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
+                    }
+                },
+                "required": ["map_data"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "solve_kmap_4",
+            "description": "Solve a 4-variable Karnaugh Map. Input should be a 4x4 matrix with values 0, 1, or 2 (don't care).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "map_data": {
+                        "type": "array",
+                        "items": {
+                            "type": "array",
+                            "items": {"type": "integer", "enum": [0, 1, 2]},
+                            "minItems": 4,
+                            "maxItems": 4
+                        },
+                        "minItems": 4,
+                        "maxItems": 4,
+                        "description": "4x4 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
+                    }
+                },
+                "required": ["map_data"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_kmap_info",
+            "description": "Get information about Karnaugh Maps and how to use this solver.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "additionalProperties": False
+            }
+        }
+    }
+]
+
+
 class WorkingKMapAssistant:
     """Working K-Map assistant that directly simulates tool calls"""
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        self.http_client = create_http_client()
+        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=self.http_client)
+        self.system_message = {"role": "system", "content": SYSTEM_PROMPT}
+        self.history = deque(maxlen=MAX_HISTORY_TURNS)
     
     def solve_kmap_2(self, map_data):
         """Solve 2-variable K-Map using real solver"""
@@ -111,185 +209,59 @@ A Karnaugh Map (K-Map) is a graphical method used to simplify Boolean algebra ex
 - 2: Don't care (X)
 """
     
-    async def chat_with_gpt(self, user_message: str) -> str:
-        """Chat with GPT-4o"""
-        
-        # Define tools
-        tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "solve_kmap_2",
-                    "description": "Solve a 2-variable Karnaugh Map. Input should be a 2x2 matrix with values 0, 1, or 2 (don't care).",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "map_data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "array",
-                                    "items": {"type": "integer", "enum": [0, 1, 2]},
-                                    "minItems": 2,
-                                    "maxItems": 2
-                                },
-                                "minItems": 2,
-                                "maxItems": 2,
-                                "description": "2x2 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
-                            }
-                        },
-                        "required": ["map_data"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "solve_kmap_3",
-                    "description": "Solve a 3-variable Karnaugh Map. Input should be a 2x4 matrix with values 0, 1, or 2 (don't care).",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "map_data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "array",
-                                    "items": {"type": "integer", "enum": [0, 1, 2]},
-                                    "minItems": 4,
-                                    "maxItems": 4
-                                },
-                                "minItems": 2,
-                                "maxItems": 2,
-                                "description": "2x4 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
-                            }
-                        },
-                        "required": ["map_data"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "solve_kmap_4",
-                    "description": "Solve a 4-variable Karnaugh Map. Input should be a 4x4 matrix with values 0, 1, or 2 (don't care).",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "map_data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "array",
-                                    "items": {"type": "integer", "enum": [0, 1, 2]},
-                                    "minItems": 4,
-                                    "maxItems": 4
-                                },
-                                "minItems": 4,
-                                "maxItems": 4,
-                                "description": "4x4 matrix representing the K-Map. Values: 0=false, 1=true, 2=don't care"
-                            }
-                        },
-                        "required": ["map_data"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_kmap_info",
-                    "description": "Get information about Karnaugh Maps and how to use this solver.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "additionalProperties": False
-                    }
-                }
-            }
-        ]
-        
-        try:
-            # Call GPT-4o
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a Karnaugh Map (K-Map) solving assistant. You can help users:
+    def call_tool(self, tool_name, arguments):
+        """Dispatch a tool call requested by GPT-4o"""
+        if tool_name == "solve_kmap_2":
+            return self.solve_kmap_2(arguments["map_data"])
+        elif tool_name == "solve_kmap_3":
+            return self.solve_kmap_3(arguments["map_data"])
+        elif tool_name == "solve_kmap_4":
+            return self.solve_kmap_4(arguments["map_data"])
+        elif tool_name == "get_kmap_info":
+            return self.get_kmap_info()
+        return f"Unknown tool: {tool_name}"
 
-1. Explain what K-Map is and how to use it
-2. Solve 2, 3, 4 variable K-Maps
-3. Provide K-Map examples and exercises
+    async def chat_with_gpt(self, user_message: str, on_token=None) -> Tuple[str, Optional[str]]:
+        """Chat with GPT-4o, passing each token of the answer to on_token as it arrives.
 
-When users provide K-Map data, you should call the appropriate tools to solve it.
-When users ask about K-Map knowledge, you should call the get_kmap_info tool to get detailed information.
+        Returns (answer, None), or ("", error message) when the request failed"""
+        turn = [{"role": "user", "content": user_message}]
 
-Please always use the provided tools to help users, don't calculate K-Maps yourself."""
-                    },
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                tools=tools,
-                tool_choice="auto"
-            )
-            
-            # Process response
-            message = response.choices[0].message
-            
-            if message.tool_calls:
+        try:
+            # Call GPT-4o
+            messages = build_messages(self.system_message, self.history, turn)
+            content, tool_calls = await stream_completion(self.client, messages, on_token, tools=TOOLS)
+
+            if tool_calls:
                 # Has tool calls
-                tool_results = []
-                for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    arguments = json.loads(tool_call.function.arguments)
-                    
+                turn.append({"role": "assistant", "content": content or None, "tool_calls": tool_calls})
+                for tool_call in tool_calls:
+                    tool_name = tool_call["function"]["name"]
+                    arguments = json.loads(tool_call["function"]["arguments"] or "{}")
+
                     print(f"Calling tool: {tool_name}")
                     print(f"Parameters: {arguments}")
-                    
-                    # Call corresponding tools
-                    if tool_name == "solve_kmap_2":
-                        result = self.solve_kmap_2(arguments["map_data"])
-                    elif tool_name == "solve_kmap_3":
-                        result = self.solve_kmap_3(arguments["map_data"])
-                    elif tool_name == "solve_kmap_4":
-                        result = self.solve_kmap_4(arguments["map_data"])
-                    elif tool_name == "get_kmap_info":
-                        result = self.get_kmap_info()
-                    else:
-                        result = f"Unknown tool: {tool_name}"
-                    
-                    tool_results.append(result)
-                
-                # Send tool results to GPT
-                messages = [
-                    {
-                        "role": "system",
-                        "content": """You are a Karnaugh Map (K-Map) solving assistant."""
-                    },
-                    {
-                        "role": "user",
-                        "content": user_message
-                    },
-                    message,
-                    {
+
+                    turn.append({
                         "role": "tool",
-                        "tool_call_id": message.tool_calls[0].id,
-                        "content": "\n\n".join(tool_results)
-                    }
-                ]
-                
-                # Get final response
-                final_response = await self.client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=messages
-                )
-                
-                return final_response.choices[0].message.content
-            else:
-                # No tool calls, return response directly
-                return message.content
-                
+                        "tool_call_id": tool_call["id"],
+                        "content": self.call_tool(tool_name, arguments)
+                    })
+
+                # Stream the final response built from the tool results
+                messages = build_messages(self.system_message, self.history, turn)
+                content, _ = await stream_completion(self.client, messages, on_token)
+
+            turn.append({"role": "assistant", "content": content})
+            self.history.append(turn)
+            return content, None
+
         except Exception as e:
-            return f"Error: {str(e)}"
+            return "", f"Error: {str(e)}"
+
+    async def close(self):
+        """Close the pooled HTTP connections"""
+        await self.client.close()
 
 async def main():
     """Main function"""
@@ -304,14 +276,22 @@ async def main():
     print("5. 'exit' to end the program")
     print("=" * 50)
     
-    while True:
-        user_input = input("\nYou: ")
-        if user_input.lower() in ['exit', 'quit']:
-            break
-        
-        print("GPT-4o: Processing...")
-        response = await assistant.chat_with_gpt(user_input)
-        print(f"GPT-4o: {response}")
+    try:
+        while True:
+            user_input = input("\nYou: ")
+            if user_input.lower() in ['exit', 'quit']:
+                break
+
+            print("GPT-4o: ", end="", flush=True)
+            _, error = await assistant.chat_with_gpt(
+                user_input,
+                on_token=lambda token: print(token, end="", flush=True)
+            )
+            if error:
+                print(error, end="")
+            print()
+    finally:
+        await assistant.close()
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())